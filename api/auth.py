@@ -0,0 +1,365 @@
+"""Dashboard authentication with cached JWT session verification."""
+
+import asyncio
+import base64
+import secrets
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import aiohttp
+import jwt
+from fastapi import Cookie, HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from config.env import Settings, get_settings
+from database.models import SessionRevocation
+from utils.cache import SESSIONS, TTLCache, get_invalidator
+from utils.crypto import InvalidToken, decrypt, encrypt
+from utils.logger import get_bot_logger
+from utils.metrics import discord_trace_config, track_cache
+from utils.serialization import dumps, loads
+
+DISCORD_API = "https://discord.com/api/v10"
+TOKEN_COOKIE = "token"
+JWT_ALGORITHM = "HS256"
+
+# How long a dashboard session lasts; OAuth tokens are refreshed within it
+SESSION_LIFETIME = 7 * 24 * 60 * 60
+# Refresh OAuth tokens once they are this close to expiring
+REFRESH_MARGIN = 15 * 60
+
+NOT_AUTHENTICATED = "You are not authenticated."
+EXPIRED = "Your token has expired; please re-authenticate."
+
+
+class AuthError(Exception):
+    """Raised when a session token is missing, invalid or revoked."""
+    
+    def __init__(self, message: str = NOT_AUTHENTICATED):
+        super().__init__(message)
+        self.message = message
+
+
+@dataclass
+class Principal:
+    """A verified dashboard user."""
+    id: str
+    username: str
+    avatar: Optional[str]
+    locale: Optional[str]
+    scopes: Tuple[str, ...]
+    session_id: str
+    issued_at: float
+    expires_at: float
+    access_token: str
+    refresh_token: Optional[str]
+    token_expires_at: float
+    # The current signed session token; replaced when OAuth tokens are refreshed
+    token: str
+    # Fresh user object from Discord, fetched at most once per cache entry
+    profile: Optional[Dict[str, Any]] = None
+
+
+def parse_revocation_time(value: Optional[str]) -> float:
+    """Parse INVALIDATE_TOKENS (an ISO date or a Unix timestamp) into seconds."""
+    if not value:
+        return 0.0
+    try:
+        timestamp = float(value)
+        # The JS version compares against milliseconds
+        return timestamp / 1000 if timestamp > 1e11 else timestamp
+    except ValueError:
+        pass
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def client_id_from_token(bot_token: str) -> str:
+    """Get the application ID encoded in a bot token."""
+    encoded = bot_token.split(".", 1)[0]
+    return base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)).decode("ascii")
+
+
+class AuthManager:
+    """Verify session cookies, caching the verified principal per token.
+    
+    A cold verification checks the JWT signature and decrypts the Discord
+    OAuth tokens inside it; afterwards the same cookie costs a cache lookup
+    until the entry's TTL (or the session) runs out. A user's logout is
+    stored in the database, which a cold verification checks through a
+    cache of the same TTL, and published through the cache invalidator so
+    every running API worker drops the user's sessions at once.
+    """
+    
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        session_factory: Optional[Callable[[], Any]] = None,
+        cache_size: int = 10000,
+        cache_ttl: float = 300.0
+    ):
+        """Initialize the auth manager.
+        
+        ``session_factory`` opens the database sessions logouts are stored
+        in; without one they only last as long as the process.
+        """
+        self.settings = settings or get_settings()
+        self.session_factory = session_factory
+        self.log = get_bot_logger().api
+        self.secret = self.settings.encryption_key
+        self.cache: TTLCache[str, Principal] = TTLCache(cache_size, cache_ttl)
+        track_cache("sessions", self.cache)
+        
+        # Sessions issued before these times are rejected
+        try:
+            self.revoked_before = parse_revocation_time(self.settings.invalidate_tokens)
+        except ValueError:
+            self.log.error(f"Invalid INVALIDATE_TOKENS value: {self.settings.invalidate_tokens}")
+            self.revoked_before = 0.0
+        # Each user's last logout, or 0.0 for none, as read from the database
+        self._user_revocations: TTLCache[str, float] = TTLCache(cache_size, cache_ttl)
+        
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._http: Optional[aiohttp.ClientSession] = None
+        get_invalidator().subscribe(SESSIONS, self._on_revoke)
+        
+        self.verifications = 0
+        self.refreshes = 0
+    
+    def issue_token(
+        self,
+        user: Dict[str, Any],
+        oauth: Dict[str, Any],
+        session_id: Optional[str] = None,
+        issued_at: Optional[float] = None
+    ) -> str:
+        """Sign a session token for a user and their OAuth token response."""
+        now = time.time()
+        issued_at = issued_at or now
+        secret = {
+            "access_token": oauth["access_token"],
+            "refresh_token": oauth.get("refresh_token"),
+            "expires_at": oauth.get("expires_at") or now + oauth["expires_in"],
+        }
+        claims = {
+            "sub": str(user["id"]),
+            "username": user.get("username"),
+            "avatar": user.get("avatar"),
+            "locale": user.get("locale"),
+            "scopes": oauth.get("scope", "").split(),
+            "sid": session_id or secrets.token_urlsafe(16),
+            "iat": issued_at,
+            "exp": int(issued_at + SESSION_LIFETIME),
+            "oauth": encrypt(dumps(secret)),
+        }
+        return jwt.encode(claims, self.secret, algorithm=JWT_ALGORITHM)
+    
+    def verify(self, token: str) -> Principal:
+        """Verify a session token without using the cache."""
+        try:
+            claims = jwt.decode(
+                token,
+                self.secret,
+                algorithms=[JWT_ALGORITHM],
+                options={"require": ["exp", "iat", "sub", "sid", "oauth"]}
+            )
+        except jwt.ExpiredSignatureError:
+            raise AuthError(EXPIRED)
+        except jwt.PyJWTError:
+            raise AuthError(NOT_AUTHENTICATED)
+        
+        try:
+            oauth = loads(decrypt(claims["oauth"]))
+        except (InvalidToken, ValueError):
+            raise AuthError(NOT_AUTHENTICATED)
+        
+        principal = Principal(
+            id=claims["sub"],
+            username=claims.get("username"),
+            avatar=claims.get("avatar"),
+            locale=claims.get("locale"),
+            scopes=tuple(claims.get("scopes") or ()),
+            session_id=claims["sid"],
+            issued_at=float(claims["iat"]),
+            expires_at=float(claims["exp"]),
+            access_token=oauth["access_token"],
+            refresh_token=oauth.get("refresh_token"),
+            token_expires_at=float(oauth["expires_at"]),
+            token=token,
+        )
+        if self.is_revoked(principal):
+            raise AuthError(EXPIRED)
+        return principal
+    
+    def is_revoked(self, principal: Principal) -> bool:
+        """Check whether a principal's session has been revoked."""
+        cutoff = max(self.revoked_before, self._user_revocations.get(principal.id, 0.0))
+        return principal.issued_at < cutoff
+    
+    async def user_revoked_before(self, user_id: str) -> float:
+        """Get when a user last logged out, reading the database on a cache miss."""
+        cutoff = self._user_revocations.get(user_id)
+        if cutoff is not None:
+            return cutoff
+        
+        cutoff = 0.0
+        if self.session_factory is not None:
+            async with self.session_factory() as session:
+                revoked_at = await session.scalar(
+                    select(SessionRevocation.revoked_at).where(SessionRevocation.user_id == user_id)
+                )
+            if revoked_at is not None:
+                cutoff = revoked_at.replace(tzinfo=timezone.utc).timestamp()
+        # A logout published while this was loading is newer
+        cutoff = max(cutoff, self._user_revocations.get(user_id, 0.0))
+        self._user_revocations.set(user_id, cutoff)
+        return cutoff
+    
+    async def get_principal(self, token: str) -> Principal:
+        """Get the principal for a session token, verifying it on a cache miss."""
+        principal = self.cache.get(token)
+        if principal is None:
+            principal = self.verify(token)
+            if principal.issued_at < await self.user_revoked_before(principal.id):
+                raise AuthError(EXPIRED)
+            self.verifications += 1
+            self.cache.set(token, principal, min(self.cache.ttl, principal.expires_at - time.time()))
+        
+        self.schedule_refresh(principal)
+        return principal
+    
+    async def __call__(self, response: Response, token: Optional[str] = Cookie(None)) -> Principal:
+        """FastAPI dependency returning the authenticated principal."""
+        if not token:
+            raise HTTPException(status_code=401, detail=NOT_AUTHENTICATED)
+        try:
+            principal = await self.get_principal(token)
+        except AuthError as e:
+            raise HTTPException(status_code=401, detail=e.message)
+        except SQLAlchemyError as e:
+            self.log.error(f"Failed to check session revocations: {e}")
+            raise HTTPException(status_code=503, detail="Sessions can't be verified right now")
+        
+        # OAuth tokens were refreshed since this cookie was issued
+        if principal.token != token:
+            self.set_cookie(response, principal)
+        return principal
+    
+    def set_cookie(self, response: Response, principal: Principal) -> None:
+        """Store a principal's session token in the response cookie."""
+        response.set_cookie(
+            TOKEN_COOKIE,
+            principal.token,
+            max_age=max(int(principal.expires_at - time.time()), 0),
+            httponly=True,
+            samesite="strict",
+            secure=self.settings.http_external.startswith("https"),
+            path="/",
+        )
+    
+    async def revoke(self, user_id: Optional[str] = None) -> None:
+        """Revoke every session of a user, or of every user, issued until now.
+        
+        A user's revocation is stored; revoking every user's sessions only
+        lasts until a restart, which is what INVALIDATE_TOKENS is for.
+        """
+        if user_id is not None and self.session_factory is not None:
+            async with self.session_factory() as session:
+                await session.merge(SessionRevocation(user_id=user_id, revoked_at=datetime.utcnow()))
+                await session.commit()
+        get_invalidator().invalidate(SESSIONS, user_id)
+    
+    def _on_revoke(self, user_id: Optional[str]) -> None:
+        """Apply a revocation published by any process."""
+        now = time.time()
+        if user_id is None:
+            self.revoked_before = now
+            self.cache.clear()
+        else:
+            self._user_revocations.set(user_id, max(now, self._user_revocations.get(user_id, 0.0)))
+            self.cache.remove_if(lambda _, principal: principal.id == user_id)
+    
+    def schedule_refresh(self, principal: Principal) -> None:
+        """Refresh a principal's OAuth tokens in the background if they expire soon."""
+        if principal.refresh_token is None or principal.session_id in self._refreshing:
+            return
+        if principal.token_expires_at - time.time() > REFRESH_MARGIN:
+            return
+        
+        task = asyncio.create_task(self._refresh(principal))
+        self._refreshing[principal.session_id] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(principal.session_id, None))
+    
+    async def _refresh(self, principal: Principal) -> None:
+        """Exchange a refresh token and re-issue the session token."""
+        try:
+            data = await self.request_token(grant_type="refresh_token", refresh_token=principal.refresh_token)
+        except Exception as e:
+            self.log.warning(f"Failed to refresh OAuth token for user {principal.id}: {e}")
+            return
+        
+        token_expires_at = time.time() + data["expires_in"]
+        user = {"id": principal.id, "username": principal.username, "avatar": principal.avatar, "locale": principal.locale}
+        oauth = {
+            "access_token": data["access_token"],
+            "refresh_token": data.get("refresh_token", principal.refresh_token),
+            "expires_at": token_expires_at,
+            "scope": data.get("scope", " ".join(principal.scopes)),
+        }
+        token = self.issue_token(user, oauth, session_id=principal.session_id, issued_at=principal.issued_at)
+        refreshed = replace(
+            principal,
+            access_token=oauth["access_token"],
+            refresh_token=oauth["refresh_token"],
+            token_expires_at=token_expires_at,
+            token=token,
+        )
+        
+        # Requests still carrying the old cookie get the new one set
+        ttl = min(self.cache.ttl, refreshed.expires_at - time.time())
+        self.cache.set(principal.token, refreshed, ttl)
+        self.cache.set(token, refreshed, ttl)
+        self.refreshes += 1
+    
+    @property
+    def http(self) -> aiohttp.ClientSession:
+        """Get the HTTP session for Discord API calls."""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),
+                trace_configs=[discord_trace_config()]
+            )
+        return self._http
+    
+    async def request_token(self, **params: str) -> Dict[str, Any]:
+        """Call Discord's OAuth token endpoint."""
+        form = {
+            "client_id": client_id_from_token(self.settings.discord_token),
+            "client_secret": self.settings.discord_secret,
+            **params,
+        }
+        async with self.http.post(f"{DISCORD_API}/oauth2/token", data=form) as response:
+            response.raise_for_status()
+            return await response.json()
+    
+    async def fetch_user(self, principal: Principal) -> Dict[str, Any]:
+        """Fetch the user from Discord once per cached principal."""
+        if principal.profile is None:
+            headers = {"Authorization": f"Bearer {principal.access_token}"}
+            async with self.http.get(f"{DISCORD_API}/users/@me", headers=headers) as response:
+                response.raise_for_status()
+                principal.profile = await response.json()
+        return principal.profile
+    
+    async def close(self) -> None:
+        """Cancel refreshes and close the HTTP session."""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""Versioned response cache with conditional GET support."""
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from utils.cache import CATEGORIES, GUILD_SETTINGS, TAGS, CacheInvalidator, get_invalidator
+from utils.metrics import track_cache
+from utils.serialization import dumps_bytes
+
+# Dashboard clients must revalidate, but may reuse the body on a 304
+CACHE_CONTROL = "private, no-cache"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A serialised response body and its validator."""
+    version: int
+    body: bytes
+    etag: str
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """Check an ``If-None-Match`` header against an entity tag."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as required for If-None-Match
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class ResponseCache:
+    """Cache serialised read responses per guild and resource version.
+    
+    Entries are keyed by ``(resource, guild_id)`` and are valid while the
+    invalidator's version for that pair is unchanged, so the same hooks that
+    invalidate bot-side caches after a commit also expire API responses.
+    """
+    
+    def __init__(self, invalidator: Optional[CacheInvalidator] = None, max_entries: int = 4096):
+        """Initialize the response cache."""
+        self.invalidator = invalidator or get_invalidator()
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, str], CachedResponse] = {}
+        
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        track_cache("api_responses", self)
+        
+        for resource in (GUILD_SETTINGS, CATEGORIES, TAGS):
+            self.invalidator.subscribe(resource, self._make_evictor(resource))
+    
+    def _make_evictor(self, resource: str) -> Callable[[Optional[str]], None]:
+        """Create an invalidation callback that frees stale entries."""
+        def evict(guild_id: Optional[str]) -> None:
+            if guild_id is None:
+                for key in [key for key in self._entries if key[0] == resource]:
+                    del self._entries[key]
+            else:
+                self._entries.pop((resource, guild_id), None)
+        return evict
+    
+    async def get(
+        self,
+        resource: str,
+        guild_id: str,
+        loader: Callable[[], Awaitable[Any]]
+    ) -> CachedResponse:
+        """Get the cached response for a resource, loading it if stale."""
+        version = self.invalidator.version(resource, guild_id)
+        entry = self._entries.get((resource, guild_id))
+        if entry is not None and entry.version == version:
+            self.hits += 1
+            return entry
+        
+        self.misses += 1
+        body = dumps_bytes(await loader())
+        entry = CachedResponse(
+            version=version,
+            body=body,
+            etag=f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        )
+        
+        # Don't store a body that a commit during the load may have made stale
+        if self.invalidator.version(resource, guild_id) == version:
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[(resource, guild_id)] = entry
+        return entry
+    
+    async def respond(
+        self,
+        request: Request,
+        resource: str,
+        guild_id: str,
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Response:
+        """Build a response for a cached resource, honouring ``If-None-Match``."""
+        entry = await self.get(resource, guild_id, loader)
+        headers = {"ETag": entry.etag, "Cache-Control": CACHE_CONTROL}
+        
+        if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
\ No newline at end of file
@@ -0,0 +1,386 @@
+"""Response compression and precompressed static file serving."""
+
+import asyncio
+import gzip
+import mimetypes
+import os
+import re
+import tempfile
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.logger import get_bot_logger
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Content types worth compressing; images, archives and fonts already are
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+# Streams that must reach the client as soon as each chunk is written
+STREAMING_TYPES = ("text/event-stream",)
+COMPRESSIBLE_EXTENSIONS = (".html", ".css", ".js", ".mjs", ".json", ".map", ".svg", ".txt", ".xml")
+
+# Dynamic responses favour speed, precompressed assets favour size
+DYNAMIC_GZIP_LEVEL = 6
+DYNAMIC_BROTLI_QUALITY = 4
+STATIC_GZIP_LEVEL = 9
+STATIC_BROTLI_QUALITY = 11
+
+# File extension used for each precompressed variant
+VARIANT_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+# Fingerprinted bundle output never changes under the same name
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+DEFAULT_IMMUTABLE_PATTERN = r"(^|/)assets/|[.-][0-9a-f]{8,}\.[A-Za-z0-9]+$"
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """Get the encodings this process can produce, in order of preference."""
+    return ("br", "gzip") if BROTLI_AVAILABLE else ("gzip",)
+
+
+def choose_encoding(accept_encoding: Optional[str], available: Tuple[str, ...]) -> Optional[str]:
+    """Pick the preferred encoding from ``available`` allowed by ``Accept-Encoding``."""
+    if not accept_encoding:
+        return None
+    
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip()] = quality
+    
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    """Check whether a content type benefits from compression."""
+    return (
+        bool(content_type)
+        and content_type.startswith(COMPRESSIBLE_TYPES)
+        and not content_type.startswith(STREAMING_TYPES)
+    )
+
+
+class _StreamCompressor:
+    """Incremental gzip or brotli compressor."""
+    
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so the client can use it immediately."""
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self) -> bytes:
+        """Finish the stream."""
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    """Compress a complete body."""
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+class CompressionMiddleware:
+    """Negotiate gzip/brotli compression for dynamic responses.
+    
+    Bodies smaller than ``minimum_size``, non-text content types and
+    responses that already carry a ``Content-Encoding`` (such as
+    precompressed static files) are passed through untouched. Streaming
+    responses are compressed chunk by chunk.
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = DYNAMIC_GZIP_LEVEL,
+        brotli_quality: int = DYNAMIC_BROTLI_QUALITY
+    ):
+        """Initialize the middleware."""
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+        self.encodings = supported_encodings()
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        responder = _CompressionResponder(send, encoding, self.levels[encoding], self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Per-request state for ``CompressionMiddleware``."""
+    
+    def __init__(self, send: Send, encoding: str, level: int, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_StreamCompressor] = None
+        self.passthrough = False
+    
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            status = message["status"]
+            if (
+                status < 200 or status in (204, 304)
+                or "content-encoding" in headers
+                or not is_compressible(headers.get("content-type"))
+            ):
+                self.passthrough = True
+                await self._send(message)
+            else:
+                # Hold the headers until the first body chunk shows the size
+                self.start_message = message
+            return
+        
+        if message_type != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+        
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            
+            if not more_body:
+                # Complete body: compress in one go if it is worth it
+                if len(body) >= self.minimum_size:
+                    body = compress(body, self.encoding, self.level)
+                    headers["Content-Encoding"] = self.encoding
+                    headers["Content-Length"] = str(len(body))
+                await self._send(start_message)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+            
+            self.compressor = _StreamCompressor(self.encoding, self.level)
+            headers["Content-Encoding"] = self.encoding
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            await self._send(start_message)
+        
+        if self.compressor is None:
+            await self._send(message)
+            return
+        
+        data = self.compressor.compress(body) if body else b""
+        if not more_body:
+            data += self.compressor.finish()
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+
+def precompress_file(path: str, minimum_size: int = 1024) -> List[str]:
+    """Write ``.gz`` (and ``.br``) variants of a file unless they are current."""
+    written = []
+    stat_result = os.stat(path)
+    if stat_result.st_size < minimum_size:
+        return written
+    
+    data = None
+    for encoding in supported_encodings():
+        variant = path + VARIANT_SUFFIXES[encoding]
+        try:
+            if os.stat(variant).st_mtime >= stat_result.st_mtime:
+                continue
+        except FileNotFoundError:
+            pass
+        
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        level = STATIC_BROTLI_QUALITY if encoding == "br" else STATIC_GZIP_LEVEL
+        compressed = compress(data, encoding, level)
+        
+        # Atomic replace so a concurrent request never sees a partial file; every
+        # writer gets its own temporary file, as API workers may start together
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(variant) + ".", dir=os.path.dirname(variant))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(compressed)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, variant)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        written.append(variant)
+    return written
+
+
+def precompress_directory(directory: str, minimum_size: int = 1024) -> int:
+    """Write missing or stale variants of every compressible file under a directory.
+    
+    Files whose variants can't be written, e.g. in a read-only directory,
+    are skipped with a warning. Returns the variants written.
+    """
+    written = 0
+    failed = 0
+    root = os.path.realpath(directory)
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith(COMPRESSIBLE_EXTENSIONS):
+                try:
+                    written += len(precompress_file(os.path.join(dirpath, filename), minimum_size))
+                except OSError:
+                    failed += 1
+    
+    if failed:
+        get_bot_logger().api.warning(
+            f"Couldn't precompress {failed} static files in {root}; serving the variants already there"
+        )
+    return written
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """Serve static files, preferring ``.br``/``.gz`` variants built ahead of time.
+    
+    Variants are built by ``precompress`` (off the event loop at startup,
+    or by the dashboard build) and indexed in memory, so requests never
+    compress anything. Where they can't be written, e.g. a read-only directory,
+    only the variants already there and still current are served.
+    Fingerprinted assets get immutable cache headers; everything else
+    (e.g. ``index.html``) must be revalidated.
+    """
+    
+    def __init__(
+        self,
+        *args,
+        minimum_size: int = 1024,
+        immutable_pattern: str = DEFAULT_IMMUTABLE_PATTERN,
+        **kwargs
+    ):
+        """Initialize the static file app."""
+        super().__init__(*args, **kwargs)
+        self.minimum_size = minimum_size
+        self.immutable_pattern = re.compile(immutable_pattern)
+        # real path -> {encoding: (variant path, stat)}
+        self.variants: Dict[str, Dict[str, Tuple[str, os.stat_result]]] = {}
+        if self.directory is not None:
+            self.index()
+    
+    async def precompress(self) -> int:
+        """Build missing or stale variants in a thread, then index them; return files written."""
+        written = await asyncio.to_thread(precompress_directory, self.directory, self.minimum_size)
+        self.index()
+        return written
+    
+    def index(self) -> None:
+        """Index the current variants of every compressible file."""
+        variants = {}
+        for dirpath, _, filenames in os.walk(os.path.realpath(self.directory)):
+            for filename in filenames:
+                if not filename.endswith(COMPRESSIBLE_EXTENSIONS):
+                    continue
+                path = os.path.join(dirpath, filename)
+                
+                # A variant older than its file would serve stale content
+                mtime = os.stat(path).st_mtime
+                found = {}
+                for encoding, suffix in VARIANT_SUFFIXES.items():
+                    try:
+                        variant_stat = os.stat(path + suffix)
+                    except FileNotFoundError:
+                        continue
+                    if variant_stat.st_mtime >= mtime:
+                        found[encoding] = (path + suffix, variant_stat)
+                if found:
+                    variants[path] = found
+        # Swapped in whole, as requests may be reading the old index
+        self.variants = variants
+    
+    def cache_control(self, full_path: str) -> str:
+        """Get the Cache-Control header for a file."""
+        relative = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+        if self.immutable_pattern.search(relative):
+            return IMMUTABLE_CACHE_CONTROL
+        return REVALIDATE_CACHE_CONTROL
+    
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        """Serve the best precompressed variant of a file."""
+        request_headers = Headers(scope=scope)
+        full_path = os.fspath(full_path)
+        variants = self.variants.get(os.path.realpath(full_path))
+        
+        encoding = None
+        if variants:
+            encoding = choose_encoding(request_headers.get("accept-encoding"), tuple(variants))
+        
+        if encoding is not None:
+            variant_path, variant_stat = variants[encoding]
+            media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+            response = FileResponse(
+                variant_path,
+                status_code=status_code,
+                stat_result=variant_stat,
+                media_type=media_type,
+                headers={"Content-Encoding": encoding},
+            )
+        else:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        
+        response.headers["Cache-Control"] = self.cache_control(full_path)
+        if variants:
+            response.headers.add_vary_header("Accept-Encoding")
+        
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""Users' guild lists from Discord, coalesced and cached per user."""
+
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from api.auth import DISCORD_API, AuthManager, Principal
+from api.state import BotState
+from utils.cache import SingleFlight, TTLCache
+from utils.logger import get_bot_logger
+from utils.metrics import track_cache
+
+
+class RateLimited(Exception):
+    """Raised when Discord rate limits a guild list fetch and nothing is cached."""
+    
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limited, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class UserGuildsFetcher:
+    """Fetch ``/users/@me/guilds`` at most once per user per TTL.
+    
+    Concurrent requests for the same user (several dashboard tabs or
+    components loading at once) share one upstream call. If Discord rate
+    limits or fails a refresh, the last good list is served for up to
+    ``stale_ttl`` seconds.
+    """
+    
+    def __init__(
+        self,
+        auth: AuthManager,
+        state: BotState,
+        ttl: float = 30.0,
+        stale_ttl: float = 300.0,
+        cache_size: int = 10000
+    ):
+        """Initialize the fetcher."""
+        self.auth = auth
+        self.state = state
+        self.log = get_bot_logger().api
+        self.cache: TTLCache[str, List[Dict[str, Any]]] = TTLCache(cache_size, ttl)
+        self.stale: TTLCache[str, List[Dict[str, Any]]] = TTLCache(cache_size, stale_ttl)
+        self.flight: SingleFlight[str, List[Dict[str, Any]]] = SingleFlight()
+        track_cache("user_guilds", self.cache)
+        
+        self.upstream_calls = 0
+    
+    async def get_partial_guilds(self, principal: Principal) -> List[Dict[str, Any]]:
+        """Get every guild the user is in, as returned by Discord."""
+        guilds = self.cache.get(principal.id)
+        if guilds is None:
+            guilds = await self.flight.do(principal.id, lambda: self._refresh(principal))
+        return guilds
+    
+    async def get_guilds(self, principal: Principal) -> List[Dict[str, Any]]:
+        """Get the guilds shared by the user and the bot, with the user's permissions."""
+        partial_guilds = await self.get_partial_guilds(principal)
+        shared = set(await self.state.filter_guilds([guild["id"] for guild in partial_guilds]))
+        return [
+            {
+                "id": guild["id"],
+                "name": guild["name"],
+                "icon": guild.get("icon"),
+                "permissions": int(guild.get("permissions", 0)),
+            }
+            for guild in partial_guilds
+            if guild["id"] in shared
+        ]
+    
+    def invalidate(self, user_id: str) -> None:
+        """Forget a user's cached guild list (e.g. after they join a guild)."""
+        self.cache.pop(user_id)
+    
+    async def _refresh(self, principal: Principal) -> List[Dict[str, Any]]:
+        """Fetch a user's guilds, falling back to the last good list."""
+        try:
+            guilds = await self.request_guilds(principal.access_token)
+        except (RateLimited, aiohttp.ClientError) as e:
+            stale = self.stale.get(principal.id)
+            if stale is None:
+                raise
+            self.log.warning(f"Serving stale guild list for user {principal.id}: {e}")
+            # Don't ask again until the rate limit has passed
+            if isinstance(e, RateLimited):
+                self.cache.set(principal.id, stale, e.retry_after)
+            return stale
+        
+        self.cache.set(principal.id, guilds)
+        self.stale.set(principal.id, guilds)
+        return guilds
+    
+    async def request_guilds(self, access_token: str) -> List[Dict[str, Any]]:
+        """Call Discord's ``/users/@me/guilds`` endpoint."""
+        self.upstream_calls += 1
+        headers = {"Authorization": f"Bearer {access_token}"}
+        async with self.auth.http.get(f"{DISCORD_API}/users/@me/guilds", headers=headers) as response:
+            if response.status == 429:
+                retry_after: Optional[float] = None
+                try:
+                    retry_after = float((await response.json()).get("retry_after"))
+                except (aiohttp.ContentTypeError, TypeError, ValueError):
+                    pass
+                raise RateLimited(retry_after or float(response.headers.get("Retry-After", 1)))
+            response.raise_for_status()
+            return await response.json()
\ No newline at end of file
@@ -0,0 +1,414 @@
+"""Unix socket IPC between the bot process and API worker processes."""
+
+import asyncio
+import inspect
+import itertools
+import os
+import struct
+from functools import partial
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from api.state import BotState
+from bot.tickets.events import TICKET_CHANGES, TICKET_MESSAGE, TicketEvent, get_event_bus
+from utils.cache import CATEGORIES, GUILD_SETTINGS, SESSIONS, TAGS, get_invalidator
+from utils.logger import get_bot_logger
+from utils.serialization import dumps_bytes, loads
+
+# Frames are a 4-byte big-endian length followed by a JSON payload
+_HEADER = struct.Struct("!I")
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+# Cache invalidations and session revocations mirrored between processes
+SHARED_RESOURCES = (GUILD_SETTINGS, CATEGORIES, TAGS, SESSIONS)
+
+
+class IPCError(Exception):
+    """Raised when an IPC call fails."""
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Any:
+    """Read one frame from a stream."""
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    if size > MAX_FRAME_SIZE:
+        raise IPCError(f"Frame of {size} bytes exceeds the {MAX_FRAME_SIZE} byte limit")
+    return loads(await reader.readexactly(size))
+
+
+def write_frame(writer: asyncio.StreamWriter, payload: Any) -> None:
+    """Buffer one frame on a stream."""
+    data = dumps_bytes(payload)
+    writer.write(_HEADER.pack(len(data)) + data)
+
+
+class IPCServer:
+    """Serve ``BotState`` calls to API workers from the bot process.
+    
+    Each worker sends batches of calls, so the gateway loop reads a frame
+    per batch rather than per API request; the calls run concurrently and
+    each is answered as soon as it completes. Cache
+    invalidations are mirrored in both directions so worker response
+    caches expire when the bot writes, and vice versa. Ticket changes are
+    forwarded to every worker for their live dashboard streams; ticket
+    messages only to the workers streaming that guild, which they report
+    as their streams open and close.
+    """
+    
+    def __init__(self, state: BotState, path: str):
+        """Initialize the IPC server."""
+        self.state = state
+        self.path = path
+        self.log = get_bot_logger().api
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        # Guilds each worker streams, and how many workers stream each guild
+        self._watching: Dict[asyncio.StreamWriter, Set[str]] = {}
+        self._watched: Counter = Counter()
+        self._origin: Optional[asyncio.StreamWriter] = None
+        self._broadcasters = {
+            resource: partial(self._broadcast_invalidation, resource) for resource in SHARED_RESOURCES
+        }
+        
+        self.batches = 0
+        self.calls = 0
+    
+    async def start(self) -> None:
+        """Start listening on the socket."""
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=self.path)
+        os.chmod(self.path, 0o600)
+        
+        invalidator = get_invalidator()
+        for resource, callback in self._broadcasters.items():
+            invalidator.subscribe(resource, callback)
+        bus = get_event_bus()
+        bus.add_listener(self._broadcast_event, TICKET_CHANGES)
+        bus.add_listener(self._forward_message, (TICKET_MESSAGE,), self._watched)
+        
+        self.log.info(f"IPC server listening on {self.path}")
+    
+    async def close(self) -> None:
+        """Stop the server and disconnect every worker."""
+        if self._server is None:
+            return
+        invalidator = get_invalidator()
+        for resource, callback in self._broadcasters.items():
+            invalidator.unsubscribe(resource, callback)
+        bus = get_event_bus()
+        bus.remove_listener(self._broadcast_event)
+        bus.remove_listener(self._forward_message)
+        
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+        
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+    
+    def _broadcast_invalidation(self, resource: str, guild_id: Optional[str]) -> None:
+        """Tell every worker, except the one the change came from, that a resource changed."""
+        frame = {"type": "invalidate", "resource": resource, "guild_id": guild_id, "pid": os.getpid()}
+        for writer in self._writers:
+            if writer is not self._origin:
+                write_frame(writer, frame)
+    
+    def _broadcast_event(self, event: TicketEvent) -> None:
+        """Forward a ticket event to every worker."""
+        if not self._writers:
+            return
+        frame = {"type": "event", "event": event.to_dict(), "pid": os.getpid()}
+        for writer in self._writers:
+            write_frame(writer, frame)
+    
+    def _forward_message(self, event: TicketEvent) -> None:
+        """Forward a ticket message to the workers streaming its guild."""
+        frame = {"type": "event", "event": event.to_dict(), "pid": os.getpid()}
+        for writer, guilds in self._watching.items():
+            if event.guild_id in guilds:
+                write_frame(writer, frame)
+    
+    def _watch(self, writer: asyncio.StreamWriter, guild_id: str, watched: bool) -> None:
+        """Record a worker starting or stopping streaming a guild."""
+        guilds = self._watching.setdefault(writer, set())
+        if watched and guild_id not in guilds:
+            guilds.add(guild_id)
+            self._watched[guild_id] += 1
+        elif not watched and guild_id in guilds:
+            guilds.discard(guild_id)
+            self._watched[guild_id] -= 1
+            if not self._watched[guild_id]:
+                del self._watched[guild_id]
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one worker connection, reading on while its calls run."""
+        self._writers.add(writer)
+        calls: Set[asyncio.Task] = set()
+        drain_lock = asyncio.Lock()
+        try:
+            while True:
+                frame = await read_frame(reader)
+                if frame["type"] == "batch":
+                    for task in self.dispatch(writer, drain_lock, frame["calls"]):
+                        calls.add(task)
+                        task.add_done_callback(calls.discard)
+                elif frame["type"] == "watch":
+                    self._watch(writer, frame["guild_id"], frame["watched"])
+                elif frame["type"] == "invalidate" and frame.get("pid") != os.getpid():
+                    # Apply locally, which re-broadcasts to the other workers
+                    self._origin = writer
+                    try:
+                        get_invalidator().invalidate(frame["resource"], frame["guild_id"])
+                    finally:
+                        self._origin = None
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            self.log.error(f"IPC connection failed: {e}")
+        finally:
+            for task in list(calls):
+                task.cancel()
+            self._writers.discard(writer)
+            for guild_id in list(self._watching.get(writer, ())):
+                self._watch(writer, guild_id, False)
+            self._watching.pop(writer, None)
+            writer.close()
+    
+    def dispatch(
+        self,
+        writer: asyncio.StreamWriter,
+        drain_lock: asyncio.Lock,
+        calls: List[List[Any]]
+    ) -> List[asyncio.Task]:
+        """Start a batch of calls, running duplicate calls once.
+        
+        Each call is answered in its own frame as soon as it completes, so a
+        slow call doesn't hold up the rest of the batch or later batches.
+        """
+        self.batches += 1
+        self.calls += len(calls)
+        
+        grouped: Dict[bytes, Tuple[str, Dict[str, Any], List[int]]] = {}
+        for call_id, method, params in calls:
+            key = dumps_bytes([method, params])
+            if key in grouped:
+                grouped[key][2].append(call_id)
+            else:
+                grouped[key] = (method, params, [call_id])
+        return [
+            asyncio.create_task(self._answer(writer, drain_lock, method, params, call_ids))
+            for method, params, call_ids in grouped.values()
+        ]
+    
+    async def _answer(
+        self,
+        writer: asyncio.StreamWriter,
+        drain_lock: asyncio.Lock,
+        method: str,
+        params: Dict[str, Any],
+        call_ids: List[int]
+    ) -> None:
+        """Run one call and send its result to every call ID that asked for it."""
+        ok, value = await self._call(method, params)
+        if writer.is_closing():
+            return
+        write_frame(writer, {"type": "results", "results": [(call_id, ok, value) for call_id in call_ids]})
+        # Only one coroutine may wait on a stream's drain at a time before 3.10
+        try:
+            async with drain_lock:
+                await writer.drain()
+        except ConnectionError:
+            pass
+    
+    async def _call(self, method: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
+        """Call one ``BotState`` method."""
+        if method not in BotState.IPC_METHODS:
+            return False, f"Unknown method {method!r}"
+        try:
+            result = getattr(self.state, method)(**params)
+            if inspect.isawaitable(result):
+                result = await result
+            return True, result
+        except Exception as e:
+            self.log.error(f"IPC call {method} failed: {e}")
+            return False, str(e)
+
+
+class IPCClient:
+    """Call into the bot process from an API worker.
+    
+    Calls made in the same event loop iteration (or within ``batch_delay``
+    seconds) are sent together as one frame.
+    """
+    
+    def __init__(self, path: str, timeout: float = 5.0, batch_delay: float = 0.0, max_batch: int = 256):
+        """Initialize the IPC client."""
+        self.path = path
+        self.timeout = timeout
+        self.batch_delay = batch_delay
+        self.max_batch = max_batch
+        self.log = get_bot_logger().api
+        
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()
+        self._ids = itertools.count()
+        self._pending: List[List[Any]] = []
+        self._futures: Dict[int, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._forwarders = {
+            resource: partial(self._forward_invalidation, resource) for resource in SHARED_RESOURCES
+        }
+        self._subscribed = False
+        self._applying_remote = False
+        
+        self.batches = 0
+        self.calls = 0
+    
+    @property
+    def connected(self) -> bool:
+        """Check whether the client has a live connection."""
+        return self._writer is not None and not self._writer.is_closing()
+    
+    async def connect(self) -> None:
+        """Connect to the bot process, if not already connected."""
+        async with self._connect_lock:
+            if self.connected:
+                return
+            self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+            self._read_task = asyncio.create_task(self._read_loop(self._reader))
+            
+            # Reconnecting keeps the subscriptions made on the first connection
+            if not self._subscribed:
+                invalidator = get_invalidator()
+                for resource, callback in self._forwarders.items():
+                    invalidator.subscribe(resource, callback)
+                get_event_bus().add_watcher(self._forward_watch)
+                self._subscribed = True
+            
+            # A new connection starts with no guilds streamed
+            for guild_id in get_event_bus().watched_guilds:
+                self._forward_watch(guild_id, True)
+    
+    async def close(self) -> None:
+        """Close the connection."""
+        if self._subscribed:
+            invalidator = get_invalidator()
+            for resource, callback in self._forwarders.items():
+                invalidator.unsubscribe(resource, callback)
+            get_event_bus().remove_watcher(self._forward_watch)
+            self._subscribed = False
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._read_task is not None:
+            self._read_task.cancel()
+            self._read_task = None
+    
+    async def call(self, method: str, **params: Any) -> Any:
+        """Call a ``BotState`` method in the bot process."""
+        if not self.connected:
+            try:
+                await self.connect()
+            except OSError as e:
+                raise IPCError(f"Bot process unavailable: {e}") from e
+        
+        loop = asyncio.get_running_loop()
+        call_id = next(self._ids)
+        future = loop.create_future()
+        self._futures[call_id] = future
+        self._pending.append([call_id, method, params])
+        
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            if self.batch_delay > 0:
+                self._flush_handle = loop.call_later(self.batch_delay, self._flush)
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+        
+        try:
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            raise IPCError(f"IPC call {method} timed out after {self.timeout}s")
+        finally:
+            self._futures.pop(call_id, None)
+    
+    def _flush(self) -> None:
+        """Send every pending call as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        
+        calls, self._pending = self._pending, []
+        if not self.connected:
+            self._fail([call[0] for call in calls], IPCError("Bot process connection lost"))
+            return
+        
+        write_frame(self._writer, {"type": "batch", "calls": calls})
+        self.batches += 1
+        self.calls += len(calls)
+    
+    def _fail(self, call_ids: List[int], error: Exception) -> None:
+        """Fail the futures of the given calls."""
+        for call_id in call_ids:
+            future = self._futures.get(call_id)
+            if future is not None and not future.done():
+                future.set_exception(error)
+    
+    def _forward_invalidation(self, resource: str, guild_id: Optional[str]) -> None:
+        """Tell the bot about a change committed in this worker."""
+        if self._applying_remote or not self.connected:
+            return
+        write_frame(
+            self._writer,
+            {"type": "invalidate", "resource": resource, "guild_id": guild_id, "pid": os.getpid()}
+        )
+    
+    def _forward_watch(self, guild_id: str, watched: bool) -> None:
+        """Tell the bot that this worker started or stopped streaming a guild."""
+        if self.connected:
+            write_frame(self._writer, {"type": "watch", "guild_id": guild_id, "watched": watched})
+    
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        """Resolve call results and apply invalidations and events from the bot."""
+        try:
+            while True:
+                frame = await read_frame(reader)
+                if frame["type"] == "results":
+                    for call_id, ok, value in frame["results"]:
+                        future = self._futures.get(call_id)
+                        if future is None or future.done():
+                            continue
+                        if ok:
+                            future.set_result(value)
+                        else:
+                            future.set_exception(IPCError(value))
+                elif frame["type"] == "invalidate" and frame.get("pid") != os.getpid():
+                    # Don't forward the change back to where it came from;
+                    # a client in the bot process shares its invalidator
+                    self._applying_remote = True
+                    try:
+                        get_invalidator().invalidate(frame["resource"], frame["guild_id"])
+                    finally:
+                        self._applying_remote = False
+                elif frame["type"] == "event" and frame.get("pid") != os.getpid():
+                    get_event_bus().publish(TicketEvent.from_dict(frame["event"]))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.log.warning("Lost connection to the bot process")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.log.error(f"IPC read loop failed: {e}")
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            self._fail(list(self._futures), IPCError("Bot process connection lost"))
\ No newline at end of file
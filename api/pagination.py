@@ -0,0 +1,98 @@
+"""Keyset pagination for ticket listings."""
+
+import base64
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import Select, or_, select
+
+from database.models import Category, Ticket
+
+# Columns needed by TicketResponse; relationships are never loaded
+TICKET_LIST_COLUMNS = (
+    Ticket.id,
+    Ticket.number,
+    Category.name.label("category"),
+    Ticket.created_by_id,
+    Ticket.created_at,
+    Ticket.open,
+    Ticket.topic,
+    Ticket.priority,
+)
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(created_at: datetime, ticket_id: str) -> str:
+    """Encode the position after a ticket as an opaque cursor."""
+    raw = f"{created_at.isoformat()}|{ticket_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor produced by ``encode_cursor``."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, ticket_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), ticket_id
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(str(e)) from e
+
+
+def build_ticket_query(
+    guild_id: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    open: Optional[bool] = None,
+    category_id: Optional[int] = None,
+    creator_id: Optional[str] = None,
+    priority: Optional[str] = None
+) -> Select:
+    """Build a newest-first ticket page query.
+    
+    Pages are addressed by ``(created_at, id)`` of the last row rather than an
+    offset, so with the ``(guild_id, created_at, id)`` index every page costs
+    the same regardless of depth. One extra row is fetched to detect whether
+    a next page exists.
+    """
+    query = (
+        select(*TICKET_LIST_COLUMNS)
+        .join(Category, Category.id == Ticket.category_id)
+        .where(Ticket.guild_id == guild_id)
+    )
+    
+    if open is not None:
+        query = query.where(Ticket.open == open)
+    if category_id is not None:
+        query = query.where(Ticket.category_id == category_id)
+    if creator_id is not None:
+        query = query.where(Ticket.created_by_id == creator_id)
+    if priority is not None:
+        query = query.where(Ticket.priority == priority.upper())
+    
+    if cursor:
+        created_at, ticket_id = decode_cursor(cursor)
+        # The leading range bound lets the index seek straight to the cursor;
+        # without it SQLite walks the index from the newest row to reach it
+        query = query.where(
+            Ticket.created_at <= created_at,
+            or_(Ticket.created_at < created_at, Ticket.id < ticket_id)
+        )
+    
+    return query.order_by(Ticket.created_at.desc(), Ticket.id.desc()).limit(limit + 1)
+
+
+def row_to_dict(row: Any) -> Dict[str, Any]:
+    """Convert a ticket list row into a TicketResponse-shaped dict."""
+    return {
+        "id": row.id,
+        "number": row.number,
+        "category": row.category,
+        "created_by": row.created_by_id,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "open": row.open,
+        "topic": row.topic,
+        "priority": row.priority,
+    }
\ No newline at end of file
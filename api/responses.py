@@ -0,0 +1,15 @@
+"""Response classes for the dashboard API."""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from utils.serialization import dumps_bytes
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when it is installed."""
+    
+    def render(self, content: Any) -> bytes:
+        """Serialize the response body."""
+        return dumps_bytes(content)
\ No newline at end of file
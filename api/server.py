@@ -1,28 +1,72 @@
 """FastAPI server for Discord Tickets web dashboard."""
 
 import os
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
 
-from fastapi import FastAPI, HTTPException, Depends, Cookie
+from fastapi import FastAPI, HTTPException, Depends, Cookie, Query, Request, Response
 from fastapi.security import HTTPBearer
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
+import aiohttp
 import uvicorn
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from sqlalchemy import select
 
+from api.auth import TOKEN_COOKIE, AuthManager, Principal
+from api.cache import ResponseCache
+from api.compression import CompressionMiddleware, PrecompressedStaticFiles
+from api.guilds import RateLimited, UserGuildsFetcher
+from api.ipc import IPCClient
+from api.pagination import InvalidCursor, build_ticket_query, encode_cursor, row_to_dict
+from api.responses import FastJSONResponse
+from api.state import BotState, IPCBotState, LocalBotState
+from bot.tickets.close_jobs import batch_progress
+from bot.tickets.events import Subscription, get_event_bus
 from config.env import get_settings
-from utils.logger import get_bot_logger
+from database.models import Category, Guild, Question, Tag, connect_db
+from database.routing import SessionRouter, connect_replica
+from utils.cache import CATEGORIES, GUILD_SETTINGS, TAGS
+from utils.logger import get_bot_logger, setup_logger
+from utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, LoopLagMonitor, get_registry, render
+from utils.serialization import dumps_bytes, loads
+
+# Ticket pages larger than this are streamed in chunks of STREAM_CHUNK_SIZE rows
+STREAM_THRESHOLD = 200
+STREAM_CHUNK_SIZE = 100
+
+# Live event streams: events buffered per client, and the keep-alive interval
+EVENT_QUEUE_SIZE = 100
+EVENT_HEARTBEAT = 15.0
+
+# Discord permission bits: Administrator, and Manage Server, which the
+# dashboard requires to read a guild's tickets and configuration
+ADMINISTRATOR = 1 << 3
+MANAGE_GUILD = 1 << 5
 
 
 class TicketsAPI:
     """Discord Tickets FastAPI server."""
     
-    def __init__(self, bot):
-        """Initialize the API server."""
+    def __init__(self, bot, state: Optional[BotState] = None, precompress_static: bool = True):
+        """Initialize the API server.
+        
+        ``bot`` is None in a standalone worker process, which then opens its
+        own database engine and reads bot state through ``state``. Workers
+        don't set ``precompress_static``, as their parent precompresses the
+        dashboard before starting them.
+        """
         self.bot = bot
+        self.state = state or LocalBotState(bot)
+        self.precompress_static = precompress_static
+        self.static: Optional[PrecompressedStaticFiles] = None
         self.settings = get_settings()
         self.log = get_bot_logger().api
+        self.cache = ResponseCache()
+        # Logouts are read back from the primary, which a replica may lag
+        self.auth = AuthManager(self.settings, lambda: self.db_router.primary_factory())
+        self.guilds = UserGuildsFetcher(self.auth, self.state)
+        self._router: Optional[SessionRouter] = None
         
         # Create FastAPI app
         self.app = FastAPI(
@@ -31,6 +75,8 @@ class TicketsAPI:
             version="4.1.0",
             docs_url="/docs" if os.getenv("DEBUG") else None,
             redoc_url="/redoc" if os.getenv("DEBUG") else None,
+            default_response_class=FastJSONResponse,
+            lifespan=self.lifespan,
         )
         
         # Setup middleware
@@ -38,6 +84,9 @@ class TicketsAPI:
         
         # Setup routes
         self.setup_routes()
+        
+        # Serve the dashboard bundle, if one has been built
+        self.setup_static()
     
     def setup_middleware(self) -> None:
         """Setup FastAPI middleware."""
@@ -49,6 +98,64 @@ class TicketsAPI:
             allow_methods=["GET", "POST", "PUT", "DELETE"],
             allow_headers=["*"],
         )
+        
+        # Compress large JSON responses (ticket lists, transcripts, exports)
+        self.app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=self.settings.http_compress_min_size,
+        )
+    
+    @property
+    def db_router(self) -> SessionRouter:
+        """Get the router that opens database sessions; every query here is a read."""
+        if self._router is not None:
+            return self._router
+        return self.bot.db_router
+    
+    @asynccontextmanager
+    async def lifespan(self, app: FastAPI) -> AsyncIterator[None]:
+        """Open worker-owned resources for the lifetime of the app."""
+        engines = []
+        if self.bot is None:
+            engine, session_factory = connect_db(
+                self.settings.db_connection_url or "sqlite+aiosqlite:///tickets.db",
+                self.settings
+            )
+            engines.append(engine)
+            self._router = SessionRouter(session_factory, fallback=self.settings.db_replica_fallback)
+            if self.settings.db_replica_url:
+                replica_engine, self._router.replica_factory = await connect_replica(
+                    self.settings.db_replica_url,
+                    engine,
+                    self.settings
+                )
+                engines.append(replica_engine)
+            self._router.start()
+        await self.state.start()
+        
+        # Compressing the bundle would block the loop, which may be the bot's
+        if self.static is not None:
+            if self.precompress_static:
+                await self.static.precompress()
+            self.log.info(
+                f"Serving dashboard from {self.static.directory} ({len(self.static.variants)} precompressed files)"
+            )
+        
+        # The bot measures its own loop when the API shares it
+        loop_lag = LoopLagMonitor() if self.bot is None else None
+        if loop_lag is not None:
+            loop_lag.start()
+        try:
+            yield
+        finally:
+            if loop_lag is not None:
+                await loop_lag.stop()
+            await self.auth.close()
+            await self.state.close()
+            if self._router is not None:
+                self._router.stop()
+            for engine in engines:
+                await engine.dispose()
     
     def setup_routes(self) -> None:
         """Setup API routes."""
@@ -65,47 +172,386 @@ class TicketsAPI:
         @self.app.get("/health")
         async def health():
             """Health check endpoint."""
+            try:
+                status = await self.state.status()
+            except Exception as e:
+                self.log.warning(f"Failed to get bot status: {e}")
+                status = {"ready": False, "guilds": 0}
             return {
                 "status": "healthy",
-                "bot_connected": self.bot.is_ready() if self.bot else False,
-                "guilds": len(self.bot.guilds) if self.bot and self.bot.is_ready() else 0
+                "bot_connected": status["ready"],
+                "guilds": status["guilds"],
+                "pid": os.getpid(),
             }
         
-        @self.app.get("/api/user")
-        async def get_user_info(token: Optional[str] = Cookie(None)):
+        @self.app.get("/metrics")
+        async def metrics():
+            """Metrics in the Prometheus text format."""
+            return Response(await self.render_metrics(), media_type=METRICS_CONTENT_TYPE)
+        
+        @self.app.get("/api/user", response_model=UserResponse)
+        async def get_user_info(principal: Principal = Depends(self.auth)):
             """Get current user information."""
-            if not token:
-                raise HTTPException(status_code=401, detail="Not authenticated")
+            try:
+                user = await self.auth.fetch_user(principal)
+            except Exception as e:
+                # Fall back to the details captured at login
+                self.log.warning(f"Failed to fetch user {principal.id}: {e}")
+                user = {"username": principal.username, "avatar": principal.avatar}
             
-            # TODO: Implement JWT token verification and user fetching
-            return {"message": "User endpoint - not implemented yet"}
+            return {
+                "id": principal.id,
+                "username": user.get("username") or principal.username,
+                "display_name": user.get("global_name") or user.get("username") or principal.username,
+                "avatar": user.get("avatar"),
+            }
+        
+        @self.app.post("/auth/logout")
+        async def logout(response: Response, principal: Principal = Depends(self.auth)):
+            """End every dashboard session of the current user."""
+            await self.auth.revoke(principal.id)
+            response.delete_cookie(TOKEN_COOKIE, path="/")
+            return {"status": "logged out"}
         
-        @self.app.get("/api/guilds")
-        async def get_user_guilds(token: Optional[str] = Cookie(None)):
+        @self.app.get("/api/guilds", response_model=List[GuildResponse])
+        async def get_user_guilds(principal: Principal = Depends(self.auth)):
             """Get user's guilds."""
-            if not token:
-                raise HTTPException(status_code=401, detail="Not authenticated")
+            try:
+                return await self.guilds.get_guilds(principal)
+            except RateLimited as e:
+                raise HTTPException(
+                    status_code=429,
+                    detail="Discord is rate limiting guild requests, try again shortly.",
+                    headers={"Retry-After": str(int(e.retry_after + 0.999))}
+                )
+            except aiohttp.ClientError as e:
+                self.log.error(f"Failed to fetch guilds for user {principal.id}: {e}")
+                raise HTTPException(status_code=502, detail="Failed to fetch guilds from Discord")
+        
+        @self.app.get("/api/guilds/{guild_id}/tickets", response_model=TicketPageResponse)
+        async def get_guild_tickets(
+            guild_id: str,
+            principal: Principal = Depends(self.auth),
+            limit: int = Query(50, ge=1, le=1000),
+            cursor: Optional[str] = None,
+            open: Optional[bool] = None,
+            category: Optional[int] = None,
+            creator: Optional[str] = None,
+            priority: Optional[str] = None
+        ):
+            """Get a page of tickets for a guild, newest first."""
+            await self.require_manager(principal, guild_id)
+            try:
+                query = build_ticket_query(
+                    guild_id,
+                    limit,
+                    cursor=cursor,
+                    open=open,
+                    category_id=category,
+                    creator_id=creator,
+                    priority=priority
+                )
+            except InvalidCursor:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            
+            if limit > STREAM_THRESHOLD:
+                return StreamingResponse(
+                    self.stream_ticket_page(guild_id, query, limit),
+                    media_type="application/json"
+                )
+            
+            async with self.db_router.read(guild_id) as session:
+                rows = (await session.execute(query)).all()
+            
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
             
-            # TODO: Implement guild fetching for authenticated user
-            return {"message": "Guilds endpoint - not implemented yet"}
-        
-        @self.app.get("/api/guilds/{guild_id}/tickets")
-        async def get_guild_tickets(guild_id: str, token: Optional[str] = Cookie(None)):
-            """Get tickets for a guild."""
-            if not token:
-                raise HTTPException(status_code=401, detail="Not authenticated")
+            return FastJSONResponse({
+                "tickets": [row_to_dict(row) for row in rows],
+                "next_cursor": next_cursor,
+            })
+        
+        @self.app.post("/api/guilds/{guild_id}/tickets/close", response_model=BulkCloseResponse, status_code=202)
+        async def close_guild_tickets(
+            guild_id: str,
+            body: BulkCloseRequest,
+            principal: Principal = Depends(self.auth)
+        ):
+            """Bulk close a guild's stale tickets, or every open ticket in a category."""
+            await self.require_admin(principal, guild_id)
+            if body.stale_after is None and body.category is None:
+                raise HTTPException(status_code=400, detail="Set stale_after or category")
             
-            # TODO: Implement ticket fetching for guild
-            return {"message": f"Tickets for guild {guild_id} - not implemented yet"}
+            try:
+                result = await self.state.close_tickets(
+                    guild_id,
+                    principal.id,
+                    body.reason,
+                    body.stale_after,
+                    body.category
+                )
+            except Exception as e:
+                self.log.error(f"Failed to bulk close tickets in guild {guild_id}: {e}")
+                result = None
+            if result is None:
+                raise HTTPException(status_code=503, detail="Failed to close tickets, try again shortly")
+            return result
+        
+        @self.app.get("/api/guilds/{guild_id}/tickets/close/{batch}", response_model=BulkCloseProgressResponse)
+        async def get_bulk_close_progress(
+            guild_id: str,
+            batch: str,
+            principal: Principal = Depends(self.auth)
+        ):
+            """Get how many of a bulk close's tickets are still being archived and deleted."""
+            await self.require_admin(principal, guild_id)
+            async with self.db_router.read(guild_id) as session:
+                return await batch_progress(session, guild_id, batch)
+        
+        @self.app.get("/api/guilds/{guild_id}/events")
+        async def get_guild_events(guild_id: str, principal: Principal = Depends(self.auth)):
+            """Stream a guild's ticket events as Server-Sent Events."""
+            # Events carry ticket message content
+            await self.require_manager(principal, guild_id)
+            subscription = get_event_bus().subscribe(guild_id, maxsize=EVENT_QUEUE_SIZE)
+            return StreamingResponse(
+                self.stream_events(subscription),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
         
         @self.app.get("/api/guilds/{guild_id}/categories")
-        async def get_guild_categories(guild_id: str, token: Optional[str] = Cookie(None)):
+        async def get_guild_categories(
+            guild_id: str,
+            request: Request,
+            principal: Principal = Depends(self.auth)
+        ):
             """Get ticket categories for a guild."""
-            if not token:
-                raise HTTPException(status_code=401, detail="Not authenticated")
-            
-            # TODO: Implement category fetching for guild
-            return {"message": f"Categories for guild {guild_id} - not implemented yet"}
+            # Checked on every request; cached responses are shared by everyone allowed
+            await self.require_manager(principal, guild_id)
+            return await self.cache.respond(
+                request, CATEGORIES, guild_id, lambda: self.load_categories(guild_id)
+            )
+        
+        @self.app.get("/api/guilds/{guild_id}/settings")
+        async def get_guild_settings(
+            guild_id: str,
+            request: Request,
+            principal: Principal = Depends(self.auth)
+        ):
+            """Get settings for a guild."""
+            await self.require_manager(principal, guild_id)
+            return await self.cache.respond(
+                request, GUILD_SETTINGS, guild_id, lambda: self.load_settings(guild_id)
+            )
+        
+        @self.app.get("/api/guilds/{guild_id}/tags")
+        async def get_guild_tags(
+            guild_id: str,
+            request: Request,
+            principal: Principal = Depends(self.auth)
+        ):
+            """Get tags for a guild."""
+            await self.require_manager(principal, guild_id)
+            return await self.cache.respond(
+                request, TAGS, guild_id, lambda: self.load_tags(guild_id)
+            )
+    
+    async def require_admin(self, principal: Principal, guild_id: str) -> None:
+        """Reject the request unless the user is an administrator of the guild."""
+        await self.require_permission(principal, guild_id, ADMINISTRATOR, "Only guild administrators can do this")
+    
+    async def require_manager(self, principal: Principal, guild_id: str) -> None:
+        """Reject the request unless the user can manage the guild, as the dashboard requires."""
+        await self.require_permission(
+            principal,
+            guild_id,
+            MANAGE_GUILD,
+            "You need the Manage Server permission in this guild"
+        )
+    
+    async def require_permission(self, principal: Principal, guild_id: str, permission: int, detail: str) -> None:
+        """Reject the request unless the user has a permission, or is an administrator, in the guild."""
+        try:
+            guilds = await self.guilds.get_guilds(principal)
+        except RateLimited as e:
+            raise HTTPException(
+                status_code=429,
+                detail="Discord is rate limiting guild requests, try again shortly.",
+                headers={"Retry-After": str(int(e.retry_after + 0.999))}
+            )
+        except aiohttp.ClientError as e:
+            self.log.error(f"Failed to fetch guilds for user {principal.id}: {e}")
+            raise HTTPException(status_code=502, detail="Failed to fetch guilds from Discord")
+        
+        for guild in guilds:
+            if guild["id"] == guild_id and guild["permissions"] & (permission | ADMINISTRATOR):
+                return
+        raise HTTPException(status_code=403, detail=detail)
+    
+    def setup_static(self) -> None:
+        """Mount the dashboard bundle; its variants are built when the app starts."""
+        dashboard_dir = self.settings.dashboard_dir
+        if not dashboard_dir:
+            return
+        
+        if not os.path.isdir(dashboard_dir):
+            self.log.warning(f"Dashboard directory {dashboard_dir} does not exist, not serving it")
+            return
+        
+        self.static = PrecompressedStaticFiles(
+            directory=dashboard_dir,
+            html=True,
+            minimum_size=self.settings.http_compress_min_size,
+        )
+        self.app.mount("/dashboard", self.static, name="dashboard")
+    
+    async def load_categories(self, guild_id: str) -> List[dict]:
+        """Load a guild's categories and their questions."""
+        async with self.db_router.read(guild_id) as session:
+            categories = (await session.execute(
+                select(Category).where(Category.guild_id == guild_id).order_by(Category.id)
+            )).scalars().all()
+            questions = (await session.execute(
+                select(Question)
+                .join(Category, Category.id == Question.category_id)
+                .where(Category.guild_id == guild_id)
+                .order_by(Question.order)
+            )).scalars().all()
+        
+        questions_by_category = {}
+        for question in questions:
+            questions_by_category.setdefault(question.category_id, []).append({
+                "id": question.id,
+                "label": question.label,
+                "type": question.type,
+                "style": question.style,
+                "placeholder": question.placeholder,
+                "required": question.required,
+                "min_length": question.min_length,
+                "max_length": question.max_length,
+                "options": loads(question.options or "[]"),
+            })
+        
+        return [
+            {
+                "id": category.id,
+                "name": category.name,
+                "description": category.description,
+                "emoji": category.emoji,
+                "channel_name": category.channel_name,
+                "discord_category": category.discord_category,
+                "claiming": category.claiming,
+                "cooldown": category.cooldown,
+                "enable_feedback": category.enable_feedback,
+                "member_limit": category.member_limit,
+                "total_limit": category.total_limit,
+                "require_topic": category.require_topic,
+                "staff_roles": loads(category.staff_roles or "[]"),
+                "ping_roles": loads(category.ping_roles or "[]"),
+                "required_roles": loads(category.required_roles or "[]"),
+                "questions": questions_by_category.get(category.id, []),
+            }
+            for category in categories
+        ]
+    
+    async def load_settings(self, guild_id: str) -> dict:
+        """Load a guild's settings."""
+        async with self.db_router.read(guild_id) as session:
+            guild = (await session.execute(
+                select(Guild).where(Guild.id == guild_id)
+            )).scalar_one_or_none()
+        
+        if guild is None:
+            raise HTTPException(status_code=404, detail="Guild not found")
+        
+        return {
+            "id": guild.id,
+            "locale": guild.locale,
+            "log_channel": guild.log_channel,
+            "archive": guild.archive,
+            "auto_close": guild.auto_close,
+            "stale_after": guild.stale_after,
+            "claim_button": guild.claim_button,
+            "close_button": guild.close_button,
+            "footer": guild.footer,
+            "primary_colour": guild.primary_colour,
+            "success_colour": guild.success_colour,
+            "error_colour": guild.error_colour,
+            "auto_tag": loads(guild.auto_tag or "[]"),
+            "blocklist": loads(guild.blocklist or "[]"),
+            "working_hours": loads(guild.working_hours or "[]"),
+        }
+    
+    async def load_tags(self, guild_id: str) -> List[dict]:
+        """Load a guild's tags."""
+        async with self.db_router.read(guild_id) as session:
+            tags = (await session.execute(
+                select(Tag.id, Tag.name, Tag.content, Tag.regex)
+                .where(Tag.guild_id == guild_id)
+                .order_by(Tag.name)
+            )).all()
+        
+        return [
+            {"id": tag.id, "name": tag.name, "content": tag.content, "regex": tag.regex}
+            for tag in tags
+        ]
+    
+    async def stream_ticket_page(self, guild_id: str, query, limit: int) -> AsyncIterator[bytes]:
+        """Stream a ticket page as JSON without holding every row in memory."""
+        yield b'{"tickets":['
+        
+        count = 0
+        last_row = None
+        has_more = False
+        async with self.db_router.read(guild_id) as session:
+            result = await session.stream(query.execution_options(yield_per=STREAM_CHUNK_SIZE))
+            async for partition in result.partitions(STREAM_CHUNK_SIZE):
+                chunk: List[bytes] = []
+                for row in partition:
+                    if count == limit:
+                        has_more = True
+                        break
+                    chunk.append(dumps_bytes(row_to_dict(row)))
+                    last_row = row
+                    count += 1
+                
+                if chunk:
+                    prefix = b"," if count > len(chunk) else b""
+                    yield prefix + b",".join(chunk)
+                if has_more:
+                    break
+        
+        next_cursor = encode_cursor(last_row.created_at, last_row.id) if has_more else None
+        yield b'],"next_cursor":' + dumps_bytes(next_cursor) + b"}"
+    
+    async def render_metrics(self) -> str:
+        """Render this process's metrics, plus the bot's when running as a worker."""
+        local = get_registry().collect()
+        if self.bot is not None:
+            return render([(local, {})])
+        
+        sources = [(local, {"process": f"api-{os.getpid()}"})]
+        try:
+            sources.insert(0, (await self.state.metrics(), {"process": "bot"}))
+        except Exception as e:
+            self.log.warning(f"Failed to get bot metrics: {e}")
+        return render(sources)
+    
+    async def stream_events(self, subscription: Subscription) -> AsyncIterator[bytes]:
+        """Yield a subscription's events until it or the client disconnects."""
+        try:
+            yield b"retry: 5000\n\n"
+            while not subscription.closed:
+                event = await subscription.get(timeout=EVENT_HEARTBEAT)
+                if event is not None:
+                    yield event.sse
+                elif not subscription.closed:
+                    yield b": ping\n\n"
+        finally:
+            subscription.close()
     
     async def start(self) -> None:
         """Start the API server."""
@@ -148,4 +594,39 @@ class TicketResponse(BaseModel):
     created_by: str
     created_at: str
     open: bool
-    topic: Optional[str] = None
\ No newline at end of file
+    topic: Optional[str] = None
+    priority: Optional[str] = None
+
+
+class TicketPageResponse(BaseModel):
+    """Page of tickets with a cursor for the next page."""
+    tickets: List[TicketResponse]
+    next_cursor: Optional[str] = None
+
+
+class BulkCloseRequest(BaseModel):
+    """Bulk close request model; ``stale_after`` is in milliseconds, like the guild setting."""
+    stale_after: Optional[int] = Field(None, gt=0)
+    category: Optional[int] = None
+    reason: Optional[str] = None
+
+
+class BulkCloseResponse(BaseModel):
+    """Bulk close batch and how many tickets it closed."""
+    batch: str
+    tickets: int
+
+
+class BulkCloseProgressResponse(BaseModel):
+    """Tickets of a bulk close still being archived and deleted, and those that failed."""
+    pending: int
+    failed: int
+
+
+def create_app() -> FastAPI:
+    """Create the app for a standalone worker process (``uvicorn --factory``)."""
+    settings = get_settings()
+    setup_logger(level=settings.log_level, json_logs=settings.log_json)
+    
+    state = IPCBotState(IPCClient(settings.ipc_socket_path))
+    return TicketsAPI(None, state=state, precompress_static=False).app
\ No newline at end of file
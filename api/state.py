@@ -0,0 +1,291 @@
+"""Live bot state as seen by the API, in-process or over IPC."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from utils.metrics import get_registry, merge_families
+
+if TYPE_CHECKING:
+    from api.ipc import IPCClient
+    from bot.cluster import ShardMap
+
+
+class BotState(ABC):
+    """View of the gateway client's state, and the ticket operations the API runs through it."""
+    
+    # Methods API workers may call over IPC
+    IPC_METHODS = (
+        "status", "guild_ids", "filter_guilds", "get_guild", "get_member_roles", "metrics", "close_tickets"
+    )
+    
+    async def start(self) -> None:
+        """Acquire any resources the state needs."""
+    
+    async def close(self) -> None:
+        """Release the state's resources."""
+    
+    @abstractmethod
+    async def status(self) -> Dict[str, Any]:
+        """Get readiness, guild count and gateway latency."""
+    
+    @abstractmethod
+    async def guild_ids(self) -> List[str]:
+        """Get the IDs of every guild the bot is in."""
+    
+    @abstractmethod
+    async def filter_guilds(self, guild_ids: List[str]) -> List[str]:
+        """Get the IDs from ``guild_ids`` of guilds the bot is in."""
+    
+    @abstractmethod
+    async def get_guild(self, guild_id: str) -> Optional[Dict[str, Any]]:
+        """Get basic information about a guild, if the bot is in it."""
+    
+    @abstractmethod
+    async def get_member_roles(self, guild_id: str, user_id: str) -> Optional[List[str]]:
+        """Get a member's role IDs, or None if they are not a member."""
+    
+    @abstractmethod
+    async def metrics(self) -> List[Dict[str, Any]]:
+        """Get the bot process's collected metric families."""
+    
+    @abstractmethod
+    async def close_tickets(
+        self,
+        guild_id: str,
+        user_id: str,
+        reason: Optional[str] = None,
+        stale_after: Optional[int] = None,
+        category_id: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Bulk close a guild's tickets idle for ``stale_after`` milliseconds or in a category."""
+
+
+class LocalBotState(BotState):
+    """Bot state read directly from a client in the same process."""
+    
+    def __init__(self, bot):
+        """Initialize the local state."""
+        self.bot = bot
+    
+    async def status(self) -> Dict[str, Any]:
+        """Get readiness, guild count and gateway latency."""
+        ready = self.bot.is_ready()
+        status = {
+            "ready": ready,
+            "guilds": len(self.bot.guilds) if ready else 0,
+            "latency": self.bot.latency if ready else None,
+        }
+        # Auto-sharded clients report each shard's heartbeat latency
+        if ready and hasattr(self.bot, "latencies"):
+            status["shards"] = [[shard_id, latency] for shard_id, latency in self.bot.latencies]
+        return status
+    
+    async def guild_ids(self) -> List[str]:
+        """Get the IDs of every guild the bot is in."""
+        return [str(guild.id) for guild in self.bot.guilds]
+    
+    async def filter_guilds(self, guild_ids: List[str]) -> List[str]:
+        """Get the IDs from ``guild_ids`` of guilds the bot is in."""
+        return [guild_id for guild_id in guild_ids if self.bot.get_guild(int(guild_id)) is not None]
+    
+    async def get_guild(self, guild_id: str) -> Optional[Dict[str, Any]]:
+        """Get basic information about a guild, if the bot is in it."""
+        guild = self.bot.get_guild(int(guild_id))
+        if guild is None:
+            return None
+        return {
+            "id": str(guild.id),
+            "name": guild.name,
+            "icon": guild.icon.key if guild.icon else None,
+            "member_count": guild.member_count,
+        }
+    
+    async def get_member_roles(self, guild_id: str, user_id: str) -> Optional[List[str]]:
+        """Get a member's role IDs, or None if they are not a member."""
+        return await self.bot.members.get_roles(int(guild_id), int(user_id))
+    
+    async def metrics(self) -> List[Dict[str, Any]]:
+        """Get the bot process's collected metric families."""
+        return get_registry().collect()
+    
+    async def close_tickets(
+        self,
+        guild_id: str,
+        user_id: str,
+        reason: Optional[str] = None,
+        stale_after: Optional[int] = None,
+        category_id: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Bulk close a guild's tickets idle for ``stale_after`` milliseconds or in a category."""
+        return await self.bot.ticket_manager.bulk_close(
+            guild_id,
+            user_id,
+            reason,
+            timedelta(milliseconds=stale_after) if stale_after is not None else None,
+            category_id
+        )
+
+
+class IPCBotState(BotState):
+    """Bot state fetched from the bot process by an API worker."""
+    
+    def __init__(self, client: "IPCClient"):
+        """Initialize the IPC state."""
+        self.client = client
+    
+    async def start(self) -> None:
+        """Connect to the bot process."""
+        try:
+            await self.client.connect()
+        except OSError as e:
+            # Calls reconnect on demand, so the worker can start before the bot
+            self.client.log.warning(f"Bot process not reachable yet: {e}")
+    
+    async def close(self) -> None:
+        """Disconnect from the bot process."""
+        await self.client.close()
+    
+    async def status(self) -> Dict[str, Any]:
+        """Get readiness, guild count and gateway latency."""
+        return await self.client.call("status")
+    
+    async def guild_ids(self) -> List[str]:
+        """Get the IDs of every guild the bot is in."""
+        return await self.client.call("guild_ids")
+    
+    async def filter_guilds(self, guild_ids: List[str]) -> List[str]:
+        """Get the IDs from ``guild_ids`` of guilds the bot is in."""
+        return await self.client.call("filter_guilds", guild_ids=guild_ids)
+    
+    async def get_guild(self, guild_id: str) -> Optional[Dict[str, Any]]:
+        """Get basic information about a guild, if the bot is in it."""
+        return await self.client.call("get_guild", guild_id=guild_id)
+    
+    async def get_member_roles(self, guild_id: str, user_id: str) -> Optional[List[str]]:
+        """Get a member's role IDs, or None if they are not a member."""
+        return await self.client.call("get_member_roles", guild_id=guild_id, user_id=user_id)
+    
+    async def metrics(self) -> List[Dict[str, Any]]:
+        """Get the bot process's collected metric families."""
+        return await self.client.call("metrics")
+    
+    async def close_tickets(
+        self,
+        guild_id: str,
+        user_id: str,
+        reason: Optional[str] = None,
+        stale_after: Optional[int] = None,
+        category_id: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Bulk close a guild's tickets idle for ``stale_after`` milliseconds or in a category."""
+        return await self.client.call(
+            "close_tickets",
+            guild_id=guild_id,
+            user_id=user_id,
+            reason=reason,
+            stale_after=stale_after,
+            category_id=category_id
+        )
+
+
+class ClusterBotState(BotState):
+    """Bot state spread across shard cluster processes, read by their supervisor.
+    
+    Guild lookups go to the cluster whose shards receive the guild; status,
+    guild lists and metrics are gathered from every cluster.
+    """
+    
+    def __init__(self, shard_map: "ShardMap", clients: List["IPCClient"]):
+        """Initialize the cluster state with one IPC client per cluster."""
+        self.shard_map = shard_map
+        self.clients = clients
+    
+    def client_for(self, guild_id: str) -> "IPCClient":
+        """Get the client of the cluster that owns a guild."""
+        return self.clients[self.shard_map.cluster_for_guild(int(guild_id))]
+    
+    async def start(self) -> None:
+        """Connect to every cluster."""
+        for cluster_id, client in enumerate(self.clients):
+            try:
+                await client.connect()
+            except OSError as e:
+                # Calls reconnect on demand, so clusters can start after us
+                client.log.warning(f"Cluster {cluster_id} not reachable yet: {e}")
+    
+    async def close(self) -> None:
+        """Disconnect from every cluster."""
+        for client in self.clients:
+            await client.close()
+    
+    async def status(self) -> Dict[str, Any]:
+        """Get readiness, guild count and gateway latency of every cluster."""
+        results = await asyncio.gather(*(client.call("status") for client in self.clients), return_exceptions=True)
+        clusters = []
+        for cluster_id, result in enumerate(results):
+            if isinstance(result, Exception):
+                result = {"ready": False, "guilds": 0, "latency": None, "error": str(result)}
+            clusters.append({"id": cluster_id, "shard_ids": self.shard_map.shard_ids(cluster_id), **result})
+        
+        latencies = [cluster["latency"] for cluster in clusters if cluster["latency"] is not None]
+        return {
+            "ready": all(cluster["ready"] for cluster in clusters),
+            "guilds": sum(cluster["guilds"] for cluster in clusters),
+            "latency": max(latencies) if latencies else None,
+            "clusters": clusters,
+        }
+    
+    async def guild_ids(self) -> List[str]:
+        """Get the IDs of every guild the bot is in."""
+        results = await asyncio.gather(*(client.call("guild_ids") for client in self.clients))
+        return [guild_id for guild_ids in results for guild_id in guild_ids]
+    
+    async def filter_guilds(self, guild_ids: List[str]) -> List[str]:
+        """Get the IDs from ``guild_ids`` of guilds the bot is in."""
+        by_cluster: Dict[int, List[str]] = defaultdict(list)
+        for guild_id in guild_ids:
+            by_cluster[self.shard_map.cluster_for_guild(int(guild_id))].append(guild_id)
+        results = await asyncio.gather(*(
+            self.clients[cluster_id].call("filter_guilds", guild_ids=cluster_guild_ids)
+            for cluster_id, cluster_guild_ids in by_cluster.items()
+        ))
+        found = {guild_id for cluster_guild_ids in results for guild_id in cluster_guild_ids}
+        return [guild_id for guild_id in guild_ids if guild_id in found]
+    
+    async def get_guild(self, guild_id: str) -> Optional[Dict[str, Any]]:
+        """Get basic information about a guild, if the bot is in it."""
+        return await self.client_for(guild_id).call("get_guild", guild_id=guild_id)
+    
+    async def get_member_roles(self, guild_id: str, user_id: str) -> Optional[List[str]]:
+        """Get a member's role IDs, or None if they are not a member."""
+        return await self.client_for(guild_id).call("get_member_roles", guild_id=guild_id, user_id=user_id)
+    
+    async def close_tickets(
+        self,
+        guild_id: str,
+        user_id: str,
+        reason: Optional[str] = None,
+        stale_after: Optional[int] = None,
+        category_id: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Bulk close a guild's tickets in the cluster that owns the guild."""
+        return await self.client_for(guild_id).call(
+            "close_tickets",
+            guild_id=guild_id,
+            user_id=user_id,
+            reason=reason,
+            stale_after=stale_after,
+            category_id=category_id
+        )
+    
+    async def metrics(self) -> List[Dict[str, Any]]:
+        """Get every reachable cluster's metric families, labelled by cluster."""
+        results = await asyncio.gather(*(client.call("metrics") for client in self.clients), return_exceptions=True)
+        return merge_families(
+            (families, {"cluster": str(cluster_id)})
+            for cluster_id, families in enumerate(results)
+            if not isinstance(families, Exception)
+        )
\ No newline at end of file
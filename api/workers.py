@@ -0,0 +1,67 @@
+"""Dashboard API worker processes."""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+from api.compression import precompress_directory
+from config.env import Settings
+from utils.logger import get_bot_logger
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+
+
+class APIWorkerPool:
+    """Run the dashboard API as uvicorn worker processes beside the bot.
+    
+    The workers share the database with the bot and read live bot state
+    through ``IPCServer``, so slow API requests never run on the gateway
+    event loop.
+    """
+    
+    def __init__(self, settings: Settings):
+        """Initialize the worker pool."""
+        self.settings = settings
+        self.log = get_bot_logger().api
+        self.process: Optional[asyncio.subprocess.Process] = None
+    
+    def command(self) -> list:
+        """Build the uvicorn command line."""
+        return [
+            sys.executable, "-m", "uvicorn", "api.server:create_app",
+            "--factory",
+            "--app-dir", str(PROJECT_ROOT),
+            "--host", self.settings.http_host,
+            "--port", str(self.settings.http_port),
+            "--workers", str(self.settings.api_workers),
+            "--log-level", "warning",
+            "--no-access-log",
+        ]
+    
+    async def start(self) -> None:
+        """Precompress the dashboard, then start the worker processes."""
+        # Once here rather than in every worker at the same time
+        dashboard_dir = self.settings.dashboard_dir
+        if dashboard_dir and os.path.isdir(dashboard_dir):
+            await asyncio.to_thread(precompress_directory, dashboard_dir, self.settings.http_compress_min_size)
+        
+        self.process = await asyncio.create_subprocess_exec(*self.command())
+        self.log.info(
+            f"Started {self.settings.api_workers} API worker(s) on "
+            f"{self.settings.http_host}:{self.settings.http_port} (pid {self.process.pid})"
+        )
+    
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop the worker processes, killing them if they don't exit in time."""
+        if self.process is None or self.process.returncode is not None:
+            return
+        
+        self.process.terminate()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout)
+        except asyncio.TimeoutError:
+            self.log.warning("API workers did not exit in time, killing them")
+            self.process.kill()
+            await self.process.wait()
\ No newline at end of file
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Benchmark gateway event loop lag while the dashboard API is under load.
+
+Compares serving the API from the bot's event loop with serving it from
+uvicorn worker processes that reach the bot over IPC. The "gateway" is
+represented by a probe that measures how late its timer callbacks fire.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+
+os.environ.setdefault("DISCORD_TOKEN", "MTIzNDU2Nzg5MDEyMzQ1Njc4.benchmark.token")
+os.environ.setdefault("DISCORD_SECRET", "benchmark")
+os.environ.setdefault("ENCRYPTION_KEY", "b" * 48)
+os.environ.setdefault("HTTP_EXTERNAL", "http://localhost")
+
+GUILD_ID = "100000000000000000"
+PROBE_INTERVAL = 0.005
+
+
+class FakeBot:
+    """Just enough of the gateway client for ``LocalBotState``."""
+    
+    def __init__(self, session_factory, guilds: int = 1000):
+        self.db_session_factory = session_factory
+        self.latency = 0.042
+        self.guilds = [
+            SimpleNamespace(id=int(GUILD_ID) + i, name=f"Guild {i}", icon=None, member_count=100)
+            for i in range(guilds)
+        ]
+        self._by_id = {guild.id: guild for guild in self.guilds}
+    
+    def is_ready(self) -> bool:
+        return True
+    
+    def get_guild(self, guild_id: int):
+        return self._by_id.get(guild_id)
+
+
+def free_port() -> int:
+    """Find an unused TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def generate_load(url: str, token: str, duration: float, concurrency: int, results) -> None:
+    """Hit the API from a separate process so the load itself isn't measured."""
+    import httpx
+    
+    async def worker(client: httpx.AsyncClient, counts: dict) -> None:
+        deadline = time.perf_counter() + duration
+        i = 0
+        while time.perf_counter() < deadline:
+            # Mostly heavy ticket pages, with IPC-backed health checks mixed in
+            path = "/health" if i % 4 == 0 else f"/api/guilds/{GUILD_ID}/tickets?limit=1000"
+            response = await client.get(url + path, cookies={"token": token})
+            counts["ok" if response.status_code == 200 else "failed"] += 1
+            i += 1
+    
+    async def run() -> dict:
+        counts = {"ok": 0, "failed": 0}
+        async with httpx.AsyncClient(timeout=30) as client:
+            await asyncio.gather(*(worker(client, counts) for _ in range(concurrency)))
+        return counts
+    
+    results.put(asyncio.run(run()))
+
+
+async def probe_lag(stop: asyncio.Event) -> list:
+    """Measure how late timer callbacks run on this event loop, in milliseconds."""
+    samples = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        samples.append((time.perf_counter() - start - PROBE_INTERVAL) * 1000)
+    return samples
+
+
+async def wait_for_server(url: str, timeout: float = 30.0) -> None:
+    """Wait until the API answers health checks."""
+    import httpx
+    
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.perf_counter() < deadline:
+            try:
+                if (await client.get(url + "/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("API did not start in time")
+
+
+async def measure(url: str, duration: float, concurrency: int) -> dict:
+    """Run the load generator and the lag probe at the same time."""
+    from api.auth import AuthManager
+    
+    token = AuthManager().issue_token(
+        {"id": "1", "username": "benchmark"},
+        {"access_token": "benchmark", "expires_in": 3600, "scope": "identify guilds"}
+    )
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=generate_load, args=(url, token, duration, concurrency, results))
+    
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_lag(stop))
+    process.start()
+    counts = await asyncio.to_thread(results.get)
+    await asyncio.to_thread(process.join)
+    stop.set()
+    samples = await probe
+    
+    samples.sort()
+    return {
+        "requests/s": (counts["ok"] + counts["failed"]) / duration,
+        "failed": counts["failed"],
+        "lag p50": statistics.median(samples),
+        "lag p99": samples[int(len(samples) * 0.99)],
+        "lag max": samples[-1],
+    }
+
+
+def print_result(mode: str, result: dict) -> None:
+    """Print one benchmark row."""
+    print(
+        f"{mode:<14} {result['requests/s']:>10.1f} {result['failed']:>7} "
+        f"{result['lag p50']:>9.2f}ms {result['lag p99']:>9.2f}ms {result['lag max']:>9.2f}ms"
+    )
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickets", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["DB_CONNECTION_URL"] = database_url
+        os.environ["IPC_SOCKET_PATH"] = os.path.join(tmp, "ipc.sock")
+        os.environ["LOG_LEVEL"] = "WARNING"
+        
+        import uvicorn
+        
+        from api.ipc import IPCServer
+        from api.server import TicketsAPI
+        from api.state import LocalBotState
+        from api.workers import APIWorkerPool
+        from benchmarks.ticket_listing import seed
+        from config.env import get_settings
+        from database.models import init_db
+        from utils.logger import setup_logger
+        
+        setup_logger(level="WARNING")
+        engine, session_factory = await init_db(database_url)
+        print(f"🌱 Seeding {args.tickets:,} tickets...")
+        await seed(session_factory, args.tickets)
+        bot = FakeBot(session_factory)
+        
+        print(f"{'mode':<14} {'requests/s':>10} {'failed':>7} {'lag p50':>11} {'lag p99':>11} {'lag max':>11}")
+        
+        # Idle loop, for reference
+        stop = asyncio.Event()
+        probe = asyncio.create_task(probe_lag(stop))
+        await asyncio.sleep(min(args.duration, 3.0))
+        stop.set()
+        samples = sorted(await probe)
+        print_result("idle", {
+            "requests/s": 0.0, "failed": 0, "lag p50": statistics.median(samples),
+            "lag p99": samples[int(len(samples) * 0.99)], "lag max": samples[-1],
+        })
+        
+        # API on the bot's event loop
+        port = free_port()
+        server = uvicorn.Server(uvicorn.Config(
+            TicketsAPI(bot).app, host="127.0.0.1", port=port, log_level="warning", access_log=False
+        ))
+        server_task = asyncio.create_task(server.serve())
+        await wait_for_server(f"http://127.0.0.1:{port}")
+        print_result("in-process", await measure(f"http://127.0.0.1:{port}", args.duration, args.concurrency))
+        server.should_exit = True
+        await server_task
+        
+        # API in worker processes, bot state over IPC
+        port = free_port()
+        os.environ["HTTP_HOST"] = "127.0.0.1"
+        os.environ["HTTP_PORT"] = str(port)
+        os.environ["API_WORKERS"] = str(args.workers)
+        settings = get_settings()
+        settings.http_host, settings.http_port, settings.api_workers = "127.0.0.1", port, args.workers
+        
+        ipc_server = IPCServer(LocalBotState(bot), settings.ipc_socket_path)
+        await ipc_server.start()
+        pool = APIWorkerPool(settings)
+        await pool.start()
+        try:
+            await wait_for_server(f"http://127.0.0.1:{port}")
+            result = await measure(f"http://127.0.0.1:{port}", args.duration, args.concurrency)
+            print_result(f"{args.workers} workers", result)
+            print(
+                f"\nIPC: {ipc_server.calls:,} calls in {ipc_server.batches:,} batches "
+                f"({ipc_server.calls / max(ipc_server.batches, 1):.2f} calls/batch)"
+            )
+        finally:
+            await pool.stop()
+            await ipc_server.close()
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Benchmark dashboard session verification with and without the principal cache."""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+
+os.environ.setdefault("DISCORD_TOKEN", "MTIzNDU2Nzg5MDEyMzQ1Njc4.benchmark.token")
+os.environ.setdefault("DISCORD_SECRET", "benchmark")
+os.environ.setdefault("ENCRYPTION_KEY", "b" * 48)
+os.environ.setdefault("HTTP_EXTERNAL", "http://localhost")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from api.auth import AuthManager
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    
+    auth = AuthManager()
+    tokens = [
+        auth.issue_token(
+            {"id": str(10 ** 17 + i), "username": f"user{i}"},
+            {"access_token": f"access-{i}", "refresh_token": f"refresh-{i}", "expires_in": 604800, "scope": "identify guilds"}
+        )
+        for i in range(args.sessions)
+    ]
+    
+    print(f"{'mode':<12} {'requests/s':>12} {'per request':>14}")
+    start = time.perf_counter()
+    for i in range(args.requests):
+        auth.verify(tokens[i % len(tokens)])
+    elapsed = time.perf_counter() - start
+    print(f"{'uncached':<12} {args.requests / elapsed:>12,.0f} {elapsed / args.requests * 1e6:>11.1f}µs")
+    
+    start = time.perf_counter()
+    for i in range(args.requests):
+        await auth.get_principal(tokens[i % len(tokens)])
+    elapsed = time.perf_counter() - start
+    print(f"{'cached':<12} {args.requests / elapsed:>12,.0f} {elapsed / args.requests * 1e6:>11.1f}µs")
+    
+    print(f"\nVerifications: {auth.verifications:,}, cache hits: {auth.cache.hits:,}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
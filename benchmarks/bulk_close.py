@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Compare closing a guild's stale tickets one at a time and in bulk.
+
+Seeds one guild with ``--tickets`` stale tickets and ``--guilds`` other
+guilds with one ticket each. ``loop`` calls ``TicketManager.close_ticket``
+for every stale ticket, with close jobs limited only by ``--workers``;
+``bulk`` makes one ``bulk_close`` call, with at most ``--per-guild`` jobs
+per guild. While the stale tickets are being deleted, each other guild
+closes its ticket, and the time until its channel is gone is recorded.
+Reports time and statements to close the tickets in the database, time
+until every channel is deleted, the most deletes in flight in the bulk
+guild, and how long the other guilds waited.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+
+from sqlalchemy import insert
+
+from benchmarks.fakes import FakeBot, FakeGuild, FakeREST, FakeTextChannel
+from bot.tickets.close_jobs import CloseJobWorker
+from database.instrumentation import get_query_instrumentation
+from database.models import Category, Guild, Ticket, User, init_db
+from utils.logger import setup_logger
+
+
+class TrackedChannel(FakeTextChannel):
+    """A ticket channel that counts its guild's deletes in flight."""
+    
+    in_flight: Dict[int, int] = {}
+    peak: Dict[int, int] = {}
+    
+    async def delete(self, reason: Optional[str] = None) -> None:
+        guild_id = self.guild.id
+        self.in_flight[guild_id] = self.in_flight.get(guild_id, 0) + 1
+        self.peak[guild_id] = max(self.peak.get(guild_id, 0), self.in_flight[guild_id])
+        try:
+            await super().delete(reason)
+        finally:
+            self.in_flight[guild_id] -= 1
+
+
+async def seed(bot: FakeBot, tickets: int, guilds: int) -> Dict[str, Any]:
+    """Create the stale guild's tickets and one ticket in each other guild."""
+    stale_since = datetime.utcnow() - timedelta(days=30)
+    seeded: Dict[str, Any] = {"others": []}
+    async with bot.db_session_factory() as session:
+        for g in range(guilds + 1):
+            guild = bot.add_guild(f"Guild {g}")
+            staff = guild.add_member(f"staff-{g}")
+            member = guild.add_member(f"member-{g}")
+            category = Category(
+                guild_id=str(guild.id), name="Support", description="Support tickets",
+                channel_name="ticket-{number}", discord_category="0", emoji="🎫",
+                opening_message="Staff will be with you shortly.", staff_roles="[]",
+            )
+            session.add_all([Guild(id=str(guild.id)), User(id=str(staff.id)), User(id=str(member.id)), category])
+            await session.flush()
+            
+            channels = [TrackedChannel(guild, f"ticket-{n}") for n in range(tickets if g == 0 else 1)]
+            for channel in channels:
+                guild.channels[channel.id] = channel
+            await session.execute(insert(Ticket), [
+                {
+                    "id": str(channel.id),
+                    "category_id": category.id,
+                    "created_by_id": str(member.id),
+                    "guild_id": str(guild.id),
+                    "number": number,
+                    "open": True,
+                    "created_at": stale_since,
+                    "last_message_at": stale_since if g == 0 else datetime.utcnow(),
+                }
+                for number, channel in enumerate(channels, 1)
+            ])
+            if g == 0:
+                seeded.update(guild=guild, staff=staff, channels=channels)
+            else:
+                seeded["others"].append((guild, staff, channels[0]))
+        await session.commit()
+    return seeded
+
+
+async def wait_deleted(channels: List[FakeTextChannel], timeout: float = 600.0) -> None:
+    """Wait until every channel has been deleted."""
+    deadline = time.perf_counter() + timeout
+    while not all(channel.deleted for channel in channels) and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+
+
+async def close_other(bot: FakeBot, guild: FakeGuild, staff: Any, channel: FakeTextChannel) -> float:
+    """Close a ticket in another guild and time until its channel is deleted."""
+    start = time.perf_counter()
+    await bot.ticket_manager.close_ticket(channel, staff, "Resolved")
+    await wait_deleted([channel])
+    return time.perf_counter() - start
+
+
+async def run(mode: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Close the stale guild's tickets with one approach."""
+    TrackedChannel.in_flight, TrackedChannel.peak = {}, {}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, session_factory = await init_db(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        bot = FakeBot(session_factory, FakeREST(options["latency"] / 1000))
+        seeded = await seed(bot, options["tickets"], options["guilds"])
+        guild, staff = seeded["guild"], seeded["staff"]
+        
+        per_guild = options["per_guild"] if mode == "bulk" else options["workers"]
+        bot.close_jobs = CloseJobWorker(bot, options["workers"], poll_interval=1.0, guild_concurrency=per_guild)
+        bot.close_jobs.start()
+        
+        start = time.perf_counter()
+        with get_query_instrumentation().operation("benchmark") as trace:
+            if mode == "bulk":
+                await bot.ticket_manager.bulk_close(str(guild.id), str(staff.id), "Stale", timedelta(days=7))
+            else:
+                for channel in seeded["channels"]:
+                    await bot.ticket_manager.close_ticket(channel, staff, "Stale")
+        closed = time.perf_counter() - start
+        
+        waits = await asyncio.gather(*(close_other(bot, *other) for other in seeded["others"]))
+        await wait_deleted(seeded["channels"])
+        drained = time.perf_counter() - start
+        
+        await bot.close_jobs.stop()
+        await engine.dispose()
+    
+    waits.sort()
+    return {
+        "mode": mode,
+        "closed_s": closed,
+        "queries": trace.queries,
+        "drained_s": drained,
+        "peak_deletes": TrackedChannel.peak.get(guild.id, 0),
+        "other_p99_s": waits[int(len(waits) * 0.99)] if waits else 0.0,
+    }
+
+
+async def main() -> None:
+    """Run both approaches and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=500, help="stale tickets in the bulk guild")
+    parser.add_argument("--guilds", type=int, default=20, help="other guilds closing a ticket meanwhile")
+    parser.add_argument("--latency", type=float, default=20.0, help="simulated Discord REST latency in ms")
+    parser.add_argument("--workers", type=int, default=4, help="close jobs run at once")
+    parser.add_argument("--per-guild", type=int, default=2, help="close jobs run at once per guild, in bulk mode")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+    
+    setup_logger(level="WARNING")
+    instrumentation = get_query_instrumentation()
+    instrumentation.enabled = True
+    instrumentation.slow_query_ms = float("inf")
+    instrumentation.n_plus_one_threshold = 10 ** 9
+    
+    options = vars(args)
+    print(f"{args.tickets} stale tickets, {args.guilds} other guilds, {args.latency:.0f}ms REST latency\n")
+    print(f"{'mode':<6} {'closed s':>9} {'queries':>8} {'drained s':>10} {'peak deletes':>13} {'others p99 s':>13}")
+    results = []
+    for mode in ("loop", "bulk"):
+        result = await run(mode, options)
+        results.append(result)
+        print(
+            f"{mode:<6} {result['closed_s']:>9.2f} {result['queries']:>8} {result['drained_s']:>10.2f} "
+            f"{result['peak_deletes']:>13} {result['other_p99_s']:>13.2f}"
+        )
+    
+    if args.json:
+        Path(args.json).write_text(json.dumps({"config": options, "results": results}, indent=2))
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Measure interaction throughput as the number of shard clusters grows.
+
+Seeds one SQLite database (in WAL mode, shared by every process), then for
+each ``--clusters`` count starts that many processes. Each owns the guilds
+its shards would receive, per ``bot.cluster.ShardMap``, and replays the
+load generator's interaction mix through the real cogs with
+``--concurrency`` interactions in flight for ``--seconds``. REST latency
+defaults to zero so handler CPU and the database are what's measured.
+
+Scaling flattens at the machine's core count, or earlier when the shared
+database's single writer becomes the bottleneck.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+
+from sqlalchemy import text
+
+from benchmarks.load_generator import DEFAULT_MIX, parse_mix, seed
+from bot.cluster import ShardMap
+from database.models import init_db
+from utils.logger import setup_logger
+
+
+async def replay_cluster(
+    cluster_id: int,
+    shard_map: ShardMap,
+    database: str,
+    options: Dict[str, Any],
+    start_at: float
+) -> Dict[str, Any]:
+    """Replay the mix over one cluster's guilds from ``start_at`` for ``seconds``."""
+    from benchmarks.fakes import FakeBot, FakeREST
+    from benchmarks.load_generator import FakeGateway
+    from database.models import connect_db
+    
+    setup_logger(level="CRITICAL")
+    rng = random.Random(options["seed"] + cluster_id)
+    kinds, weights = parse_mix(options["mix"])
+    engine, session_factory = connect_db(f"sqlite+aiosqlite:///{database}")
+    rest = FakeREST(options["latency"] / 1000, options["jitter"] / 1000, options["seed"] + cluster_id)
+    gateway = FakeGateway(FakeBot(session_factory, rest), session_factory, rng)
+    await gateway.load()
+    
+    # Only the guilds on this cluster's shards reach it
+    owned = [
+        (guild_id, weight) for guild_id, weight in zip(gateway.guild_ids, gateway.guild_weights)
+        if shard_map.cluster_for_guild(int(guild_id)) == cluster_id
+    ]
+    gateway.guild_ids = [guild_id for guild_id, _ in owned]
+    gateway.guild_weights = [weight for _, weight in owned]
+    
+    late = time.time() > start_at
+    await asyncio.sleep(max(start_at - time.time(), 0))
+    deadline = time.perf_counter() + options["seconds"]
+    
+    async def worker() -> None:
+        while gateway.guild_ids and time.perf_counter() < deadline:
+            await gateway.handle(rng.choices(kinds, weights)[0])
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(options["concurrency"])))
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    
+    latencies = sorted(gateway.latencies)
+    return {
+        "cluster": cluster_id,
+        "guilds": len(owned),
+        "completed": gateway.completed,
+        "failed": gateway.failed,
+        "elapsed": elapsed,
+        "p99_ms": latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)] * 1000 if latencies else 0.0,
+        "late_start": late,
+    }
+
+
+def run_cluster(*args: Any) -> Dict[str, Any]:
+    """Process entry point for one cluster."""
+    return asyncio.run(replay_cluster(*args))
+
+
+async def prepare(database: str, guilds: int, tickets: int, seed_value: int) -> None:
+    """Seed the shared database and switch it to WAL so clusters can read while one writes."""
+    engine, session_factory = await init_db(f"sqlite+aiosqlite:///{database}")
+    await seed(session_factory, guilds, tickets, random.Random(seed_value))
+    async with engine.connect() as connection:
+        await connection.execute(text("PRAGMA journal_mode=WAL"))
+    await engine.dispose()
+
+
+def main() -> None:
+    """Seed once, then run each cluster count and report the scaling."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clusters", default="1,2,4", help="comma-separated cluster counts to compare")
+    parser.add_argument("--shards", type=int, default=16, help="total shards split between the clusters")
+    parser.add_argument("--guilds", type=int, default=2000)
+    parser.add_argument("--tickets", type=int, default=50000)
+    parser.add_argument("--seconds", type=float, default=10.0, help="replay duration per cluster count")
+    parser.add_argument("--concurrency", type=int, default=8, help="interactions in flight per cluster")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="interaction mix as kind=weight pairs")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated Discord REST latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random REST latency in ms")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+    
+    setup_logger(level="CRITICAL")
+    counts = [int(count) for count in args.clusters.split(",")]
+    options = {key: getattr(args, key) for key in ("seed", "mix", "latency", "jitter", "seconds", "concurrency")}
+    context = multiprocessing.get_context("spawn")
+    
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, "clusters.db")
+        start = time.perf_counter()
+        asyncio.run(prepare(database, args.guilds, args.tickets, args.seed))
+        print(f"Seeded {args.guilds:,} guilds and ~{args.tickets:,} tickets in {time.perf_counter() - start:.1f}s")
+        print(f"{os.cpu_count()} CPU(s), {args.shards} shards, {args.concurrency} in flight per cluster\n")
+        
+        print(f"{'clusters':>8} {'interactions/s':>15} {'per cluster':>12} {'speedup':>8} {'p99 ms':>9} {'failed':>7}")
+        baseline = None
+        for clusters in counts:
+            shard_map = ShardMap(args.shards, clusters)
+            # Give every process time to import and load before the clock starts
+            start_at = time.time() + 5.0 + clusters
+            with context.Pool(clusters) as pool:
+                per_cluster = pool.starmap(
+                    run_cluster,
+                    [(cluster_id, shard_map, database, options, start_at) for cluster_id in range(clusters)]
+                )
+            
+            throughput = sum(result["completed"] / result["elapsed"] for result in per_cluster)
+            baseline = baseline or throughput / clusters
+            result = {
+                "clusters": clusters,
+                "throughput": throughput,
+                "speedup": throughput / baseline,
+                "p99_ms": max(result["p99_ms"] for result in per_cluster),
+                "failed": sum(result["failed"] for result in per_cluster),
+                "per_cluster": per_cluster,
+            }
+            results.append(result)
+            print(
+                f"{clusters:>8} {throughput:>15,.1f} {throughput / clusters:>12,.1f} {result['speedup']:>7.2f}x "
+                f"{result['p99_ms']:>9.1f} {result['failed']:>7}"
+            )
+            if any(cluster["late_start"] for cluster in per_cluster):
+                print("         (some clusters started late; raise the start delay for a fair run)")
+    
+    if args.json:
+        Path(args.json).write_text(json.dumps({"config": vars(args), "cpus": os.cpu_count(), "results": results}, indent=2))
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Compare memory held for ticket buttons as the number of open tickets grows.
+
+Sends the opening message buttons of ``--tickets`` tickets the way the
+Discord library does, storing a view for every message whose items it
+would dispatch. ``per-message`` builds a fresh view with plain buttons for
+each ticket, as opening messages used to; ``routed`` reuses the shared
+view registered with the component router, whose buttons the library
+leaves to the router.
+"""
+
+import argparse
+import asyncio
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+
+import discord
+
+from bot.interactions.components import TICKET_ACTIONS_CLAIMABLE_VIEW, TICKET_CLAIM, TICKET_CLOSE, register_views
+from bot.interactions.router import ComponentRouter
+
+
+def per_message_view() -> discord.ui.View:
+    """Build a ticket's buttons the way opening messages used to."""
+    view = discord.ui.View(timeout=None)
+    view.add_item(discord.ui.Button(style=discord.ButtonStyle.primary, label="Claim", custom_id=TICKET_CLAIM))
+    view.add_item(discord.ui.Button(style=discord.ButtonStyle.danger, label="Close", custom_id=TICKET_CLOSE))
+    return view
+
+
+async def measure(name: str, build: Callable[[], discord.ui.View], tickets: int) -> Dict[str, Any]:
+    """Send ``tickets`` opening messages' views and measure what stays behind."""
+    client = discord.Client(intents=discord.Intents.none())
+    state = client._connection
+    
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for message_id in range(1, tickets + 1):
+        view = build()
+        # What sending a message with a view does
+        if view.is_dispatchable():
+            state.store_view(view, message_id)
+        view.to_components()
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    
+    store = state._view_store
+    return {
+        "name": name,
+        "tickets": tickets,
+        "stored_items": len(store._views),
+        "stored_messages": len(store._synced_message_views),
+        "held_bytes": held,
+    }
+
+
+async def run(tickets: int) -> None:
+    """Measure both approaches."""
+    router = ComponentRouter()
+    register_views(router)
+    
+    print(f"{tickets:,} open tickets\n")
+    print(f"{'views':<12} {'stored items':>13} {'stored msgs':>12} {'held KiB':>9} {'B/ticket':>9}")
+    for name, build in (
+        ("per-message", per_message_view),
+        ("routed", lambda: router.get_view(TICKET_ACTIONS_CLAIMABLE_VIEW)),
+    ):
+        result = await measure(name, build, tickets)
+        print(
+            f"{name:<12} {result['stored_items']:>13,} {result['stored_messages']:>12,} "
+            f"{result['held_bytes'] / 1024:>9.1f} {result['held_bytes'] / tickets:>9.0f}"
+        )
+
+
+def main() -> None:
+    """Parse arguments and run the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=20000)
+    args = parser.parse_args()
+    
+    asyncio.run(run(args.tickets))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
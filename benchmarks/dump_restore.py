@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Compare dumping and restoring the database whole and streamed in chunks.
+
+Seeds a SQLite database with ``--rows`` rows, nearly all of them archived
+messages, as a long-running bot's database is. ``whole`` reads every
+table into memory and writes one JSON document, then restores it with one
+insert per table, like the old scripts/dump.mjs and scripts/restore.mjs;
+``stream`` runs ``dump_database`` and ``restore_database`` with
+``--chunk-size`` rows at a time. Each mode runs in its own process so its
+peak memory can be measured. Reports time and rows per second for each
+direction, the dump's size, and the process's peak memory.
+"""
+
+import argparse
+import asyncio
+import gzip
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+
+from sqlalchemy import DateTime, func, insert, select
+
+from database.dump import dump_database, restore_database
+from database.models import ArchivedMessage, ArchivedUser, Base, Category, Guild, Ticket, User, init_db
+from utils.serialization import dumps_bytes, loads
+
+MESSAGES_PER_TICKET = 100
+
+
+async def seed(path: Path, rows: int) -> None:
+    """Create tickets with archived messages and users adding up to about ``rows`` rows."""
+    engine, session_factory = await init_db(f"sqlite+aiosqlite:///{path}")
+    tickets = max(1, rows // (MESSAGES_PER_TICKET + 2))
+    now = datetime.utcnow()
+    async with session_factory() as session:
+        session.add_all([Guild(id="1"), User(id="1")])
+        category = Category(
+            guild_id="1", name="Support", description="Support tickets", channel_name="ticket-{number}",
+            discord_category="0", emoji="🎫", opening_message="Hi", staff_roles="[]",
+        )
+        session.add(category)
+        await session.flush()
+        
+        for first in range(0, tickets, 1000):
+            numbers = range(first, min(first + 1000, tickets))
+            await session.execute(insert(Ticket), [
+                {
+                    "id": str(t),
+                    "category_id": category.id,
+                    "created_by_id": "1",
+                    "guild_id": "1",
+                    "number": t,
+                    "open": False,
+                    "closed_at": now - timedelta(minutes=t),
+                }
+                for t in numbers
+            ])
+            await session.execute(insert(ArchivedUser), [
+                {"ticket_id": str(t), "user_id": "1", "username": "user"} for t in numbers
+            ])
+            await session.execute(insert(ArchivedMessage), [
+                {
+                    "id": f"{t:08d}{m:04d}",
+                    "author_id": "1",
+                    "content": f"Message {m} of ticket {t}: " + "lorem ipsum " * 8,
+                    "created_at": now - timedelta(minutes=t, seconds=m),
+                    "ticket_id": str(t),
+                }
+                for t in numbers
+                for m in range(MESSAGES_PER_TICKET)
+            ])
+        await session.commit()
+    await engine.dispose()
+
+
+async def dump_whole(engine, path: Path) -> None:
+    """Read every table into memory and write it as one document."""
+    document: Dict[str, Any] = {}
+    async with engine.connect() as connection:
+        for table in Base.metadata.sorted_tables:
+            rows = (await connection.execute(select(table))).mappings().all()
+            document[table.name] = [dict(row) for row in rows]
+    with gzip.open(path, "wb") as file:
+        file.write(dumps_bytes(document))
+
+
+async def restore_whole(engine, path: Path) -> None:
+    """Load a whole document, then insert each table's rows at once."""
+    with gzip.open(path, "rb") as file:
+        document = loads(file.read())
+    async with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            await connection.execute(table.delete())
+        for table in Base.metadata.sorted_tables:
+            rows = document.get(table.name)
+            if not rows:
+                continue
+            for column in table.columns:
+                if isinstance(column.type, DateTime):
+                    for row in rows:
+                        if row.get(column.name) is not None:
+                            row[column.name] = datetime.fromisoformat(row[column.name])
+            await connection.execute(table.insert(), rows)
+
+
+async def run(mode: str, source: Path, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Dump the source database and restore it into a new one with one approach."""
+    dump = source.parent / f"{mode}.jsonl.gz"
+    target = source.parent / f"{mode}.db"
+    
+    source_engine, _ = await init_db(f"sqlite+aiosqlite:///{source}")
+    start = time.perf_counter()
+    if mode == "stream":
+        await dump_database(source_engine, dump, options["chunk_size"])
+    else:
+        await dump_whole(source_engine, dump)
+    dumped = time.perf_counter() - start
+    await source_engine.dispose()
+    
+    target_engine, _ = await init_db(f"sqlite+aiosqlite:///{target}")
+    start = time.perf_counter()
+    if mode == "stream":
+        counts = await restore_database(target_engine, dump)
+    else:
+        await restore_whole(target_engine, dump)
+        counts = {}
+    restored = time.perf_counter() - start
+    async with target_engine.connect() as connection:
+        rows = 0
+        for table in Base.metadata.sorted_tables:
+            rows += (await connection.execute(select(func.count()).select_from(table))).scalar()
+    await target_engine.dispose()
+    
+    return {
+        "mode": mode,
+        "rows": rows,
+        "checked": not counts or sum(counts.values()) == rows,
+        "dump_s": dumped,
+        "restore_s": restored,
+        "dump_rows_s": rows / dumped,
+        "restore_rows_s": rows / restored,
+        "file_mib": dump.stat().st_size / 2 ** 20,
+        # ru_maxrss is in KiB on Linux
+        "peak_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def child(mode: str, source: str, options: Dict[str, Any], results) -> None:
+    """Run one mode in a fresh process, so peak memory is its own."""
+    results.put(asyncio.run(run(mode, Path(source), options)))
+
+
+def main() -> None:
+    """Run both approaches and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows to seed, nearly all archived messages")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="rows per chunk when streaming")
+    args = parser.parse_args()
+    
+    options = vars(args)
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "source.db"
+        start = time.perf_counter()
+        asyncio.run(seed(source, args.rows))
+        print(f"Seeded {source.stat().st_size / 2 ** 20:.0f} MiB in {time.perf_counter() - start:.0f}s\n")
+        
+        print(
+            f"{'mode':<7} {'rows':>10} {'dump s':>7} {'rows/s':>9} {'restore s':>10} {'rows/s':>9} "
+            f"{'file MiB':>9} {'peak MiB':>9}"
+        )
+        for mode in ("whole", "stream"):
+            results = context.Queue()
+            process = context.Process(target=child, args=(mode, str(source), options, results))
+            process.start()
+            result = results.get()
+            process.join()
+            for leftover in (Path(tmp) / f"{mode}.db", Path(tmp) / f"{mode}.jsonl.gz"):
+                leftover.unlink(missing_ok=True)
+            print(
+                f"{mode:<7} {result['rows']:>10,} {result['dump_s']:>7.1f} {result['dump_rows_s']:>9,.0f} "
+                f"{result['restore_s']:>10.1f} {result['restore_rows_s']:>9,.0f} "
+                f"{result['file_mib']:>9.1f} {result['peak_mib']:>9.0f}"
+                + ("" if result["checked"] else "  (row counts differ!)")
+            )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
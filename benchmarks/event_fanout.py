@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark ticket event fan-out to many idle dashboard subscribers."""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from bot.tickets.events import DISCONNECT, DROP_OLDEST, TICKET_MESSAGE, TicketEvent, TicketEventBus
+
+
+async def consume(subscription, received: list) -> None:
+    """Receive events until the subscription closes, recording delivery latency."""
+    while not subscription.closed:
+        event = await subscription.get(timeout=60)
+        if event is not None:
+            # Touch the encoded frame as the SSE endpoint would
+            event.sse
+            received.append(time.perf_counter() - event.data["sent"])
+
+
+async def run_fanout(subscribers: int, guilds: int, events: int) -> None:
+    """Measure memory per idle subscriber and publish-to-delivery latency."""
+    bus = TicketEventBus()
+    
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    subscriptions = [bus.subscribe(str(i % guilds)) for i in range(subscribers)]
+    received: list = []
+    tasks = [asyncio.create_task(consume(subscription, received)) for subscription in subscriptions]
+    await asyncio.sleep(0)
+    idle = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    
+    print(f"{subscribers:,} idle subscribers across {guilds} guilds")
+    print(f"  memory: {idle / 1024 / 1024:.1f} MiB, {idle / subscribers:,.0f} bytes per subscriber (incl. task)")
+    
+    publish_times = []
+    for i in range(events):
+        event = TicketEvent(TICKET_MESSAGE, str(i % guilds), "1", {"content": "hello", "sent": time.perf_counter()})
+        start = time.perf_counter()
+        bus.publish(event)
+        publish_times.append(time.perf_counter() - start)
+        # Let the subscribers drain before the next event
+        await asyncio.sleep(0)
+    
+    await asyncio.sleep(0.1)
+    latencies = sorted(received)
+    print(f"  publish: {statistics.median(publish_times) * 1e6:,.0f}µs median for ~{subscribers // guilds:,} subscribers")
+    print(f"  delivery: {len(latencies):,} events, p50 {latencies[len(latencies) // 2] * 1000:.2f}ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f}ms")
+    
+    for subscription in subscriptions:
+        subscription.close()
+    await asyncio.gather(*tasks)
+
+
+async def run_slow_consumer(events: int, maxsize: int) -> None:
+    """Show that a stalled subscriber never blocks the publisher or other subscribers."""
+    for policy in (DROP_OLDEST, DISCONNECT):
+        bus = TicketEventBus()
+        fast = bus.subscribe("1", maxsize=maxsize, policy=policy)
+        slow = bus.subscribe("1", maxsize=maxsize, policy=policy)
+        delivered = 0
+        
+        start = time.perf_counter()
+        for i in range(events):
+            bus.publish(TicketEvent(TICKET_MESSAGE, "1", "1", {"n": i}))
+            # Only the fast subscriber keeps up
+            while len(fast):
+                await fast.get()
+                delivered += 1
+        elapsed = time.perf_counter() - start
+        
+        print(f"policy={policy}: published {events:,} in {elapsed * 1000:.1f}ms, fast got {delivered:,}, "
+              f"slow queued {len(slow)} dropped {slow.dropped:,} closed={slow.closed}; bus {bus.get_stats()}")
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=10000)
+    parser.add_argument("--guilds", type=int, default=10)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--queue-size", type=int, default=100)
+    args = parser.parse_args()
+    
+    await run_fanout(args.subscribers, args.guilds, args.events)
+    print()
+    await run_slow_consumer(args.events * 10, args.queue_size)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,369 @@
+"""Stand-ins for Discord objects so ticket flows can run without a gateway.
+
+Every REST-backed method awaits ``FakeREST.call``, which sleeps for the
+configured latency and counts the call per route. The fakes implement only
+what ``TicketManager`` and the command cogs touch.
+"""
+
+import asyncio
+import itertools
+import random
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import discord
+
+from utils.embed import EmbedTemplateCache
+from utils.logger import get_bot_logger
+
+# Counts the timestamp bits, so consecutive IDs spread over shards like real ones
+_snowflakes = itertools.count(10 ** 17 >> 22)
+
+
+def snowflake() -> int:
+    """Get a unique fake Discord ID."""
+    return next(_snowflakes) << 22
+
+
+def skip_snowflakes(past: int) -> None:
+    """Make later fake IDs larger than ``past``, e.g. IDs already in a database."""
+    global _snowflakes
+    _snowflakes = itertools.count(max((past >> 22) + 1, next(_snowflakes)))
+
+
+class FakeREST:
+    """Simulated Discord REST API latency."""
+    
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self.calls: Counter = Counter()
+    
+    async def call(self, route: str) -> None:
+        """Record a call and wait as long as Discord would take to answer."""
+        self.calls[route] += 1
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        # Even a zero-latency call yields, like a real HTTP round trip
+        await asyncio.sleep(delay)
+
+
+class FakeAsset:
+    """An avatar or icon."""
+    
+    def __init__(self, url: str):
+        self.url = url
+        self.key = url.rsplit("/", 1)[-1]
+
+
+class FakeRole:
+    """A guild role."""
+    
+    def __init__(self, guild: "FakeGuild", name: str, role_id: Optional[int] = None):
+        self.id = role_id or snowflake()
+        self.name = name
+        self.guild = guild
+        self.mention = f"<@&{self.id}>"
+    
+    def __hash__(self) -> int:
+        return hash(self.id)
+    
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, FakeRole) and other.id == self.id
+
+
+class FakeMember:
+    """A guild member."""
+    
+    def __init__(
+        self,
+        guild: "FakeGuild",
+        name: str,
+        roles: Optional[List[FakeRole]] = None,
+        administrator: bool = False,
+        member_id: Optional[int] = None
+    ):
+        self.id = member_id or snowflake()
+        self.name = name
+        self.display_name = name
+        self.guild = guild
+        self.bot = False
+        self.roles = [guild.default_role] + list(roles or [])
+        self.guild_permissions = SimpleNamespace(administrator=administrator)
+        self.display_avatar = FakeAsset(f"https://cdn.discordapp.com/embed/avatars/{(self.id >> 22) % 6}.png")
+        self.mention = f"<@{self.id}>"
+    
+    def __str__(self) -> str:
+        return self.name
+    
+    @property
+    def top_role(self) -> FakeRole:
+        return self.roles[-1]
+    
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> None:
+        """Send a direct message."""
+        await self.guild.rest.call("POST /channels/{id}/messages")
+    
+    def __hash__(self) -> int:
+        return hash(self.id)
+    
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, FakeMember) and other.id == self.id
+
+
+class FakeMessage:
+    """A sent message."""
+    
+    def __init__(self, channel: "FakeTextChannel", content: Optional[str] = None, **kwargs: Any):
+        self.id = snowflake()
+        self.channel = channel
+        self.guild = channel.guild
+        self.author = kwargs.get("author") or channel.guild.me
+        self.content = content or ""
+        self.created_at = datetime.now(timezone.utc)
+        self.edited_at = None
+        self.embed = kwargs.get("embed")
+        self.view = kwargs.get("view")
+
+
+class FakeTextChannel:
+    """A guild text channel."""
+    
+    def __init__(
+        self,
+        guild: "FakeGuild",
+        name: str,
+        category: Optional["FakeCategoryChannel"] = None,
+        channel_id: Optional[int] = None
+    ):
+        self.id = channel_id or snowflake()
+        self.name = name
+        self.guild = guild
+        self.category = category
+        self.mention = f"<#{self.id}>"
+        self.overwrites: Dict[Any, Any] = {}
+        self.messages: List[FakeMessage] = []
+        self.deleted = False
+    
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> FakeMessage:
+        """Send a message."""
+        await self.guild.rest.call("POST /channels/{id}/messages")
+        message = FakeMessage(self, content, **kwargs)
+        self.messages.append(message)
+        return message
+    
+    async def history(self, limit: int = 100, after: Any = None, oldest_first: bool = True):
+        """Iterate over the channel's messages, a page per request."""
+        await self.guild.rest.call("GET /channels/{id}/messages")
+        messages = [message for message in self.messages if after is None or message.id > after.id]
+        for message in (messages if oldest_first else messages[::-1])[:limit]:
+            yield message
+    
+    async def set_permissions(self, target: Any, **permissions: Any) -> None:
+        """Edit a permission overwrite."""
+        await self.guild.rest.call("PUT /channels/{id}/permissions/{id}")
+        self.overwrites[target] = permissions
+    
+    async def edit(self, **kwargs: Any) -> None:
+        """Edit the channel."""
+        await self.guild.rest.call("PATCH /channels/{id}")
+        self.name = kwargs.get("name", self.name)
+    
+    async def delete(self, reason: Optional[str] = None) -> None:
+        """Delete the channel."""
+        await self.guild.rest.call("DELETE /channels/{id}")
+        self.deleted = True
+        self.guild.channels.pop(self.id, None)
+
+
+class FakeCategoryChannel:
+    """A channel category that ticket channels are created in."""
+    
+    def __init__(self, guild: "FakeGuild", name: str, category_id: Optional[int] = None):
+        self.id = category_id or snowflake()
+        self.name = name
+        self.guild = guild
+    
+    async def create_text_channel(self, name: str, overwrites: Optional[Dict[Any, Any]] = None, **kwargs: Any) -> FakeTextChannel:
+        """Create a text channel in this category."""
+        await self.guild.rest.call("POST /guilds/{id}/channels")
+        channel = FakeTextChannel(self.guild, name, self)
+        channel.overwrites = dict(overwrites or {})
+        self.guild.channels[channel.id] = channel
+        return channel
+
+
+class FakeGuild:
+    """A guild with roles, members, categories and channels."""
+    
+    def __init__(self, rest: FakeREST, name: str = "Guild", guild_id: Optional[int] = None):
+        self.id = guild_id or snowflake()
+        self.name = name
+        self.rest = rest
+        self.icon = None
+        self.default_role = FakeRole(self, "@everyone", self.id)
+        self.roles: Dict[int, FakeRole] = {self.id: self.default_role}
+        self.members: Dict[int, FakeMember] = {}
+        self.categories: List[FakeCategoryChannel] = []
+        self.channels: Dict[int, FakeTextChannel] = {}
+        self.me = FakeMember(self, "Tickets")
+        self.me.bot = True
+    
+    @property
+    def member_count(self) -> int:
+        return len(self.members)
+    
+    def add_role(self, name: str, role_id: Optional[int] = None) -> FakeRole:
+        """Create a role."""
+        role = FakeRole(self, name, role_id)
+        self.roles[role.id] = role
+        return role
+    
+    def add_member(
+        self,
+        name: str,
+        roles: Optional[List[FakeRole]] = None,
+        administrator: bool = False,
+        member_id: Optional[int] = None
+    ) -> FakeMember:
+        """Create a member."""
+        member = FakeMember(self, name, roles, administrator, member_id)
+        self.members[member.id] = member
+        return member
+    
+    def add_category(self, name: str, category_id: Optional[int] = None) -> FakeCategoryChannel:
+        """Create a channel category."""
+        category = FakeCategoryChannel(self, name, category_id)
+        self.categories.append(category)
+        return category
+    
+    def get_role(self, role_id: int) -> Optional[FakeRole]:
+        return self.roles.get(role_id)
+    
+    def get_member(self, member_id: int) -> Optional[FakeMember]:
+        return self.members.get(member_id)
+    
+    def get_channel(self, channel_id: int) -> Optional[FakeTextChannel]:
+        return self.channels.get(channel_id)
+
+
+class FakeInteractionResponse:
+    """``Interaction.response``: the single initial reply."""
+    
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+        self._done = False
+    
+    def is_done(self) -> bool:
+        return self._done
+    
+    async def _respond(self, route: str) -> None:
+        if self._done:
+            raise RuntimeError("This interaction has already been responded to before")
+        self._done = True
+        await self.interaction.guild.rest.call(route)
+        self.interaction.acknowledged_at = time.perf_counter()
+    
+    async def defer(self, ephemeral: bool = False, thinking: bool = False) -> None:
+        """Acknowledge the interaction without a message."""
+        await self._respond("POST /interactions/{id}/{token}/callback")
+    
+    async def send_message(self, content: Optional[str] = None, **kwargs: Any) -> None:
+        """Reply to the interaction."""
+        await self._respond("POST /interactions/{id}/{token}/callback")
+        self.interaction.sent.append((content, kwargs))
+
+
+class FakeFollowup:
+    """``Interaction.followup``: messages sent after the initial reply."""
+    
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+    
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> None:
+        """Send a followup message."""
+        await self.interaction.guild.rest.call("POST /webhooks/{id}/{token}")
+        self.interaction.sent.append((content, kwargs))
+
+
+class FakeInteraction:
+    """A slash command or component interaction."""
+    
+    def __init__(
+        self,
+        client: "FakeBot",
+        guild: FakeGuild,
+        user: FakeMember,
+        channel: Optional[FakeTextChannel] = None,
+        custom_id: Optional[str] = None
+    ):
+        self.id = snowflake()
+        self.type = discord.InteractionType.component if custom_id else discord.InteractionType.application_command
+        self.client = client
+        self.guild = guild
+        self.guild_id = guild.id
+        self.user = user
+        self.channel = channel
+        self.channel_id = channel.id if channel else None
+        self.data = {"custom_id": custom_id} if custom_id else {}
+        self.response = FakeInteractionResponse(self)
+        self.followup = FakeFollowup(self)
+        self.sent: List[Any] = []
+        self.created_at = time.perf_counter()
+        self.acknowledged_at: Optional[float] = None
+
+
+class FakeBot:
+    """The parts of ``TicketsBot`` that the ticket manager and cogs use."""
+    
+    def __init__(self, session_factory, rest: Optional[FakeREST] = None):
+        from bot.interactions.components import register_views
+        from bot.interactions.router import ComponentRouter
+        from bot.members import MemberRoleCache
+        from bot.tickets.close_jobs import CloseJobWorker
+        from bot.tickets.log_channel import LogDispatcher
+        from bot.tickets.manager import TicketManager
+        from database.routing import SessionRouter
+        
+        self.log = get_bot_logger()
+        self.rest = rest or FakeREST()
+        self.db_session_factory = session_factory
+        self.db_router = SessionRouter(session_factory)
+        self.guilds: List[FakeGuild] = []
+        self._guilds_by_id: Dict[int, FakeGuild] = {}
+        self.members = MemberRoleCache(self)
+        self.components = ComponentRouter()
+        register_views(self.components)
+        self.ticket_manager = TicketManager(self)
+        # Not started: benchmarks that close tickets or log start them
+        self.close_jobs = CloseJobWorker(self, poll_interval=1.0)
+        self.log_dispatcher = LogDispatcher(self, interval=1.0)
+        self.embeds = EmbedTemplateCache(loader=self.ticket_manager.get_guild_settings)
+    
+    def add_guild(self, name: str = "Guild", guild_id: Optional[int] = None) -> FakeGuild:
+        """Create a guild sharing the bot's REST latency."""
+        guild = FakeGuild(self.rest, name, guild_id)
+        self.guilds.append(guild)
+        self._guilds_by_id[guild.id] = guild
+        return guild
+    
+    def get_guild(self, guild_id: int) -> Optional[FakeGuild]:
+        return self._guilds_by_id.get(guild_id)
+    
+    def is_ready(self) -> bool:
+        return True
+    
+    async def wait_until_ready(self) -> None:
+        pass
+    
+    async def fetch_user(self, user_id: int) -> FakeMember:
+        """Fetch a user; any guild's member will do for sending DMs."""
+        await self.rest.call("GET /users/{id}")
+        for guild in self.guilds:
+            member = guild.get_member(user_id)
+            if member is not None:
+                return member
+        raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown User")
\ No newline at end of file
@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+"""Replay interaction traffic at guild scale through the real cog handlers.
+
+Seeds a SQLite database with a skewed population of guilds, categories,
+tickets and archived transcripts, then dispatches a scripted mix of
+interactions through ``NewCommand``, ``CloseCommand`` and the component
+router the way the gateway would: one task per
+interaction, arriving as a Poisson process. The offered rate steps up
+through ``--rates``; each stage reports achieved throughput, latency,
+acknowledgement deadline misses, queue depth, loop lag and memory, and the
+first stage that falls behind is reported as the saturation point.
+
+Seeding 10k guilds and 500k tickets takes a while; pass ``--database`` to
+keep the file and ``--reuse`` to skip seeding on later runs.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+
+from sqlalchemy import func, insert, select
+
+from benchmarks.fakes import FakeBot, FakeGuild, FakeInteraction, FakeREST, FakeTextChannel, skip_snowflakes, snowflake
+from bot.interactions.components import TICKET_CLAIM, TICKET_CLOSE, TICKET_CREATE
+from bot.interactions.router import make_custom_id
+from bot.tickets.events import TICKET_CREATED, TicketEvent, get_event_bus
+from database.models import ArchivedMessage, ArchivedUser, Category, Guild, Ticket, User, init_db
+from utils.logger import setup_logger
+
+# Discord fails an interaction that isn't acknowledged within 3 seconds
+ACK_DEADLINE = 3.0
+INSERT_CHUNK_SIZE = 5000
+DEFAULT_MIX = "new=45,claim=25,close=20,close_button=10"
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Get a percentile of sorted values."""
+    if not values:
+        return 0.0
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def rss_bytes() -> int:
+    """Get the resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # Peak rather than current RSS, in KiB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+async def insert_rows(session, model, rows: List[Dict[str, Any]]) -> None:
+    """Bulk insert rows in chunks."""
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        await session.execute(insert(model), rows[start:start + INSERT_CHUNK_SIZE])
+
+
+async def seed(session_factory, guilds: int, tickets: int, rng: random.Random) -> None:
+    """Seed a population where a few large guilds hold most tickets.
+    
+    Ticket counts per guild follow a Pareto distribution. Guilds have 1-5
+    categories, about 3% of tickets are open (half of those claimed), and
+    a fifth of closed tickets have an archived transcript.
+    """
+    now = datetime.utcnow()
+    weights = [rng.paretovariate(1.2) for _ in range(guilds)]
+    scale = tickets / sum(weights)
+    
+    async with session_factory() as session:
+        guild_rows, category_rows, user_ids = [], [], set()
+        guild_categories: Dict[str, List[int]] = {}
+        category_id = 0
+        for g in range(guilds):
+            guild_id = str(snowflake())
+            guild_rows.append({"id": guild_id})
+            guild_categories[guild_id] = []
+            for c in range(min(1 + int(rng.expovariate(1.0)), 5)):
+                category_id += 1
+                guild_categories[guild_id].append(category_id)
+                category_rows.append({
+                    "id": category_id, "guild_id": guild_id, "name": f"Category {c}",
+                    "description": "Support", "channel_name": "ticket-{number}",
+                    "discord_category": str(snowflake()), "emoji": "🎫",
+                    "opening_message": "Staff will be with you shortly.",
+                    "staff_roles": json.dumps([str(snowflake())]), "claiming": rng.random() < 0.7,
+                })
+        await insert_rows(session, Guild, guild_rows)
+        await insert_rows(session, Category, category_rows)
+        
+        ticket_rows, message_rows, archived_user_rows = [], [], []
+        for (guild_id, categories), weight in zip(guild_categories.items(), weights):
+            count = max(int(weight * scale), 1)
+            members = [str(snowflake()) for _ in range(max(count // 4, 1))]
+            staff = str(snowflake())
+            user_ids.update(members)
+            user_ids.add(staff)
+            numbers = defaultdict(int)
+            for _ in range(count):
+                category = rng.choice(categories)
+                numbers[category] += 1
+                created_at = now - timedelta(seconds=rng.uniform(0, 365 * 86400))
+                is_open = rng.random() < 0.03
+                creator = rng.choice(members)
+                ticket_id = str(snowflake())
+                ticket_rows.append({
+                    "id": ticket_id, "guild_id": guild_id, "category_id": category,
+                    "created_by_id": creator, "number": numbers[category], "open": is_open,
+                    "created_at": created_at, "last_message_at": created_at,
+                    "claimed_by_id": staff if is_open and rng.random() < 0.5 else None,
+                    "closed_at": None if is_open else created_at + timedelta(hours=rng.expovariate(1 / 24)),
+                    "closed_by_id": None if is_open else staff,
+                    "topic": "Help" if rng.random() < 0.3 else None,
+                })
+                
+                if not is_open and rng.random() < 0.2:
+                    for author in (creator, staff):
+                        archived_user_rows.append({"ticket_id": ticket_id, "user_id": author, "username": author})
+                    for m in range(1 + int(rng.expovariate(1 / 8))):
+                        message_rows.append({
+                            "id": str(snowflake()), "ticket_id": ticket_id,
+                            "author_id": creator if m % 2 == 0 else staff,
+                            "content": "x" * int(rng.expovariate(1 / 80)),
+                            "created_at": created_at + timedelta(minutes=m),
+                        })
+            
+            # Keep memory bounded while seeding large populations
+            if len(ticket_rows) >= 50000:
+                await flush_tickets(session, ticket_rows, message_rows, archived_user_rows)
+        
+        await flush_tickets(session, ticket_rows, message_rows, archived_user_rows)
+        await insert_rows(session, User, [{"id": user_id} for user_id in user_ids])
+        await session.commit()
+
+
+async def flush_tickets(session, tickets: List[Dict], messages: List[Dict], archived_users: List[Dict]) -> None:
+    """Insert buffered tickets and their archives, then clear the buffers."""
+    await insert_rows(session, Ticket, tickets)
+    await insert_rows(session, ArchivedMessage, messages)
+    await insert_rows(session, ArchivedUser, archived_users)
+    for rows in (tickets, messages, archived_users):
+        rows.clear()
+
+
+class FakeGateway:
+    """Dispatch interactions to the cogs, one task per interaction."""
+    
+    def __init__(self, bot: FakeBot, session_factory, rng: random.Random):
+        from bot.commands.close import CloseCommand
+        from bot.commands.new import NewCommand
+        from bot.interactions.buttons.ticket_buttons import TicketButtons
+        
+        self.bot = bot
+        self.session_factory = session_factory
+        self.rng = rng
+        self.new_command = NewCommand(bot)
+        self.close_command = CloseCommand(bot)
+        # The cogs route their buttons through the bot's component router
+        self.buttons = TicketButtons(bot)
+        
+        # Guild selection weighted by ticket volume, like real traffic
+        self.guild_ids: List[str] = []
+        self.guild_weights: List[int] = []
+        self.categories: Dict[str, List[Tuple[int, str, str]]] = defaultdict(list)
+        # Open tickets per guild: (ticket ID, creator ID, claimed)
+        self.open_tickets: Dict[str, List[Tuple[str, str, bool]]] = defaultdict(list)
+        
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.errors: Counter = Counter()
+        self.latencies: List[float] = []
+        self.ack_latencies: List[float] = []
+        self.missed_deadlines = 0
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.tasks: set = set()
+        self.pending: set = set()
+        
+        get_event_bus().add_listener(self._on_event, (TICKET_CREATED,))
+    
+    async def load(self) -> None:
+        """Read guilds, categories and open tickets from the database."""
+        async with self.session_factory() as session:
+            for guild_id, count in await session.execute(
+                select(Ticket.guild_id, func.count()).group_by(Ticket.guild_id)
+            ):
+                self.guild_ids.append(guild_id)
+                self.guild_weights.append(count)
+            for category_id, guild_id, discord_category, staff_roles in await session.execute(
+                select(Category.id, Category.guild_id, Category.discord_category, Category.staff_roles)
+            ):
+                self.categories[guild_id].append((category_id, discord_category, json.loads(staff_roles)[0]))
+            # A reused database already holds IDs the fakes would hand out again
+            for model in (Ticket, ArchivedMessage, User):
+                skip_snowflakes(int(await session.scalar(select(func.max(model.id))) or 0))
+            for ticket_id, guild_id, creator, claimed in await session.execute(
+                select(Ticket.id, Ticket.guild_id, Ticket.created_by_id, Ticket.claimed_by_id).where(Ticket.open == True)
+            ):
+                self.open_tickets[guild_id].append((ticket_id, creator, claimed is not None))
+    
+    def _on_event(self, event: TicketEvent) -> None:
+        """Make tickets created during the run available to close and claim."""
+        if event.type == TICKET_CREATED:
+            self.open_tickets[event.guild_id].append((event.ticket_id, event.data["created_by"], False))
+    
+    def guild(self, guild_id: str) -> FakeGuild:
+        """Get a guild's fake, building it on first use."""
+        guild = self.bot.get_guild(int(guild_id))
+        if guild is None:
+            guild = self.bot.add_guild(guild_id=int(guild_id))
+            for _, discord_category, staff_role in self.categories[guild_id]:
+                guild.add_category("Tickets", int(discord_category))
+                guild.add_role("Staff", int(staff_role))
+            guild.staff = guild.add_member("staff", [guild.get_role(int(self.categories[guild_id][0][2]))])
+        return guild
+    
+    def member(self, guild: FakeGuild, member_id: Optional[str] = None):
+        """Get a member of a guild, creating it on first use."""
+        member = guild.get_member(int(member_id)) if member_id else None
+        return member or guild.add_member("member", member_id=int(member_id) if member_id else None)
+    
+    def channel(self, guild: FakeGuild, ticket_id: str) -> FakeTextChannel:
+        """Get a ticket's channel, creating it on first use."""
+        channel = guild.get_channel(int(ticket_id))
+        if channel is None:
+            channel = guild.channels[int(ticket_id)] = FakeTextChannel(guild, "ticket", channel_id=int(ticket_id))
+        return channel
+    
+    def dispatch(self, kind: str) -> None:
+        """Start handling one interaction."""
+        task = asyncio.create_task(self.handle(kind))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+    
+    async def handle(self, kind: str) -> None:
+        """Build and run an interaction of the given kind."""
+        # Closing and claiming need an open ticket; fall back to opening one
+        for _ in range(1 if kind == "new" else 5):
+            guild_id = self.rng.choices(self.guild_ids, self.guild_weights)[0]
+            open_tickets = self.open_tickets[guild_id]
+            candidates = [t for t in open_tickets[-50:] if kind != "claim" or not t[2]]
+            if candidates:
+                break
+        else:
+            kind = "new"
+        guild = self.guild(guild_id)
+        
+        self.in_flight += 1
+        self.counts[kind] += 1
+        start = time.perf_counter()
+        try:
+            if kind == "new":
+                command = FakeInteraction(self.bot, guild, self.member(guild))
+                await self._deliver(command, self.new_command.new_ticket.callback(self.new_command, command))
+                category_id = self.rng.choice(self.categories[guild_id])[0]
+                click = FakeInteraction(self.bot, guild, command.user, custom_id=make_custom_id(TICKET_CREATE, category_id))
+                await self._deliver(click, self.bot.components.dispatch(click))
+            else:
+                ticket = self.rng.choice(candidates)
+                open_tickets.remove(ticket)
+                ticket_id, creator, _ = ticket
+                channel = self.channel(guild, ticket_id)
+                if kind == "claim":
+                    click = FakeInteraction(self.bot, guild, guild.staff, channel, custom_id=TICKET_CLAIM)
+                    await self._deliver(click, self.bot.components.dispatch(click))
+                    open_tickets.append((ticket_id, creator, True))
+                elif kind == "close":
+                    command = FakeInteraction(self.bot, guild, self.member(guild, creator), channel)
+                    await self._deliver(
+                        command, self.close_command.close_ticket.callback(self.close_command, command, "Load test")
+                    )
+                else:
+                    click = FakeInteraction(self.bot, guild, guild.staff, channel, custom_id=TICKET_CLOSE)
+                    await self._deliver(click, self.bot.components.dispatch(click))
+            self.completed += 1
+        except Exception as e:
+            self.failed += 1
+            self.errors[f"{kind}: {type(e).__name__}: {e}"[:120]] += 1
+        finally:
+            self.in_flight -= 1
+            self.latencies.append(time.perf_counter() - start)
+    
+    async def _deliver(self, interaction: FakeInteraction, handler: Awaitable[Any]) -> None:
+        """Run a handler and check that it acknowledged its interaction in time."""
+        self.pending.add(interaction)
+        try:
+            await handler
+        finally:
+            self.pending.discard(interaction)
+            acknowledged_at = interaction.acknowledged_at
+            if acknowledged_at is None or acknowledged_at - interaction.created_at > ACK_DEADLINE:
+                self.missed_deadlines += 1
+            if acknowledged_at is not None:
+                self.ack_latencies.append(acknowledged_at - interaction.created_at)
+    
+    def overdue(self) -> int:
+        """Count interactions still unacknowledged past the deadline."""
+        now = time.perf_counter()
+        return sum(
+            1 for interaction in self.pending
+            if interaction.acknowledged_at is None and now - interaction.created_at > ACK_DEADLINE
+        )
+    
+    def take_window(self) -> Tuple[List[float], List[float]]:
+        """Get and reset the latencies recorded since the last call."""
+        latencies, ack_latencies = self.latencies, self.ack_latencies
+        self.latencies, self.ack_latencies = [], []
+        return latencies, ack_latencies
+
+
+def parse_mix(mix: str) -> Tuple[List[str], List[float]]:
+    """Parse ``kind=weight,...`` into kinds and weights."""
+    kinds, weights = [], []
+    for part in mix.split(","):
+        kind, weight = part.split("=")
+        if kind not in ("new", "claim", "close", "close_button"):
+            raise ValueError(f"Unknown interaction kind {kind!r}")
+        kinds.append(kind)
+        weights.append(float(weight))
+    return kinds, weights
+
+
+async def run_stage(
+    gateway: FakeGateway,
+    engine,
+    rate: float,
+    seconds: float,
+    kinds: List[str],
+    weights: List[float],
+    rng: random.Random,
+    timeline: List[Dict[str, Any]],
+    started: float
+) -> Dict[str, Any]:
+    """Offer ``rate`` interactions per second for ``seconds`` and measure the outcome."""
+    completed_before = gateway.completed
+    missed_before = gateway.missed_deadlines
+    gateway.take_window()
+    stop = asyncio.Event()
+    peak_in_flight = 0
+    
+    async def sample() -> None:
+        # Once a second: queue depth, pool use, loop lag and memory
+        nonlocal peak_in_flight
+        last_completed = gateway.completed
+        while not stop.is_set():
+            tick = time.perf_counter()
+            try:
+                await asyncio.wait_for(stop.wait(), 1.0)
+            except asyncio.TimeoutError:
+                pass
+            lag = max(time.perf_counter() - tick - 1.0, 0.0) if not stop.is_set() else 0.0
+            peak_in_flight = max(peak_in_flight, gateway.in_flight)
+            timeline.append({
+                "t": round(time.perf_counter() - started, 2),
+                "offered_rate": rate,
+                "completed": gateway.completed - last_completed,
+                "in_flight": gateway.in_flight,
+                "db_checked_out": getattr(engine.pool, "checkedout", lambda: None)(),
+                "loop_lag_ms": round(lag * 1000, 1),
+                "rss_mb": round(rss_bytes() / 1024 / 1024, 1),
+            })
+            last_completed = gateway.completed
+    
+    sampler = asyncio.create_task(sample())
+    start = time.perf_counter()
+    deadline = start + seconds
+    offered = 0
+    next_arrival = start
+    while True:
+        next_arrival += rng.expovariate(rate)
+        if next_arrival >= deadline:
+            break
+        delay = next_arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        gateway.dispatch(rng.choices(kinds, weights)[0])
+        offered += 1
+    await asyncio.sleep(max(deadline - time.perf_counter(), 0))
+    
+    backlog = gateway.in_flight
+    overdue = gateway.overdue()
+    stop.set()
+    await sampler
+    
+    latencies, ack_latencies = gateway.take_window()
+    latencies.sort()
+    ack_latencies.sort()
+    completed = gateway.completed - completed_before
+    return {
+        "offered_rate": rate,
+        "offered": offered,
+        "completed": completed,
+        "throughput": completed / seconds,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "ack_p99_ms": percentile(ack_latencies, 0.99) * 1000,
+        "missed_deadlines": gateway.missed_deadlines - missed_before,
+        "peak_in_flight": peak_in_flight,
+        "backlog": backlog,
+        "overdue": overdue,
+        "rss_mb": round(rss_bytes() / 1024 / 1024, 1),
+    }
+
+
+def is_saturated(stage: Dict[str, Any]) -> bool:
+    """Check whether a stage fell behind its offered load.
+    
+    By Little's law a keeping-up stage has about ``rate * latency``
+    interactions in flight; a backlog well beyond that is a growing queue.
+    """
+    expected_in_flight = stage["offered_rate"] * stage["p99_ms"] / 1000
+    return (
+        stage["completed"] < stage["offered"] * 0.8
+        or stage["missed_deadlines"] + stage["overdue"] > 0
+        or stage["backlog"] > max(expected_in_flight * 2, 10)
+    )
+
+
+async def main() -> None:
+    """Seed, replay and report."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guilds", type=int, default=10000)
+    parser.add_argument("--tickets", type=int, default=500000)
+    parser.add_argument("--database", help="SQLite file to seed and keep (default: a temporary file)")
+    parser.add_argument("--reuse", action="store_true", help="use --database as already seeded")
+    parser.add_argument("--rates", default="25,50,100,200,400", help="offered interactions per second, per stage")
+    parser.add_argument("--stage-seconds", type=float, default=10.0)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="interaction mix as kind=weight pairs")
+    parser.add_argument("--latency", type=float, default=40.0, help="simulated Discord REST latency in ms")
+    parser.add_argument("--jitter", type=float, default=20.0, help="extra random REST latency in ms")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write stage results and the timeline to this file")
+    args = parser.parse_args()
+    
+    setup_logger(level="CRITICAL")
+    rng = random.Random(args.seed)
+    kinds, weights = parse_mix(args.mix)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.database or os.path.join(tmp, "load.db")
+        engine, session_factory = await init_db(f"sqlite+aiosqlite:///{path}")
+        
+        if not args.reuse:
+            start = time.perf_counter()
+            await seed(session_factory, args.guilds, args.tickets, rng)
+            print(f"Seeded {args.guilds:,} guilds and ~{args.tickets:,} tickets in {time.perf_counter() - start:.1f}s")
+        
+        bot = FakeBot(session_factory, FakeREST(args.latency / 1000, args.jitter / 1000, args.seed))
+        gateway = FakeGateway(bot, session_factory, rng)
+        await gateway.load()
+        # Closed tickets are archived and deleted in the background, as in the bot
+        bot.close_jobs.start()
+        print(f"Loaded {len(gateway.guild_ids):,} guilds, "
+              f"{sum(map(len, gateway.open_tickets.values())):,} open tickets; RSS {rss_bytes() / 1024 / 1024:.0f} MiB\n")
+        
+        stages: List[Dict[str, Any]] = []
+        timeline: List[Dict[str, Any]] = []
+        saturation: Optional[float] = None
+        started = time.perf_counter()
+        print(f"{'rate':>6} {'done/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'ack p99':>9} {'missed':>7} "
+              f"{'overdue':>8} {'peak q':>7} {'backlog':>8} {'RSS MiB':>8}")
+        for rate in (float(rate) for rate in args.rates.split(",")):
+            stage = await run_stage(gateway, engine, rate, args.stage_seconds, kinds, weights, rng, timeline, started)
+            stages.append(stage)
+            print(
+                f"{rate:>6.0f} {stage['throughput']:>8.1f} {stage['p50_ms']:>9.1f} {stage['p99_ms']:>9.1f} "
+                f"{stage['ack_p99_ms']:>9.1f} {stage['missed_deadlines']:>7} {stage['overdue']:>8} {stage['peak_in_flight']:>7} "
+                f"{stage['backlog']:>8} {stage['rss_mb']:>8.1f}"
+            )
+            if saturation is None and is_saturated(stage):
+                saturation = rate
+        
+        # Let the last stage drain before closing the database
+        if gateway.tasks:
+            await asyncio.wait(gateway.tasks, timeout=60)
+        await bot.close_jobs.stop()
+        await engine.dispose()
+    
+    print(f"\nInteractions: {dict(gateway.counts)}, failed: {gateway.failed}")
+    components = bot.components.get_stats()
+    print(f"Components: {components['dispatched']} dispatched, {components['auto_deferred']} deferred at the budget")
+    close_jobs = bot.close_jobs.get_stats()
+    print(f"Close jobs: {close_jobs['completed']} completed, {close_jobs['failed']} failed")
+    for error, count in gateway.errors.most_common(5):
+        print(f"  {count:>5} x {error}")
+    print(f"Saturation point: {f'{saturation:.0f}/s' if saturation is not None else 'not reached'}")
+    
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "config": vars(args),
+            "saturation_rate": saturation,
+            "interactions": dict(gateway.counts),
+            "failed": gateway.failed,
+            "components": components,
+            "close_jobs": close_jobs,
+            "errors": dict(gateway.errors),
+            "stages": stages,
+            "timeline": timeline,
+        }, indent=2))
+        print(f"Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
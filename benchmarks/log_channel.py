@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Compare posting ticket activity to log channels per event and in batches.
+
+A burst of ``--events`` ticket events arrives at ``--rate`` per second,
+spread over ``--guilds`` guilds with one busy guild taking ``--busy``
+of them. Log channels allow five messages per five seconds, like
+Discord's per-channel limit. ``per-event`` awaits one message per event
+in the event path; ``batched`` hands events to ``LogDispatcher``. Reports
+how long the event path waited, how many messages were sent, how long
+until every entry was posted, and how many were dropped.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+
+from benchmarks.fakes import FakeBot, FakeGuild, FakeREST, FakeTextChannel
+from bot.tickets.events import TICKET_CREATED, TicketEvent
+from utils.logger import setup_logger
+
+
+class RateLimitedChannel(FakeTextChannel):
+    """A log channel that allows ``limit`` messages per ``period`` seconds."""
+    
+    def __init__(self, guild: FakeGuild, limit: int = 5, period: float = 5.0):
+        super().__init__(guild, "log")
+        self.limit = limit
+        self.period = period
+        self.sent_at: List[float] = []
+        self.embeds = 0
+    
+    async def send(self, content: Optional[str] = None, **kwargs: Any):
+        while len(self.sent_at) >= self.limit and time.perf_counter() - self.sent_at[-self.limit] < self.period:
+            await asyncio.sleep(self.period - (time.perf_counter() - self.sent_at[-self.limit]))
+        self.sent_at.append(time.perf_counter())
+        self.embeds += len(kwargs.get("embeds") or [kwargs.get("embed")])
+        return await super().send(content, **kwargs)
+
+
+class FakeGuildSettings:
+    """The guild settings the log dispatcher reads."""
+    
+    def __init__(self, log_channel: int):
+        self.log_channel = str(log_channel)
+
+
+def make_bot(guilds: int) -> FakeBot:
+    """Build a bot whose guilds each have a rate-limited log channel."""
+    bot = FakeBot(session_factory=None, rest=FakeREST())
+    settings: Dict[str, FakeGuildSettings] = {}
+    for g in range(guilds):
+        guild = bot.add_guild(f"Guild {g}")
+        channel = RateLimitedChannel(guild)
+        guild.channels[channel.id] = channel
+        settings[str(guild.id)] = FakeGuildSettings(channel.id)
+    
+    async def get_guild_settings(guild_id: str) -> FakeGuildSettings:
+        return settings.get(guild_id)
+    
+    bot.ticket_manager.get_guild_settings = get_guild_settings
+    return bot
+
+
+def make_events(bot: FakeBot, count: int, busy: float, rng: random.Random) -> List[TicketEvent]:
+    """Create events, ``busy`` of them for the first guild."""
+    events = []
+    for number in range(count):
+        guild = bot.guilds[0] if rng.random() < busy else rng.choice(bot.guilds)
+        events.append(TicketEvent(TICKET_CREATED, str(guild.id), str(number), {"number": number, "created_by": "1"}))
+    return events
+
+
+def log_channels(bot: FakeBot) -> List[RateLimitedChannel]:
+    return [channel for guild in bot.guilds for channel in guild.channels.values()]
+
+
+async def per_event(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Await a log message for every event, as the event path would."""
+    bot = make_bot(options["guilds"])
+    events = make_events(bot, options["events"], options["busy"], random.Random(options["seed"]))
+    dispatcher = bot.log_dispatcher
+    waited: List[float] = []
+    
+    async def handle(event: TicketEvent) -> None:
+        start = time.perf_counter()
+        guild = bot.get_guild(int(event.guild_id))
+        channel = next(iter(guild.channels.values()))
+        await channel.send(embed=dispatcher._render(event))
+        waited.append(time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    tasks = []
+    for event in events:
+        tasks.append(asyncio.create_task(handle(event)))
+        await asyncio.sleep(1 / options["rate"])
+    await asyncio.gather(*tasks)
+    return summarize("per-event", bot, waited, time.perf_counter() - start, 0)
+
+
+async def batched(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Hand every event to the log dispatcher."""
+    bot = make_bot(options["guilds"])
+    events = make_events(bot, options["events"], options["busy"], random.Random(options["seed"]))
+    dispatcher = bot.log_dispatcher
+    dispatcher.interval = options["interval"]
+    dispatcher.maxsize = options["buffer"]
+    waited: List[float] = []
+    
+    start = time.perf_counter()
+    dispatcher.start()
+    for event in events:
+        posted = time.perf_counter()
+        dispatcher.post(event.guild_id, event)
+        waited.append(time.perf_counter() - posted)
+        await asyncio.sleep(1 / options["rate"])
+    while len(dispatcher) or dispatcher._flushing:
+        await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - start
+    await dispatcher.stop()
+    return summarize("batched", bot, waited, elapsed, dispatcher.dropped)
+
+
+def summarize(name: str, bot: FakeBot, waited: List[float], elapsed: float, dropped: int) -> Dict[str, Any]:
+    waited.sort()
+    channels = log_channels(bot)
+    return {
+        "name": name,
+        "messages": sum(len(channel.sent_at) for channel in channels),
+        "entries": sum(channel.embeds for channel in channels),
+        "dropped": dropped,
+        "wait_p99_ms": waited[int(len(waited) * 0.99)] * 1000,
+        "drained_s": elapsed,
+    }
+
+
+async def main() -> None:
+    """Run both approaches and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=300)
+    parser.add_argument("--rate", type=float, default=50.0, help="events per second")
+    parser.add_argument("--guilds", type=int, default=20)
+    parser.add_argument("--busy", type=float, default=0.5, help="share of events for the busiest guild")
+    parser.add_argument("--interval", type=float, default=5.0, help="dispatcher flush interval in seconds")
+    parser.add_argument("--buffer", type=int, default=100, help="dispatcher buffer size per guild")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    
+    setup_logger(level="CRITICAL")
+    options = vars(args)
+    print(f"{args.events} events at {args.rate:.0f}/s over {args.guilds} guilds, {args.busy:.0%} to one guild\n")
+    print(f"{'mode':<10} {'messages':>9} {'entries':>8} {'dropped':>8} {'wait p99 ms':>12} {'drained s':>10}")
+    for run in (per_event, batched):
+        result = await run(options)
+        print(
+            f"{result['name']:<10} {result['messages']:>9} {result['entries']:>8} {result['dropped']:>8} "
+            f"{result['wait_p99_ms']:>12.2f} {result['drained_s']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
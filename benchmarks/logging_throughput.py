@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Benchmark log calls per second issued from the event loop."""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+
+from utils.logger import get_bot_logger, get_logging_stats, setup_logger, shutdown_logger
+
+
+async def run_case(name: str, calls: int, log_file: Path, **options) -> float:
+    """Log ``calls`` messages from a coroutine and return calls per second."""
+    setup_logger(log_file=log_file, console=False, **options)
+    log = get_bot_logger().tickets
+    
+    # Yield to the loop periodically, like real handlers do
+    start = time.perf_counter()
+    for i in range(calls):
+        log.info(f"Ticket #{i % 500} updated", guild_id="123456789")
+        if i % 100 == 0:
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    
+    stats = get_logging_stats()
+    shutdown_logger()
+    
+    rate = calls / elapsed
+    print(f"   {name:<28} {rate:>12,.0f} calls/s  (suppressed={stats['suppressed']}, dropped={stats['dropped']})")
+    return rate
+
+
+async def main() -> None:
+    """Run all logging benchmark cases."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=50000)
+    args = parser.parse_args()
+    
+    print("📈 Logging throughput from the event loop")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / "bench.log"
+        await run_case("inline (no queue)", args.calls, log_file, use_queue=False, sample_burst=0)
+        await run_case("queued, console format", args.calls, log_file, sample_burst=0, queue_size=0)
+        await run_case("queued, JSON", args.calls, log_file, json_logs=True, sample_burst=0, queue_size=0)
+        await run_case("queued, JSON, sampled", args.calls, log_file, json_logs=True, queue_size=0)
+    
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
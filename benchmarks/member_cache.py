@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Compare resident memory per guild under each member cache policy.
+
+Builds guilds through the Discord library's own state, with the intents
+and cache options ``bot.members.gateway_options`` gives each policy. Under
+``full`` every member arrives as if chunked at startup, with a presence for
+private bots. Under ``lean`` no member is cached by the library; staff and
+members with open tickets are kept by ``MemberRoleCache`` as they would be
+once they interact. Each policy runs in a fresh process so resident memory
+is comparable.
+"""
+
+import argparse
+import gc
+import json
+import multiprocessing
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+
+from bot.members import POLICIES
+
+
+def role_payload(role_id: int, name: str) -> Dict[str, Any]:
+    colors = {"primary_color": 0, "secondary_color": None, "tertiary_color": None}
+    return {
+        "id": str(role_id), "name": name, "permissions": "0", "position": 0, "color": 0,
+        "colors": colors, "hoist": False, "managed": False, "mentionable": False, "flags": 0,
+    }
+
+
+def member_payload(member_id: int, role_id: int) -> Dict[str, Any]:
+    return {
+        "user": {
+            "id": str(member_id), "username": f"user{member_id}", "discriminator": "0",
+            "global_name": f"User {member_id}", "avatar": f"{member_id:032x}"[-32:],
+        },
+        "roles": [str(role_id)], "joined_at": "2024-01-01T00:00:00+00:00",
+        "nick": None, "deaf": False, "mute": False, "flags": 0,
+    }
+
+
+def presence_payload(member_id: int) -> Dict[str, Any]:
+    return {
+        "user": {"id": str(member_id)},
+        "status": "online",
+        "activities": [{"name": "A game", "type": 0, "created_at": 0}],
+        "client_status": {"desktop": "online"},
+    }
+
+
+def measure(policy: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the guild population under one policy and measure it."""
+    import discord
+    
+    from benchmarks.load_generator import rss_bytes
+    from bot.members import LEAN, MemberRoleCache, gateway_options
+    
+    intents, cache_options = gateway_options(policy, options["public_bot"])
+    client = discord.Client(intents=intents, **cache_options)
+    state = client._connection
+    members = MemberRoleCache(SimpleNamespace(get_guild=client.get_guild), policy)
+    rng = random.Random(options["seed"])
+    ids = iter(range(1 << 40, 1 << 62, 1 << 22))
+    
+    gc.collect()
+    rss_before = rss_bytes()
+    tracemalloc.start()
+    traced_before = tracemalloc.get_traced_memory()[0]
+    
+    member_total = 0
+    for _ in range(options["guilds"]):
+        guild_id = next(ids)
+        roles = [role_payload(guild_id, "@everyone")] + [role_payload(next(ids), f"role {r}") for r in range(20)]
+        staff_role = int(roles[1]["id"])
+        count = max(int(rng.paretovariate(1.5) * options["members"] / 3), 2)
+        member_total += count
+        payloads = [member_payload(next(ids), int(rng.choice(roles[1:])["id"])) for _ in range(count)]
+        data = {
+            "id": str(guild_id), "name": f"Guild {guild_id}", "member_count": count,
+            "roles": roles, "channels": [], "members": payloads,
+            "presences": [presence_payload(int(m["user"]["id"])) for m in payloads] if intents.presences else [],
+        }
+        guild = discord.Guild(data=data, state=state)
+        state._add_guild(guild)
+        
+        if policy == LEAN:
+            # Staff and ticket owners interact, so they are kept
+            for payload in payloads:
+                if rng.random() < options["staff_fraction"]:
+                    payload["roles"] = [str(staff_role)]
+                    members.keep_staff(discord.Member(data=payload, guild=guild, state=state))
+                elif rng.random() < options["ticket_fraction"]:
+                    members.opened_ticket(discord.Member(data=payload, guild=guild, state=state))
+        del data, payloads
+    
+    gc.collect()
+    traced = tracemalloc.get_traced_memory()[0] - traced_before
+    tracemalloc.stop()
+    rss = rss_bytes() - rss_before
+    cached = sum(len(guild.members) for guild in client.guilds)
+    return {
+        "policy": policy,
+        "guilds": options["guilds"],
+        "members": member_total,
+        "cached_members": cached,
+        "kept_members": len(members),
+        "traced_bytes": traced,
+        "rss_bytes": rss,
+        "bytes_per_guild": traced / options["guilds"],
+    }
+
+
+def main() -> None:
+    """Measure every policy and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guilds", type=int, default=200)
+    parser.add_argument("--members", type=int, default=1000, help="mean members per guild")
+    parser.add_argument("--staff-fraction", type=float, default=0.01)
+    parser.add_argument("--ticket-fraction", type=float, default=0.005, help="members with an open ticket")
+    parser.add_argument("--public-bot", action="store_true", help="measure a public bot (no presences under full)")
+    parser.add_argument("--project", type=int, default=10000, help="guild count to project memory for")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+    
+    options = {
+        "guilds": args.guilds, "members": args.members, "staff_fraction": args.staff_fraction,
+        "ticket_fraction": args.ticket_fraction, "public_bot": args.public_bot, "seed": args.seed,
+    }
+    context = multiprocessing.get_context("spawn")
+    results: List[Dict[str, Any]] = []
+    for policy in POLICIES:
+        with context.Pool(1) as pool:
+            results.append(pool.apply(measure, (policy, options)))
+    
+    print(f"{args.guilds} guilds, {results[0]['members']:,} members, {'public' if args.public_bot else 'private'} bot\n")
+    print(f"{'policy':<8} {'cached':>9} {'kept':>7} {'KiB/guild':>10} {'B/member':>9} {'RSS MiB':>8} {f'@{args.project} guilds':>14}")
+    for result in results:
+        print(
+            f"{result['policy']:<8} {result['cached_members']:>9,} {result['kept_members']:>7,} "
+            f"{result['bytes_per_guild'] / 1024:>10.1f} {result['traced_bytes'] / result['members']:>9.0f} "
+            f"{result['rss_bytes'] / 1024 / 1024:>8.1f} "
+            f"{result['bytes_per_guild'] * args.project / 1024 / 1024:>10.0f} MiB"
+        )
+    
+    if args.json:
+        Path(args.json).write_text(json.dumps({"config": vars(args), "results": results}, indent=2))
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Compare dashboard reads on the primary with reads routed to a replica.
+
+Seeds a SQLite database with ``--guilds`` guilds of ``--tickets`` tickets
+each. ``--readers`` dashboard clients in another process, as in an API
+worker, load ticket pages of ``--page`` rows and per-category counts for
+random guilds, while the bot opens a ticket every ``--write-interval``
+milliseconds and records activity on another. After each new ticket,
+its guild's first page is read back to check it's there. ``primary``
+reads on the engine the bot writes with, in SQLite's default rollback
+journal mode; ``replica`` reads through ``SessionRouter`` on a second,
+read-only engine on the same file in WAL mode. Reports reads per second,
+read and write latency, how many read-backs fell back to the primary,
+and read-backs that missed the write.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+
+from sqlalchemy import func, insert, select
+
+from api.pagination import build_ticket_query
+from database.models import Category, Guild, Ticket, User, init_db
+from database.routing import SessionRouter, connect_replica
+from utils.logger import setup_logger
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Get a percentile of some latencies, in milliseconds."""
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)] * 1000 if values else 0.0
+
+
+async def seed(session_factory, guilds: int, tickets: int) -> Dict[str, int]:
+    """Create guilds with a category and ``tickets`` tickets each; returns each guild's category."""
+    categories = {}
+    now = datetime.utcnow()
+    async with session_factory() as session:
+        session.add(User(id="1"))
+        for g in range(guilds):
+            category = Category(
+                guild_id=str(g), name="Support", description="Support tickets", channel_name="ticket-{number}",
+                discord_category="0", emoji="🎫", opening_message="Hi", staff_roles="[]",
+            )
+            session.add_all([Guild(id=str(g)), category])
+            await session.flush()
+            categories[str(g)] = category.id
+            await session.execute(insert(Ticket), [
+                {
+                    "id": f"{g}-{t}",
+                    "category_id": category.id,
+                    "created_by_id": "1",
+                    "guild_id": str(g),
+                    "number": t,
+                    "open": t % 5 == 0,
+                    "created_at": now - timedelta(minutes=t),
+                }
+                for t in range(tickets)
+            ])
+        await session.commit()
+    return categories
+
+
+async def load_dashboard(router: SessionRouter, guild_id: str, page: int) -> List[str]:
+    """Load a guild's newest tickets and its ticket counts, as the dashboard does."""
+    async with router.read(guild_id) as session:
+        rows = (await session.execute(build_ticket_query(guild_id, page))).all()
+        await session.execute(
+            select(Ticket.category_id, Ticket.open, func.count())
+            .where(Ticket.guild_id == guild_id)
+            .group_by(Ticket.category_id, Ticket.open)
+        )
+    return [row.id for row in rows]
+
+
+async def open_router(mode: str, path: str, options: Dict[str, Any]):
+    """Open the primary, and for ``replica`` a read-only engine on the same file."""
+    engine, session_factory = await init_db(f"sqlite+aiosqlite:///{path}")
+    router = SessionRouter(session_factory, fallback=options["fallback"] / 1000)
+    engines = [engine]
+    if mode == "replica":
+        replica_engine, router.replica_factory = await connect_replica(
+            f"sqlite+aiosqlite:///file:{path}?mode=ro&uri=true",
+            engine
+        )
+        engines.append(replica_engine)
+    router.start()
+    return router, engines
+
+
+async def read_dashboards(mode: str, path: str, options: Dict[str, Any]) -> List[float]:
+    """Load random guilds' dashboards from ``--readers`` clients for ``--duration`` seconds."""
+    router, engines = await open_router(mode, path, options)
+    latencies: List[float] = []
+    deadline = time.perf_counter() + options["duration"]
+    
+    async def client() -> None:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await load_dashboard(router, str(random.randrange(options["guilds"])), options["page"])
+            latencies.append(time.perf_counter() - start)
+    
+    await asyncio.gather(*(client() for _ in range(options["readers"])))
+    router.stop()
+    for engine in engines:
+        await engine.dispose()
+    return latencies
+
+
+def reader_process(mode: str, path: str, options: Dict[str, Any], results) -> None:
+    """Read dashboards in another process, as an API worker does."""
+    results.put(asyncio.run(read_dashboards(mode, path, options)))
+
+
+async def writer(
+    session_factory,
+    router: SessionRouter,
+    categories: Dict[str, int],
+    options: Dict[str, Any],
+    stop: asyncio.Event,
+    result: Dict[str, Any]
+) -> None:
+    """Open tickets and record activity, reading each new ticket back through the router."""
+    number = options["tickets"]
+    while not stop.is_set():
+        guild_id = str(random.randrange(options["guilds"]))
+        number += 1
+        start = time.perf_counter()
+        async with session_factory() as session:
+            session.add(Ticket(
+                id=f"{guild_id}-{number}", category_id=categories[guild_id], created_by_id="1",
+                guild_id=guild_id, number=number, created_at=datetime.utcnow(),
+            ))
+            await session.execute(
+                Ticket.__table__.update()
+                .where(Ticket.id == f"{random.randrange(options['guilds'])}-{random.randrange(options['tickets'])}")
+                .values(last_message_at=datetime.utcnow())
+            )
+            await session.commit()
+        result["write_latencies"].append(time.perf_counter() - start)
+        
+        if router.replica_factory is not None and router.recently_written(guild_id):
+            result["fallbacks"] += 1
+        if f"{guild_id}-{number}" not in await load_dashboard(router, guild_id, options["page"]):
+            result["stale"] += 1
+        await asyncio.sleep(options["write_interval"] / 1000)
+
+
+async def run(mode: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the readers and the writer with one routing approach."""
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = f"{tmp}/bench.db"
+        router, engines = await open_router(mode, path, options)
+        categories = await seed(router.primary_factory, options["guilds"], options["tickets"])
+        
+        # The dashboard reads in its own process, so only the database is shared
+        results = multiprocessing.get_context("spawn").Queue()
+        process = multiprocessing.get_context("spawn").Process(target=reader_process, args=(mode, path, options, results))
+        process.start()
+        await asyncio.sleep(1.0)
+        
+        stop = asyncio.Event()
+        result: Dict[str, Any] = {"write_latencies": [], "fallbacks": 0, "stale": 0}
+        writing = asyncio.create_task(writer(router.primary_factory, router, categories, options, stop, result))
+        reads = await asyncio.to_thread(results.get)
+        stop.set()
+        await writing
+        process.join()
+        
+        router.stop()
+        for engine in engines:
+            await engine.dispose()
+    
+    writes = result["write_latencies"]
+    return {
+        "mode": mode,
+        "reads_s": len(reads) / options["duration"],
+        "read_p50_ms": percentile(reads, 0.5),
+        "read_p99_ms": percentile(reads, 0.99),
+        "fallback_pct": 100 * result["fallbacks"] / max(len(writes), 1),
+        "writes": len(writes),
+        "write_p99_ms": percentile(writes, 0.99),
+        "write_max_ms": percentile(writes, 1.0),
+        "stale": result["stale"],
+    }
+
+
+async def main() -> None:
+    """Run both approaches and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guilds", type=int, default=20)
+    parser.add_argument("--tickets", type=int, default=5000, help="tickets per guild")
+    parser.add_argument("--readers", type=int, default=8, help="dashboard clients reading at once")
+    parser.add_argument("--page", type=int, default=200, help="tickets per page")
+    parser.add_argument("--write-interval", type=float, default=20.0, help="ms between the bot's writes")
+    parser.add_argument("--fallback", type=float, default=1000.0, help="ms a guild reads from the primary after a write")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run each mode")
+    args = parser.parse_args()
+    
+    setup_logger(level="WARNING")
+    options = vars(args)
+    print(f"{args.guilds} guilds x {args.tickets:,} tickets, {args.readers} readers, a write every {args.write_interval:.0f}ms\n")
+    print(f"{'mode':<8} {'reads/s':>8} {'read p50 ms':>12} {'read p99 ms':>12} {'writes':>7} {'write p99 ms':>13} {'write max ms':>13} {'fallback %':>11} {'stale':>6}")
+    for mode in ("primary", "replica"):
+        result = await run(mode, options)
+        print(
+            f"{mode:<8} {result['reads_s']:>8.0f} {result['read_p50_ms']:>12.1f} {result['read_p99_ms']:>12.1f} "
+            f"{result['writes']:>7} {result['write_p99_ms']:>13.1f} {result['write_max_ms']:>13.1f} "
+            f"{result['fallback_pct']:>11.1f} {result['stale']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Compare pruning expired archives with one DELETE and in keyset batches.
+
+Seeds a SQLite database with ``--tickets`` closed tickets of
+``--messages`` archived messages each, half of them closed long enough
+ago to expire. While the archives are pruned, a writer updates an open
+ticket every ``--write-interval`` milliseconds, like the bot recording
+activity. ``single`` deletes every expired row in one transaction;
+``batched`` runs ``ArchivePruner`` with ``--batch-size`` rows per batch
+and ``--pause`` milliseconds between batches. Reports rows deleted, time
+taken, the writer's p99 and worst latency, and bytes reclaimed.
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+
+from sqlalchemy import delete, insert, select
+
+from database.models import (
+    ArchivedMessage, ArchivedUser, Category, Guild, Ticket, User, init_db
+)
+from database.retention import ARCHIVE_TABLES, ArchivePruner
+from utils.logger import setup_logger
+
+RETENTION_DAYS = 90
+
+
+async def seed(session_factory, tickets: int, messages: int) -> None:
+    """Create closed tickets with archived messages, half of them expired, and one open ticket."""
+    now = datetime.utcnow()
+    async with session_factory() as session:
+        session.add_all([Guild(id="1"), User(id="1")])
+        category = Category(
+            guild_id="1", name="Support", description="Support tickets", channel_name="ticket-{number}",
+            discord_category="0", emoji="🎫", opening_message="Hi", staff_roles="[]",
+        )
+        session.add(category)
+        await session.flush()
+        
+        await session.execute(insert(Ticket), [
+            {
+                "id": str(t),
+                "category_id": category.id,
+                "created_by_id": "1",
+                "guild_id": "1",
+                "number": t,
+                "open": t == 0,
+                "closed_at": None if t == 0 else now - timedelta(days=RETENTION_DAYS * (2 if t % 2 else 0.5)),
+            }
+            for t in range(tickets + 1)
+        ])
+        for t in range(1, tickets + 1):
+            await session.execute(insert(ArchivedMessage), [
+                {
+                    "id": f"{t:08d}{m:06d}",
+                    "author_id": "1",
+                    "content": f"Message {m} of ticket {t}: " + "lorem ipsum " * 16,
+                    "ticket_id": str(t),
+                }
+                for m in range(messages)
+            ])
+            await session.execute(insert(ArchivedUser), [{"ticket_id": str(t), "user_id": "1", "username": "user"}])
+        await session.commit()
+
+
+async def single_delete(session_factory) -> Dict[str, int]:
+    """Delete every expired archive row in one transaction."""
+    expired = select(Ticket.id).where(
+        Ticket.open == False,
+        Ticket.closed_at < datetime.utcnow() - timedelta(days=RETENTION_DAYS)
+    )
+    async with session_factory() as session:
+        messages = await session.execute(delete(ArchivedMessage).where(ArchivedMessage.ticket_id.in_(expired)))
+        users = await session.execute(delete(ArchivedUser).where(ArchivedUser.ticket_id.in_(expired)))
+        await session.commit()
+    return {"archived_messages": messages.rowcount, "archived_users": users.rowcount}
+
+
+async def writer(session_factory, interval: float, stop: asyncio.Event, latencies: List[float]) -> None:
+    """Update the open ticket every ``interval`` seconds, recording how long each commit takes."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        async with session_factory() as session:
+            await session.execute(
+                Ticket.__table__.update().where(Ticket.id == "0").values(last_message_at=datetime.utcnow())
+            )
+            await session.commit()
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+
+
+async def run(mode: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Prune with one approach while the writer runs."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, session_factory = await init_db(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        await seed(session_factory, options["tickets"], options["messages"])
+        pruner = ArchivePruner(
+            engine,
+            session_factory,
+            RETENTION_DAYS,
+            batch_size=options["batch_size"],
+            pause=options["pause"] / 1000,
+            vacuum=options["vacuum"]
+        )
+        
+        stop = asyncio.Event()
+        latencies: List[float] = []
+        writing = asyncio.create_task(writer(session_factory, options["write_interval"] / 1000, stop, latencies))
+        await asyncio.sleep(0.5)
+        
+        start = time.perf_counter()
+        if mode == "batched":
+            report = await pruner.prune()
+            rows, reclaimed = report["rows"], report["reclaimed_bytes"]
+        else:
+            size_before = await pruner.archive_size()
+            rows = await single_delete(session_factory)
+            await pruner.maintain()
+            reclaimed = size_before - await pruner.archive_size()
+        elapsed = time.perf_counter() - start
+        
+        stop.set()
+        await writing
+        file_size = Path(f"{tmp}/bench.db").stat().st_size
+        await engine.dispose()
+    
+    latencies.sort()
+    return {
+        "mode": mode,
+        "rows": sum(rows.get(table, 0) for table in ARCHIVE_TABLES),
+        "seconds": elapsed,
+        "write_p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "write_max_ms": latencies[-1] * 1000,
+        "reclaimed_mib": reclaimed / 2 ** 20,
+        "file_mib": file_size / 2 ** 20,
+    }
+
+
+async def main() -> None:
+    """Run both approaches and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=1000, help="closed tickets, half of them expired")
+    parser.add_argument("--messages", type=int, default=200, help="archived messages per ticket")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=10.0, help="pause between batches in ms")
+    parser.add_argument("--write-interval", type=float, default=20.0, help="ms between the writer's updates")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM after pruning to shrink the file")
+    args = parser.parse_args()
+    
+    setup_logger(level="WARNING")
+    options = vars(args)
+    print(f"{args.tickets:,} closed tickets x {args.messages} messages, half expired\n")
+    print(f"{'mode':<8} {'rows':>9} {'seconds':>8} {'write p99 ms':>13} {'write max ms':>13} {'reclaimed MiB':>14} {'file MiB':>9}")
+    for mode in ("single", "batched"):
+        result = await run(mode, options)
+        print(
+            f"{mode:<8} {result['rows']:>9,} {result['seconds']:>8.2f} {result['write_p99_ms']:>13.1f} "
+            f"{result['write_max_ms']:>13.1f} {result['reclaimed_mib']:>14.1f} {result['file_mib']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
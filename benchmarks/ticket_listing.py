@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Benchmark dashboard ticket page latency by page depth (keyset vs offset)."""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+
+from sqlalchemy import insert
+
+from api.pagination import build_ticket_query, encode_cursor
+from database.models import Category, Guild, Ticket, User, init_db
+
+GUILD_ID = "100000000000000000"
+
+
+async def seed(session_factory, tickets: int) -> None:
+    """Insert one guild with ``tickets`` tickets."""
+    async with session_factory() as session:
+        session.add(Guild(id=GUILD_ID))
+        session.add(User(id="1"))
+        session.add(Category(
+            id=1, guild_id=GUILD_ID, name="Support", description="Support",
+            channel_name="ticket-{number}", discord_category="1", emoji="🎫",
+            opening_message="Hello", staff_roles="[]"
+        ))
+        await session.commit()
+        
+        start = datetime(2024, 1, 1)
+        rows = [
+            {
+                "id": str(10 ** 17 + i), "category_id": 1, "guild_id": GUILD_ID,
+                "created_by_id": "1", "number": i, "open": i % 4 == 0,
+                "created_at": start + timedelta(seconds=i),
+            }
+            for i in range(tickets)
+        ]
+        for offset in range(0, len(rows), 10000):
+            await session.execute(insert(Ticket), rows[offset:offset + 10000])
+        await session.commit()
+
+
+async def time_page(session_factory, query, repeat: int) -> float:
+    """Return the median time to fetch one page, in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        async with session_factory() as session:
+            (await session.execute(query)).all()
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickets", type=int, default=200000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, session_factory = await init_db(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        print(f"🌱 Seeding {args.tickets:,} tickets...")
+        await seed(session_factory, args.tickets)
+        
+        print(f"{'depth':>10} {'keyset':>12} {'offset':>12}")
+        for depth in (0, args.tickets // 10, args.tickets // 2, args.tickets - args.limit - 1):
+            # The cursor points just past row number ``depth`` (newest first)
+            position = args.tickets - depth
+            cursor = encode_cursor(datetime(2024, 1, 1) + timedelta(seconds=position), str(10 ** 17 + position))
+            keyset = build_ticket_query(GUILD_ID, args.limit, cursor=cursor if depth else None)
+            offset = build_ticket_query(GUILD_ID, args.limit).offset(depth)
+            
+            keyset_ms = await time_page(session_factory, keyset, args.repeat)
+            offset_ms = await time_page(session_factory, offset, args.repeat)
+            print(f"{depth:>10,} {keyset_ms:>10.2f}ms {offset_ms:>10.2f}ms")
+        
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
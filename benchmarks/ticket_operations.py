@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""Benchmark ticket operations and command handlers against fake Discord objects.
+
+Runs without a network: guilds, members and channels are fakes whose REST
+calls sleep for ``--latency`` milliseconds. Each scenario runs at every
+``--concurrency`` level and reports throughput, p50/p99 latency, DB
+statements per operation and errors the handlers logged rather than
+raised; ``--json`` writes the results for comparing runs.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute()))
+
+from benchmarks.fakes import FakeBot, FakeInteraction, FakeREST
+from database.instrumentation import get_query_instrumentation
+from database.models import Category, Guild, User, init_db
+from utils.logger import setup_logger
+
+SCENARIOS = ("create_ticket", "get_ticket", "claim_ticket", "/tickets", "/new", "close_ticket")
+
+
+class ErrorCounter(logging.Handler):
+    """Count error records, which the ticket manager logs instead of raising."""
+    
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.count = 0
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        self.count += 1
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Get a percentile of sorted values."""
+    if not values:
+        return 0.0
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+class TicketBenchmark:
+    """Seeded guilds plus the scenarios that drive them."""
+    
+    def __init__(self, bot: FakeBot, guilds: int, members: int):
+        self.bot = bot
+        self.guild_count = guilds
+        self.member_count = members
+        self.targets: List[Dict[str, Any]] = []
+        # Ticket channels created by the current run, consumed by claim and close
+        self.open_channels: List[Any] = []
+    
+    async def seed(self) -> None:
+        """Create guilds with a staff role, a category and members."""
+        async with self.bot.db_session_factory() as session:
+            for g in range(self.guild_count):
+                guild = self.bot.add_guild(f"Guild {g}")
+                staff_role = guild.add_role("Staff")
+                discord_category = guild.add_category("Tickets")
+                staff = guild.add_member(f"staff-{g}", [staff_role])
+                members = [guild.add_member(f"member-{g}-{m}") for m in range(self.member_count)]
+                
+                session.add(Guild(id=str(guild.id)))
+                category = Category(
+                    guild_id=str(guild.id), name="Support", description="Support tickets",
+                    channel_name="ticket-{number}", discord_category=str(discord_category.id),
+                    emoji="🎫", opening_message="Staff will be with you shortly.",
+                    staff_roles=json.dumps([str(staff_role.id)]), claiming=True,
+                )
+                session.add(category)
+                session.add(User(id=str(staff.id)))
+                for member in members:
+                    session.add(User(id=str(member.id)))
+                await session.flush()
+                
+                self.targets.append({"guild": guild, "category": category, "staff": staff, "members": members})
+            await session.commit()
+    
+    def target(self, i: int) -> Dict[str, Any]:
+        return self.targets[i % len(self.targets)]
+    
+    def member(self, i: int):
+        target = self.target(i)
+        return target["members"][(i // len(self.targets)) % len(target["members"])]
+    
+    async def create_ticket(self, i: int) -> bool:
+        target = self.target(i)
+        ticket = await self.bot.ticket_manager.create_ticket(target["guild"], target["category"], self.member(i))
+        if ticket is not None:
+            self.open_channels.append(target["guild"].get_channel(int(ticket.id)))
+        return ticket is not None
+    
+    async def get_ticket(self, i: int) -> bool:
+        channel = self.open_channels[i % len(self.open_channels)]
+        return await self.bot.ticket_manager.get_ticket(str(channel.id)) is not None
+    
+    async def claim_ticket(self, i: int) -> bool:
+        channel = self.open_channels[i]
+        staff = self.targets[self.bot.guilds.index(channel.guild)]["staff"]
+        return await self.bot.ticket_manager.claim_ticket(channel, staff)
+    
+    async def close_ticket(self, i: int) -> bool:
+        channel = self.open_channels[i]
+        staff = self.targets[self.bot.guilds.index(channel.guild)]["staff"]
+        return await self.bot.ticket_manager.close_ticket(channel, staff, "Benchmark")
+    
+    async def tickets_command(self, i: int) -> bool:
+        from bot.commands.tickets import TicketsCommand
+        
+        target = self.target(i)
+        interaction = FakeInteraction(self.bot, target["guild"], self.member(i))
+        await invoke(TicketsCommand(self.bot), "tickets", interaction)
+        return bool(interaction.sent)
+    
+    async def new_command(self, i: int) -> bool:
+        from bot.commands.new import NewCommand
+        from bot.interactions.components import TICKET_CREATE
+        from bot.interactions.router import make_custom_id
+        
+        # The command shows the category picker, then the member clicks it
+        target = self.target(i)
+        interaction = FakeInteraction(self.bot, target["guild"], self.member(i))
+        await invoke(NewCommand(self.bot), "new_ticket", interaction)
+        
+        custom_id = make_custom_id(TICKET_CREATE, target["category"].id)
+        click = FakeInteraction(self.bot, target["guild"], self.member(i), custom_id=custom_id)
+        await self.bot.components.dispatch(click)
+        return bool(interaction.sent) and bool(click.sent)
+    
+    def scenario(self, name: str) -> Callable[[int], Awaitable[bool]]:
+        return {
+            "create_ticket": self.create_ticket,
+            "get_ticket": self.get_ticket,
+            "claim_ticket": self.claim_ticket,
+            "close_ticket": self.close_ticket,
+            "/tickets": self.tickets_command,
+            "/new": self.new_command,
+        }[name]
+
+
+async def invoke(cog: Any, name: str, interaction: FakeInteraction) -> None:
+    """Call a slash command's callback directly, bypassing the command tree."""
+    command = getattr(type(cog), name)
+    callback = getattr(command, "callback", command)
+    await callback(cog, interaction)
+
+
+async def run_scenario(
+    operation: Callable[[int], Awaitable[bool]],
+    operations: int,
+    concurrency: int,
+    errors: ErrorCounter
+) -> Dict[str, Any]:
+    """Run ``operations`` calls with at most ``concurrency`` in flight."""
+    instrumentation = get_query_instrumentation()
+    errors.count = 0
+    latencies: List[float] = []
+    queries: List[int] = []
+    failures = 0
+    next_index = 0
+    
+    async def worker() -> None:
+        nonlocal failures, next_index
+        while next_index < operations:
+            i = next_index
+            next_index += 1
+            start = time.perf_counter()
+            with instrumentation.operation("benchmark") as trace:
+                ok = await operation(i)
+            latencies.append(time.perf_counter() - start)
+            queries.append(trace.queries)
+            if not ok:
+                failures += 1
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    
+    latencies.sort()
+    return {
+        "operations": operations,
+        "failures": failures,
+        "errors": errors.count,
+        "throughput": operations / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "queries_per_op": sum(queries) / len(queries) if queries else 0.0,
+    }
+
+
+def git_revision() -> Optional[str]:
+    """Get the current commit, if running from a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main() -> None:
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--db", choices=("file", "memory"), default="file",
+        help="SQLite database location; memory is a file in /dev/shm where available"
+    )
+    parser.add_argument("--latency", type=float, default=20.0, help="simulated Discord REST latency in ms")
+    parser.add_argument("--jitter", type=float, default=5.0, help="extra random REST latency in ms")
+    parser.add_argument("--concurrency", default="1,10,50", help="comma-separated concurrency levels")
+    parser.add_argument("--operations", type=int, default=200, help="operations per scenario and level")
+    parser.add_argument("--guilds", type=int, default=10)
+    parser.add_argument("--members", type=int, default=50, help="members per guild")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+    
+    setup_logger(level="WARNING")
+    errors = ErrorCounter()
+    logging.getLogger().addHandler(errors)
+    levels = [int(level) for level in args.concurrency.split(",")]
+    scenarios = [scenario for scenario in args.scenarios.split(",") if scenario]
+    
+    # Count statements per operation without logging them
+    instrumentation = get_query_instrumentation()
+    instrumentation.enabled = True
+    instrumentation.slow_query_ms = float("inf")
+    instrumentation.n_plus_one_threshold = 10 ** 9
+    
+    # An in-memory SQLite database is one connection that concurrent
+    # operations can't share, so "memory" is a file on tmpfs instead
+    directory = "/dev/shm" if args.db == "memory" and os.path.isdir("/dev/shm") else None
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        engine, session_factory = await init_db(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        bot = FakeBot(session_factory, FakeREST(args.latency / 1000, args.jitter / 1000))
+        benchmark = TicketBenchmark(bot, args.guilds, args.members)
+        await benchmark.seed()
+        
+        results: List[Dict[str, Any]] = []
+        print(
+            f"{'scenario':<14} {'conc':>5} {'ops/s':>9} {'p50 ms':>9} {'p99 ms':>9} "
+            f"{'queries':>8} {'failed':>7} {'errors':>7}"
+        )
+        for concurrency in levels:
+            benchmark.open_channels = []
+            for scenario in scenarios:
+                operations = args.operations
+                if scenario in ("get_ticket", "claim_ticket", "close_ticket") and not benchmark.open_channels:
+                    print(f"{scenario:<14} {concurrency:>5} skipped: needs create_ticket first")
+                    continue
+                if scenario in ("claim_ticket", "close_ticket"):
+                    operations = min(operations, len(benchmark.open_channels))
+                try:
+                    result = await run_scenario(benchmark.scenario(scenario), operations, concurrency, errors)
+                except ImportError as e:
+                    print(f"{scenario:<14} {concurrency:>5} skipped: {e}")
+                    continue
+                
+                results.append({"scenario": scenario, "concurrency": concurrency, **result})
+                print(
+                    f"{scenario:<14} {concurrency:>5} {result['throughput']:>9,.0f} {result['p50_ms']:>9.2f} "
+                    f"{result['p99_ms']:>9.2f} {result['queries_per_op']:>8.1f} {result['failures']:>7} {result['errors']:>7}"
+                )
+        
+        await engine.dispose()
+    
+    if args.json:
+        report = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": vars(args),
+            "rest_calls": dict(bot.rest.calls),
+            "results": results,
+        }
+        Path(args.json).write_text(json.dumps(report, indent=2))
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
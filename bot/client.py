@@ -1,7 +1,12 @@
 """Discord Tickets Bot Client."""
 
+import asyncio
+import importlib
+import json
 import os
-from typing import Optional
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Dict, Optional, TYPE_CHECKING
 
 import discord
 from discord.ext import commands
@@ -9,66 +14,188 @@ from ezcord import Bot
 
 from config.env import get_settings
 from utils.logger import get_bot_logger
-from database.models import init_db
-from bot.tickets.manager import TicketManager
+from bot.interactions.components import register_views
+from bot.interactions.router import ComponentRouter
+from bot.members import LEAN, MemberRoleCache, gateway_options
+from bot.sync import CommandSyncManager
+from utils.embed import EmbedTemplateCache
+from utils.i18n import get_i18n
+from utils.metrics import LoopLagMonitor, discord_trace_config, track_cache
+
+# SQLAlchemy and the models are imported during setup, off the import path
+if TYPE_CHECKING:
+    from api.ipc import IPCServer
+    from api.workers import APIWorkerPool
+    from bot.tickets.close_jobs import CloseJobWorker
+    from bot.tickets.log_channel import LogDispatcher
+    from bot.tickets.manager import TicketManager
+    from database.retention import ArchivePruner
+    from database.routing import SessionRouter
 
 
 class TicketsBot(Bot):
     """Main Discord Tickets Bot client."""
     
-    def __init__(self):
-        """Initialize the bot client."""
+    def __init__(self, **options: Any):
+        """Initialize the bot client; ``options`` go to the underlying client."""
         self.settings = get_settings()
         self.log = get_bot_logger()
         
-        # Setup intents
-        intents = discord.Intents.default()
-        intents.message_content = True
-        intents.guilds = True
-        intents.guild_members = True
-        intents.guild_messages = True
-        intents.direct_messages = True
-        intents.direct_message_reactions = True
-        intents.direct_message_typing = True
-        
-        # Add guild presences for non-public bots
-        if not self.settings.public_bot:
-            intents.guild_presences = True
+        # Intents and member caching depend on the member cache policy
+        intents, cache_options = gateway_options(self.settings.member_cache, self.settings.public_bot)
         
         super().__init__(
             command_prefix="!",  # Slash commands only, but required
             intents=intents,
             help_command=None,
-            case_insensitive=True
+            case_insensitive=True,
+            http_trace=discord_trace_config(),
+            **{**cache_options, **options}
         )
         
         # Initialize components
-        self.ticket_manager: Optional[TicketManager] = None
+        self.ticket_manager: Optional["TicketManager"] = None
+        self.close_jobs: Optional["CloseJobWorker"] = None
+        self.log_dispatcher: Optional["LogDispatcher"] = None
+        self.retention: Optional["ArchivePruner"] = None
+        self.embeds: Optional[EmbedTemplateCache] = None
+        self.members = MemberRoleCache(
+            self,
+            self.settings.member_cache,
+            self.settings.member_roles_ttl,
+            self.settings.member_roles_cache_size
+        )
         self.db_engine = None
         self.db_session_factory = None
+        self.db_replica_engine = None
+        self.db_router: Optional["SessionRouter"] = None
+        
+        # Buttons and selects, routed by custom ID; cogs add their handlers
+        self.components = ComponentRouter(self.settings.interaction_ack_budget)
+        register_views(self.components)
+        
+        # Dashboard API, either a task on this loop or worker processes
+        self.api_task: Optional[asyncio.Task] = None
+        self.api_workers: Optional["APIWorkerPool"] = None
+        self.ipc_server: Optional["IPCServer"] = None
+        
+        self.loop_lag = LoopLagMonitor()
+        
+        # Duration of each startup phase in seconds
+        self.startup_timings: Dict[str, float] = {}
         
     async def setup_hook(self) -> None:
         """Setup hook called when bot is starting."""
         self.log.base.info("Setting up bot...")
+        self.loop_lag.start()
         
-        # Initialize database
-        from database.models import init_db
-        self.db_engine, self.db_session_factory = await init_db(self.settings.db_connection_url or "sqlite+aiosqlite:///tickets.db")
+        # Database, locales and extensions don't depend on each other
+        start = time.perf_counter()
+        await asyncio.gather(
+            self._timed("database", self.init_database()),
+            self._timed("locales", asyncio.to_thread(get_i18n)),
+            self._timed("extensions", self.load_extensions()),
+        )
+        self.startup_timings["setup"] = time.perf_counter() - start
         
         # Initialize ticket manager
+        from bot.tickets.manager import TicketManager
         self.ticket_manager = TicketManager(self)
         
-        # Load extensions
-        await self.load_extensions()
+        # Finish closing tickets in the background, resuming unfinished closes
+        from bot.tickets.close_jobs import CloseJobWorker
+        self.close_jobs = CloseJobWorker(
+            self,
+            self.settings.close_workers,
+            self.settings.close_job_max_attempts,
+            self.settings.close_job_retry_delay,
+            guild_concurrency=self.settings.close_workers_per_guild
+        )
+        self.close_jobs.start()
+        
+        # Post ticket activity to log channels in batches
+        from bot.tickets.log_channel import LogDispatcher
+        self.log_dispatcher = LogDispatcher(
+            self,
+            self.settings.log_channel_flush_interval,
+            self.settings.log_channel_buffer_size
+        )
+        self.log_dispatcher.start()
+        
+        # Prune expired ticket archives on a schedule; in a cluster, the
+        # first cluster prunes for all of them
+        if not self.settings.cluster_id:
+            from database.retention import ArchivePruner
+            self.retention = ArchivePruner(
+                self.db_engine,
+                self.db_session_factory,
+                self.settings.archive_retention_days,
+                json.loads(self.settings.archive_retention_guilds),
+                self.settings.archive_retention_batch_size,
+                self.settings.archive_retention_pause,
+                self.settings.archive_retention_vacuum,
+                self.settings.archive_retention_interval * 3600
+            )
+            self.retention.start()
         
-        # Sync commands if enabled
-        if self.settings.publish_commands:
-            self.log.base.info("Syncing application commands...")
+        # Without a full member cache, keep the owners of open tickets
+        if self.settings.member_cache == LEAN:
             try:
-                await self.tree.sync()
-                self.log.base.info("Commands synced successfully")
+                await self._timed("members", self.members.load_open_tickets(self.db_session_factory))
+            except Exception as e:
+                self.log.base.error(f"Failed to load open ticket owners: {e}")
+        
+        # Initialize embed templates
+        self.embeds = EmbedTemplateCache(loader=self.ticket_manager.get_guild_settings)
+        track_cache("embed_templates", self.embeds)
+        
+        # Start the dashboard API
+        try:
+            await self._timed("api", self.start_api())
+        except Exception as e:
+            self.log.base.error(f"Failed to start API: {e}")
+        
+        # Sync commands if enabled and changed since the last sync; in a
+        # cluster, the first cluster syncs for all of them
+        if self.settings.publish_commands and not self.settings.cluster_id:
+            self.log.base.info("Checking application commands...")
+            try:
+                await CommandSyncManager(self, Path(self.settings.command_hash_file)).sync()
             except Exception as e:
                 self.log.base.error(f"Failed to sync commands: {e}")
+        
+        self.log.base.info(
+            "Startup timings: "
+            + ", ".join(f"{phase}={seconds * 1000:.0f}ms" for phase, seconds in self.startup_timings.items())
+        )
+    
+    async def _timed(self, phase: str, awaitable: Awaitable[Any]) -> Any:
+        """Await something and record how long it took as a startup phase."""
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.startup_timings[phase] = time.perf_counter() - start
+    
+    async def init_database(self) -> None:
+        """Connect to the database and create missing tables."""
+        # Import SQLAlchemy in a worker thread so it overlaps with other setup
+        models = await asyncio.to_thread(importlib.import_module, "database.models")
+        self.db_engine, self.db_session_factory = await models.init_db(
+            self.settings.db_connection_url or "sqlite+aiosqlite:///tickets.db",
+            self.settings
+        )
+        
+        # Read-only queries go to the replica, if there is one
+        routing = await asyncio.to_thread(importlib.import_module, "database.routing")
+        self.db_router = routing.SessionRouter(self.db_session_factory, fallback=self.settings.db_replica_fallback)
+        if self.settings.db_replica_url:
+            self.db_replica_engine, self.db_router.replica_factory = await routing.connect_replica(
+                self.settings.db_replica_url,
+                self.db_engine,
+                self.settings
+            )
+        self.db_router.start()
     
     async def load_extensions(self) -> None:
         """Load all bot extensions."""
@@ -76,20 +203,70 @@ class TicketsBot(Bot):
             "bot.commands.tickets",
             "bot.commands.new",
             "bot.commands.close",
+            "bot.commands.bulk_close",
             "bot.interactions.buttons.ticket_buttons",
         ]
         
-        for extension in extensions:
-            try:
-                await self.load_extension(extension)
+        # Warm the extensions' dependencies in worker threads, then register
+        # the cogs concurrently on the event loop
+        await asyncio.gather(
+            *(asyncio.to_thread(importlib.import_module, extension) for extension in extensions),
+            return_exceptions=True
+        )
+        results = await asyncio.gather(
+            *(self.load_extension(extension) for extension in extensions),
+            return_exceptions=True
+        )
+        
+        for extension, result in zip(extensions, results):
+            if isinstance(result, BaseException):
+                self.log.base.error(f"Failed to load extension {extension}: {result}")
+            else:
                 self.log.base.debug(f"Loaded extension: {extension}")
-            except Exception as e:
-                self.log.base.error(f"Failed to load extension {extension}: {e}")
+    
+    async def start_api(self) -> None:
+        """Serve the API from this loop, or from worker processes over IPC."""
+        from api.state import LocalBotState
+        
+        if self.settings.cluster_id is not None:
+            # The cluster supervisor serves the API and calls in over IPC
+            from api.ipc import IPCServer
+            from bot.cluster import cluster_socket_path
+            
+            self.ipc_server = IPCServer(
+                LocalBotState(self), cluster_socket_path(self.settings, self.settings.cluster_id)
+            )
+            await self.ipc_server.start()
+        elif self.settings.api_workers > 0:
+            from api.ipc import IPCServer
+            from api.workers import APIWorkerPool
+            
+            self.ipc_server = IPCServer(LocalBotState(self), self.settings.ipc_socket_path)
+            await self.ipc_server.start()
+            self.api_workers = APIWorkerPool(self.settings)
+            await self.api_workers.start()
+        else:
+            from api.server import TicketsAPI
+            
+            self.api_task = asyncio.create_task(TicketsAPI(self).start())
+    
+    async def stop_api(self) -> None:
+        """Stop the API and its worker processes."""
+        if self.api_task is not None:
+            self.api_task.cancel()
+            self.api_task = None
+        if self.api_workers is not None:
+            await self.api_workers.stop()
+            self.api_workers = None
+        if self.ipc_server is not None:
+            await self.ipc_server.close()
+            self.ipc_server = None
     
     async def on_ready(self) -> None:
         """Called when bot is ready."""
         self.log.base.info(f"Bot is ready! Logged in as {self.user}")
-        self.log.base.info(f"Serving {len(self.guilds)} guilds")
+        shards = f" on shards {self.shard_ids} of {self.shard_count}" if getattr(self, "shard_ids", None) else ""
+        self.log.base.info(f"Serving {len(self.guilds)} guilds{shards}")
         
         # Set status
         activity = discord.Activity(
@@ -98,6 +275,20 @@ class TicketsBot(Bot):
         )
         await self.change_presence(activity=activity, status=discord.Status.online)
     
+    async def on_interaction(self, interaction: discord.Interaction) -> None:
+        """Refresh the roles of kept members and route component interactions."""
+        self.members.observe(interaction.user)
+        await self.components.dispatch(interaction)
+    
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent) -> None:
+        """Forget members who leave a guild."""
+        self.members.forget(payload.guild_id, payload.user.id)
+    
+    async def on_message(self, message: discord.Message) -> None:
+        """Record ticket activity and stream ticket messages to the dashboard."""
+        if self.ticket_manager is not None:
+            await self.ticket_manager.handle_message(message)
+    
     async def on_error(self, event: str, *args, **kwargs) -> None:
         """Handle errors."""
         self.log.base.error(f"Error in event {event}", exc_info=True)
@@ -114,9 +305,51 @@ class TicketsBot(Bot):
         """Close the bot and cleanup resources."""
         self.log.base.info("Shutting down bot...")
         
-        # Close database engine
+        # Stop the API before the database it reads from
+        await self.stop_api()
+        await self.loop_lag.stop()
+        
+        # Stop close jobs before the database; they resume on the next start
+        if self.close_jobs is not None:
+            await self.close_jobs.stop()
+        if self.log_dispatcher is not None:
+            await self.log_dispatcher.stop()
+        if self.retention is not None:
+            await self.retention.stop()
+        if self.embeds is not None:
+            self.embeds.close()
+        
+        # Close database engines
+        if self.db_router is not None:
+            self.db_router.stop()
+        if self.db_replica_engine:
+            await self.db_replica_engine.dispose()
         if self.db_engine:
             await self.db_engine.dispose()
         
         await super().close()
-        self.log.base.info("Bot shutdown complete")
\ No newline at end of file
+        self.log.base.info("Bot shutdown complete")
+
+
+class ShardedTicketsBot(TicketsBot, commands.AutoShardedBot):
+    """Tickets bot running several shards in one process.
+    
+    ``AutoShardedBot`` comes after ``TicketsBot`` in the MRO, so its
+    gateway handling replaces the single-shard client's while everything
+    ``TicketsBot`` adds stays the same.
+    """
+
+
+def create_bot() -> TicketsBot:
+    """Create the bot, sharded when running in a cluster or with a fixed shard count."""
+    settings = get_settings()
+    if settings.cluster_shards is not None:
+        from bot.cluster import parse_shard_ids
+        
+        return ShardedTicketsBot(
+            shard_ids=parse_shard_ids(settings.cluster_shards),
+            shard_count=settings.shard_count
+        )
+    if settings.shard_count is not None:
+        return ShardedTicketsBot(shard_count=settings.shard_count)
+    return TicketsBot()
\ No newline at end of file
@@ -0,0 +1,283 @@
+"""Shard clusters: several gateway processes sharing one database.
+
+With ``CLUSTERS`` set, ``main.py`` runs a ``ClusterSupervisor`` instead of
+the bot. The supervisor splits the shards into contiguous ranges, spawns
+one bot process per range and talks to each over the IPC socket used by
+API workers. It serves the dashboard API itself, routing bot state calls
+to the cluster that owns the guild, and restarts clusters that exit.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from config.env import Settings
+from utils.logger import get_bot_logger
+from utils.metrics import get_registry
+
+if TYPE_CHECKING:
+    from api.ipc import IPCClient, IPCServer
+    from api.state import ClusterBotState
+    from api.workers import APIWorkerPool
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+DISCORD_GATEWAY_BOT_URL = "https://discord.com/api/v10/gateway/bot"
+
+# Restart delay doubles with each consecutive crash, up to this many seconds
+MAX_RESTART_DELAY = 60.0
+# A cluster that stays up this long is considered stable again
+STABLE_AFTER = 300.0
+
+CLUSTER_UP = get_registry().gauge(
+    "tickets_cluster_up",
+    "Whether a shard cluster process is running and ready.",
+    ["cluster"],
+)
+CLUSTER_RESTARTS = get_registry().counter(
+    "tickets_cluster_restarts",
+    "Shard cluster processes restarted after exiting.",
+    ["cluster"],
+)
+
+
+def shard_for_guild(guild_id: int, shard_count: int) -> int:
+    """Get the shard Discord delivers a guild's events on."""
+    return (int(guild_id) >> 22) % shard_count
+
+
+def parse_shard_ids(value: str) -> List[int]:
+    """Parse shard IDs like ``0-3,8`` into a list."""
+    shard_ids: List[int] = []
+    for part in value.split(","):
+        if "-" in part:
+            first, last = part.split("-")
+            shard_ids.extend(range(int(first), int(last) + 1))
+        elif part.strip():
+            shard_ids.append(int(part))
+    return shard_ids
+
+
+def format_shard_ids(shard_ids: List[int]) -> str:
+    """Format a contiguous range of shard IDs like ``0-3``."""
+    return f"{shard_ids[0]}-{shard_ids[-1]}" if len(shard_ids) > 1 else str(shard_ids[0])
+
+
+def cluster_socket_path(settings: Settings, cluster_id: int) -> str:
+    """Get the IPC socket a cluster process listens on."""
+    return os.path.join(settings.cluster_socket_dir, f"cluster-{cluster_id}.sock")
+
+
+class ShardMap:
+    """Which cluster runs which shards, and so which guilds."""
+    
+    def __init__(self, shard_count: int, clusters: int):
+        """Split ``shard_count`` shards into ``clusters`` contiguous ranges."""
+        if not 0 < clusters <= shard_count:
+            raise ValueError(f"Can't split {shard_count} shards into {clusters} clusters")
+        self.shard_count = shard_count
+        self.clusters = clusters
+        self._cluster_of_shard = [
+            cluster_id for cluster_id in range(clusters) for _ in self.shard_ids(cluster_id)
+        ]
+    
+    def shard_ids(self, cluster_id: int) -> List[int]:
+        """Get the shards a cluster runs; earlier clusters take any remainder."""
+        size, remainder = divmod(self.shard_count, self.clusters)
+        start = cluster_id * size + min(cluster_id, remainder)
+        return list(range(start, start + size + (cluster_id < remainder)))
+    
+    def cluster_for_guild(self, guild_id: int) -> int:
+        """Get the cluster whose shards receive a guild's events."""
+        return self._cluster_of_shard[shard_for_guild(guild_id, self.shard_count)]
+
+
+async def recommended_shard_count(token: str) -> int:
+    """Ask Discord how many shards the bot should use."""
+    import aiohttp
+    
+    async with aiohttp.ClientSession() as session:
+        async with session.get(DISCORD_GATEWAY_BOT_URL, headers={"Authorization": f"Bot {token}"}) as response:
+            response.raise_for_status()
+            return (await response.json())["shards"]
+
+
+class ClusterProcess:
+    """One bot process running a range of shards."""
+    
+    def __init__(self, cluster_id: int, shard_ids: List[int], client: "IPCClient"):
+        """Initialize the cluster."""
+        self.id = cluster_id
+        self.shard_ids = shard_ids
+        self.client = client
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.started_at = 0.0
+        # When an exited cluster is due to be restarted
+        self.restart_at = 0.0
+        self.restarts = 0
+        self.crashes = 0
+        self.status: Dict = {"ready": False}
+    
+    @property
+    def running(self) -> bool:
+        """Check whether the process is alive."""
+        return self.process is not None and self.process.returncode is None
+    
+    @property
+    def restart_delay(self) -> float:
+        """Seconds to wait before restarting after consecutive crashes."""
+        return min(2.0 ** self.crashes, MAX_RESTART_DELAY) if self.crashes else 0.0
+
+
+class ClusterSupervisor:
+    """Spawn shard clusters, watch their health and serve the API for them."""
+    
+    def __init__(self, settings: Settings):
+        """Initialize the supervisor."""
+        self.settings = settings
+        self.log = get_bot_logger().base
+        self.shard_map: Optional[ShardMap] = None
+        self.clusters: List[ClusterProcess] = []
+        self.state: Optional["ClusterBotState"] = None
+        
+        self.api_task: Optional[asyncio.Task] = None
+        self.api_workers: Optional["APIWorkerPool"] = None
+        self.ipc_server: Optional["IPCServer"] = None
+    
+    def command(self) -> List[str]:
+        """Build the command line of a cluster process."""
+        return [sys.executable, str(PROJECT_ROOT / "main.py")]
+    
+    def environment(self, cluster: ClusterProcess) -> Dict[str, str]:
+        """Build the environment of a cluster process, on top of our own."""
+        env = dict(os.environ)
+        env.update({
+            "CLUSTERS": str(self.shard_map.clusters),
+            "CLUSTER_ID": str(cluster.id),
+            "CLUSTER_SHARDS": format_shard_ids(cluster.shard_ids),
+            "SHARD_COUNT": str(self.shard_map.shard_count),
+            "CLUSTER_SOCKET_DIR": self.settings.cluster_socket_dir,
+        })
+        return env
+    
+    async def start(self) -> None:
+        """Work out the shards, spawn every cluster and start the API."""
+        from api.ipc import IPCClient
+        from api.state import ClusterBotState
+        
+        shard_count = self.settings.shard_count or await recommended_shard_count(self.settings.discord_token)
+        clusters = min(self.settings.clusters, shard_count)
+        self.shard_map = ShardMap(shard_count, clusters)
+        os.makedirs(self.settings.cluster_socket_dir, mode=0o700, exist_ok=True)
+        
+        for cluster_id in range(clusters):
+            client = IPCClient(cluster_socket_path(self.settings, cluster_id))
+            self.clusters.append(ClusterProcess(cluster_id, self.shard_map.shard_ids(cluster_id), client))
+        await asyncio.gather(*(self.spawn(cluster) for cluster in self.clusters))
+        self.log.info(f"Started {clusters} cluster(s) over {shard_count} shard(s)")
+        
+        self.state = ClusterBotState(self.shard_map, [cluster.client for cluster in self.clusters])
+        try:
+            await self.start_api()
+        except Exception as e:
+            self.log.error(f"Failed to start API: {e}")
+    
+    async def spawn(self, cluster: ClusterProcess) -> None:
+        """Start a cluster's process."""
+        cluster.process = await asyncio.create_subprocess_exec(
+            *self.command(), env=self.environment(cluster), cwd=os.getcwd()
+        )
+        cluster.started_at = time.monotonic()
+        cluster.status = {"ready": False}
+        self.log.info(
+            f"Cluster {cluster.id} running shards {format_shard_ids(cluster.shard_ids)} (pid {cluster.process.pid})"
+        )
+    
+    async def start_api(self) -> None:
+        """Serve the API here, or from worker processes over IPC."""
+        if self.settings.api_workers > 0:
+            from api.ipc import IPCServer
+            from api.workers import APIWorkerPool
+            
+            self.ipc_server = IPCServer(self.state, self.settings.ipc_socket_path)
+            await self.ipc_server.start()
+            await self.state.start()
+            self.api_workers = APIWorkerPool(self.settings)
+            await self.api_workers.start()
+        else:
+            from api.server import TicketsAPI
+            
+            self.api_task = asyncio.create_task(TicketsAPI(None, self.state).start())
+    
+    async def check(self, cluster: ClusterProcess) -> None:
+        """Restart a cluster that exited once its delay is up, or refresh its status."""
+        from api.ipc import IPCError
+        
+        if not cluster.running:
+            if cluster.process is not None and cluster.started_at:
+                uptime = time.monotonic() - cluster.started_at
+                cluster.crashes = 0 if uptime >= STABLE_AFTER else cluster.crashes + 1
+                self.log.warning(
+                    f"Cluster {cluster.id} exited with code {cluster.process.returncode} "
+                    f"after {uptime:.0f}s, restarting in {cluster.restart_delay:.0f}s"
+                )
+                cluster.started_at = 0.0
+                cluster.restart_at = time.monotonic() + cluster.restart_delay
+            CLUSTER_UP.labels(str(cluster.id)).set(0)
+            # Waiting here would hold up the other clusters' checks
+            if time.monotonic() < cluster.restart_at:
+                return
+            cluster.restarts += 1
+            CLUSTER_RESTARTS.labels(str(cluster.id)).inc()
+            await self.spawn(cluster)
+            return
+        
+        try:
+            cluster.status = await cluster.client.call("status")
+        except IPCError as e:
+            cluster.status = {"ready": False, "error": str(e)}
+        CLUSTER_UP.labels(str(cluster.id)).set(1 if cluster.status.get("ready") else 0)
+    
+    async def monitor(self) -> None:
+        """Check every cluster each ``cluster_health_interval`` seconds."""
+        while True:
+            await asyncio.sleep(self.settings.cluster_health_interval)
+            await asyncio.gather(*(self.check(cluster) for cluster in self.clusters))
+            ready = sum(1 for cluster in self.clusters if cluster.status.get("ready"))
+            if ready < len(self.clusters):
+                self.log.warning(f"{ready}/{len(self.clusters)} clusters ready")
+    
+    async def run(self) -> None:
+        """Start the clusters and supervise them until cancelled."""
+        try:
+            await self.start()
+            await self.monitor()
+        finally:
+            await self.stop()
+    
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop the API and every cluster, killing those that don't exit in time."""
+        if self.api_task is not None:
+            self.api_task.cancel()
+            self.api_task = None
+        if self.api_workers is not None:
+            await self.api_workers.stop()
+            self.api_workers = None
+        if self.ipc_server is not None:
+            await self.ipc_server.close()
+            self.ipc_server = None
+        if self.state is not None:
+            await self.state.close()
+        
+        running = [cluster for cluster in self.clusters if cluster.running]
+        for cluster in running:
+            cluster.process.terminate()
+        for cluster in running:
+            try:
+                await asyncio.wait_for(cluster.process.wait(), timeout)
+            except asyncio.TimeoutError:
+                self.log.warning(f"Cluster {cluster.id} did not exit in time, killing it")
+                cluster.process.kill()
+                await cluster.process.wait()
\ No newline at end of file
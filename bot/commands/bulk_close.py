@@ -0,0 +1,149 @@
+"""Bulk close command - Close stale tickets, or a category's tickets, at once."""
+
+import asyncio
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional, Set
+
+import discord
+from discord.ext import commands
+from discord import app_commands
+
+from bot.tickets.close_jobs import batch_progress
+from database.instrumentation import traced
+from utils.embed import ExtendedEmbedBuilder
+from utils.metrics import INTERACTION_SECONDS, timed
+
+# How often the reply is updated, and for how long; interaction tokens last 15 minutes
+PROGRESS_INTERVAL = 5.0
+PROGRESS_TIMEOUT = 14 * 60.0
+
+
+class BulkCloseCommand(commands.Cog):
+    """Bulk close command for administrators."""
+    
+    def __init__(self, bot):
+        self.bot = bot
+        self.log = bot.log.commands
+        self._reports: Set[asyncio.Task] = set()
+    
+    def cog_unload(self) -> None:
+        """Stop updating progress replies."""
+        for task in self._reports:
+            task.cancel()
+    
+    @app_commands.command(name="bulk-close", description="Close stale tickets, or every ticket in a category")
+    @app_commands.describe(
+        stale_after="Close tickets without messages for this many hours (defaults to the guild's stale setting)",
+        category="ID of a category to close every open ticket of",
+        reason="Reason for closing the tickets"
+    )
+    @app_commands.default_permissions(administrator=True)
+    @timed(INTERACTION_SECONDS, "command", "bulk-close")
+    @traced("command:bulk-close")
+    async def bulk_close(
+        self,
+        interaction: discord.Interaction,
+        stale_after: Optional[app_commands.Range[int, 1, None]] = None,
+        category: Optional[int] = None,
+        reason: str = "Stale"
+    ) -> None:
+        """Bulk close tickets."""
+        await interaction.response.defer(ephemeral=True)
+        
+        try:
+            guild_id = str(interaction.guild.id)
+            if not interaction.user.guild_permissions.administrator:
+                embed = await self.bot.embeds.get(
+                    guild_id,
+                    "permission_denied",
+                    description="Only administrators can bulk close tickets."
+                )
+                
+                await interaction.followup.send(embed=embed, ephemeral=True)
+                return
+            
+            # Without options, close what the guild's stale setting considers stale
+            idle: Optional[timedelta] = None
+            if stale_after is not None:
+                idle = timedelta(hours=stale_after)
+            elif category is None:
+                guild_settings = await self.bot.ticket_manager.get_guild_settings(guild_id)
+                if guild_settings and guild_settings.stale_after:
+                    idle = timedelta(milliseconds=guild_settings.stale_after)
+            if idle is None and category is None:
+                await interaction.followup.send(
+                    "❌ Set `stale_after` or `category`; this server has no stale setting.",
+                    ephemeral=True
+                )
+                return
+            
+            result = await self.bot.ticket_manager.bulk_close(
+                guild_id,
+                str(interaction.user.id),
+                reason,
+                idle,
+                category
+            )
+            if result is None:
+                await interaction.followup.send("❌ Failed to close the tickets!", ephemeral=True)
+                return
+            
+            await interaction.followup.send(embed=self.progress_embed(result["tickets"], result["tickets"], 0))
+            self.log.info(f"{interaction.user} bulk closed {result['tickets']} tickets - Reason: {reason}")
+            
+            if result["tickets"]:
+                task = asyncio.create_task(self.report_progress(interaction, guild_id, result))
+                self._reports.add(task)
+                task.add_done_callback(self._reports.discard)
+        
+        except Exception as e:
+            self.log.error(f"Error in bulk-close command: {e}")
+            
+            error_embed = await self.bot.embeds.get(
+                str(interaction.guild.id),
+                "error",
+                description="An error occurred while closing the tickets."
+            )
+            
+            await interaction.followup.send(embed=error_embed, ephemeral=True)
+    
+    async def report_progress(self, interaction: discord.Interaction, guild_id: str, result: Dict[str, Any]) -> None:
+        """Update the reply as the tickets' channels are archived and deleted."""
+        deadline = time.monotonic() + PROGRESS_TIMEOUT
+        try:
+            while time.monotonic() < deadline:
+                await asyncio.sleep(PROGRESS_INTERVAL)
+                async with self.bot.db_router.read(guild_id) as session:
+                    progress = await batch_progress(session, guild_id, result["batch"])
+                await interaction.edit_original_response(
+                    embed=self.progress_embed(result["tickets"], progress["pending"], progress["failed"])
+                )
+                if not progress["pending"]:
+                    return
+        except Exception as e:
+            self.log.error(f"Error reporting bulk close progress: {e}")
+    
+    def progress_embed(self, total: int, pending: int, failed: int) -> discord.Embed:
+        """Build the bulk close progress embed."""
+        embed = ExtendedEmbedBuilder()
+        if not total:
+            embed.set_title("No tickets to close")
+            embed.set_description("No open tickets matched.")
+            return embed
+        
+        done = total - pending - failed
+        if pending:
+            embed.set_warning_color()
+        else:
+            embed.set_success_color()
+        embed.set_title(f"Closed {total} tickets")
+        embed.set_description(f"Archived and deleted {done} of {total} ticket channels.")
+        if failed:
+            embed.add_field(name="Failed", value=str(failed), inline=True)
+        return embed
+
+
+async def setup(bot):
+    """Setup the cog."""
+    await bot.add_cog(BulkCloseCommand(bot))
\ No newline at end of file
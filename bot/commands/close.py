@@ -4,7 +4,9 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 
+from database.instrumentation import traced
 from utils.embed import ExtendedEmbedBuilder
+from utils.metrics import INTERACTION_SECONDS, timed
 from utils.users import is_staff
 
 
@@ -17,6 +19,8 @@ class CloseCommand(commands.Cog):
     
     @app_commands.command(name="close", description="Close a ticket")
     @app_commands.describe(reason="Reason for closing the ticket")
+    @timed(INTERACTION_SECONDS, "command", "close")
+    @traced("command:close")
     async def close_ticket(
         self, 
         interaction: discord.Interaction,
@@ -29,10 +33,11 @@ class CloseCommand(commands.Cog):
             # Check if this is a ticket channel
             ticket = await self.bot.ticket_manager.get_ticket(str(interaction.channel.id))
             if not ticket:
-                embed = ExtendedEmbedBuilder()
-                embed.set_error_color()
-                embed.set_title("Not a Ticket")
-                embed.set_description("This command can only be used in ticket channels.")
+                embed = await self.bot.embeds.get(
+                    str(interaction.guild.id),
+                    "not_ticket",
+                    description="This command can only be used in ticket channels."
+                )
                 
                 await interaction.followup.send(embed=embed, ephemeral=True)
                 return
@@ -42,20 +47,21 @@ class CloseCommand(commands.Cog):
             user_is_staff = await is_staff(interaction.user, category=ticket.category)
             
             if not user_is_creator and not user_is_staff:
-                embed = ExtendedEmbedBuilder()
-                embed.set_error_color()
-                embed.set_title("Permission Denied")
-                embed.set_description("Only the ticket creator or staff can close tickets.")
+                embed = await self.bot.embeds.get(
+                    str(interaction.guild.id),
+                    "permission_denied",
+                    description="Only the ticket creator or staff can close tickets."
+                )
                 
                 await interaction.followup.send(embed=embed, ephemeral=True)
                 return
             
+            if user_is_staff:
+                self.bot.members.keep_staff(interaction.user)
+            
             # Check if ticket is already closed
             if not ticket.open:
-                embed = ExtendedEmbedBuilder()
-                embed.set_error_color()
-                embed.set_title("Already Closed")
-                embed.set_description("This ticket is already closed.")
+                embed = await self.bot.embeds.get(str(interaction.guild.id), "already_closed")
                 
                 await interaction.followup.send(embed=embed, ephemeral=True)
                 return
@@ -70,7 +76,7 @@ class CloseCommand(commands.Cog):
             
             await interaction.followup.send(embed=embed)
             
-            # Close the ticket
+            # Close the ticket; archiving and deleting the channel happen in the background
             success = await self.bot.ticket_manager.close_ticket(
                 interaction.channel,
                 interaction.user,
@@ -85,10 +91,11 @@ class CloseCommand(commands.Cog):
         except Exception as e:
             self.log.error(f"Error in close command: {e}")
             
-            error_embed = ExtendedEmbedBuilder()
-            error_embed.set_error_color()
-            error_embed.set_title("Error")
-            error_embed.set_description("An error occurred while closing the ticket.")
+            error_embed = await self.bot.embeds.get(
+                str(interaction.guild.id),
+                "error",
+                description="An error occurred while closing the ticket."
+            )
             
             await interaction.followup.send(embed=error_embed, ephemeral=True)
 
@@ -6,8 +6,10 @@ from discord import app_commands
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
+from database.instrumentation import traced
 from database.models import Ticket, Category
 from utils.embed import ExtendedEmbedBuilder
+from utils.metrics import INTERACTION_SECONDS, timed
 
 
 class TicketsCommand(commands.Cog):
@@ -18,13 +20,15 @@ class TicketsCommand(commands.Cog):
         self.log = bot.log.commands
     
     @app_commands.command(name="tickets", description="List your tickets")
+    @timed(INTERACTION_SECONDS, "command", "tickets")
+    @traced("command:tickets")
     async def tickets(self, interaction: discord.Interaction) -> None:
         """List user's tickets."""
         await interaction.response.defer(ephemeral=True)
         
         try:
-            # Get user's tickets
-            async with self.bot.db_session_factory() as session:
+            # Get user's tickets; a read, so it may go to the replica
+            async with self.bot.db_router.read(str(interaction.guild.id)) as session:
                 # Get open tickets
                 open_result = await session.execute(
                     select(Ticket)
@@ -111,10 +115,11 @@ class TicketsCommand(commands.Cog):
         except Exception as e:
             self.log.error(f"Error in tickets command: {e}")
             
-            error_embed = ExtendedEmbedBuilder()
-            error_embed.set_error_color()
-            error_embed.set_title("Error")
-            error_embed.set_description("An error occurred while fetching your tickets.")
+            error_embed = await self.bot.embeds.get(
+                str(interaction.guild.id),
+                "error",
+                description="An error occurred while fetching your tickets."
+            )
             
             await interaction.followup.send(embed=error_embed, ephemeral=True)
 
@@ -1,8 +1,9 @@
 """Button interactions for ticket management."""
 
-import discord
 from discord.ext import commands
 
+from bot.interactions.components import LEGACY_ALIASES, TICKET_CLAIM, TICKET_CLOSE, TICKET_EDIT
+from bot.interactions.responder import InteractionResponder
 from utils.embed import ExtendedEmbedBuilder
 
 
@@ -12,39 +13,36 @@ class TicketButtons(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.log = bot.log.buttons
-    
-    @commands.Cog.listener()
-    async def on_interaction(self, interaction: discord.Interaction):
-        """Handle button interactions."""
-        if interaction.type != discord.InteractionType.component:
-            return
-        
-        custom_id = interaction.data.get("custom_id")
-        if not custom_id:
-            return
         
-        # Handle ticket button interactions
-        if custom_id == "ticket_claim":
-            await self.handle_claim(interaction)
-        elif custom_id == "ticket_close":
-            await self.handle_close(interaction)
-        elif custom_id == "ticket_edit":
-            await self.handle_edit(interaction)
+        # Buttons on older opening messages still use the legacy custom IDs
+        for action, handler in (
+            (TICKET_CLAIM, self.handle_claim),
+            (TICKET_CLOSE, self.handle_close),
+            (TICKET_EDIT, self.handle_edit),
+        ):
+            bot.components.add(action, handler, aliases=LEGACY_ALIASES[action])
     
-    async def handle_claim(self, interaction: discord.Interaction):
+    def cog_unload(self) -> None:
+        """Stop routing the cog's components."""
+        for action in LEGACY_ALIASES:
+            self.bot.components.remove(action)
+    
+    async def handle_claim(self, responder: InteractionResponder):
         """Handle ticket claim button."""
+        interaction = responder.interaction
+        
         try:
             # Check if user can claim tickets (has staff role)
             ticket = await self.bot.ticket_manager.get_ticket(str(interaction.channel.id))
             if not ticket:
-                await interaction.response.send_message(
+                await responder.send(
                     "❌ This is not a ticket channel!", ephemeral=True
                 )
                 return
             
             # Check if already claimed
             if ticket.claimed_by_id:
-                await interaction.response.send_message(
+                await responder.send(
                     "❌ This ticket is already claimed!", ephemeral=True
                 )
                 return
@@ -58,30 +56,33 @@ class TicketButtons(commands.Cog):
             )
             
             if success:
-                embed = ExtendedEmbedBuilder()
-                embed.set_success_color()
-                embed.set_title("Ticket Claimed")
-                embed.set_description(f"Ticket claimed by {interaction.user.mention}")
+                embed = await self.bot.embeds.get(
+                    str(interaction.guild.id),
+                    "ticket_claimed",
+                    user=interaction.user.mention
+                )
                 
-                await interaction.response.send_message(embed=embed)
+                await responder.send(embed=embed)
                 self.log.info(f"Ticket {ticket.id} claimed by {interaction.user}")
             else:
-                await interaction.response.send_message(
+                await responder.send(
                     "❌ Failed to claim ticket!", ephemeral=True
                 )
         
         except Exception as e:
             self.log.error(f"Error handling claim: {e}")
-            await interaction.response.send_message(
+            await responder.send(
                 "❌ An error occurred!", ephemeral=True
             )
     
-    async def handle_close(self, interaction: discord.Interaction):
+    async def handle_close(self, responder: InteractionResponder):
         """Handle ticket close button."""
+        interaction = responder.interaction
+        
         try:
             ticket = await self.bot.ticket_manager.get_ticket(str(interaction.channel.id))
             if not ticket:
-                await interaction.response.send_message(
+                await responder.send(
                     "❌ This is not a ticket channel!", ephemeral=True
                 )
                 return
@@ -94,11 +95,9 @@ class TicketButtons(commands.Cog):
             embed.set_title("Closing Ticket")
             embed.set_description("This ticket will be closed in a few seconds...")
             
-            await interaction.response.send_message(embed=embed)
-            
-            # Close after a short delay
-            await interaction.followup.send("Closing ticket...")
+            await responder.send(embed=embed)
             
+            # Archiving and deleting the channel happen in the background
             success = await self.bot.ticket_manager.close_ticket(
                 interaction.channel,
                 interaction.user,
@@ -108,25 +107,25 @@ class TicketButtons(commands.Cog):
             if success:
                 self.log.info(f"Ticket {ticket.id} closed by {interaction.user}")
             else:
-                await interaction.followup.send("❌ Failed to close ticket!")
+                await responder.send("❌ Failed to close ticket!")
         
         except Exception as e:
             self.log.error(f"Error handling close: {e}")
-            await interaction.response.send_message(
+            await responder.send(
                 "❌ An error occurred!", ephemeral=True
             )
     
-    async def handle_edit(self, interaction: discord.Interaction):
+    async def handle_edit(self, responder: InteractionResponder):
         """Handle ticket edit button."""
         try:
             # TODO: Implement ticket editing (topic, questions)
-            await interaction.response.send_message(
+            await responder.send(
                 "✏️ Ticket editing is not implemented yet!", ephemeral=True
             )
         
         except Exception as e:
             self.log.error(f"Error handling edit: {e}")
-            await interaction.response.send_message(
+            await responder.send(
                 "❌ An error occurred!", ephemeral=True
             )
 
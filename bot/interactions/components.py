@@ -0,0 +1,79 @@
+"""Custom IDs and shared views of the bot's buttons and selects."""
+
+from typing import Sequence
+
+import discord
+
+from bot.interactions.router import ComponentRouter, RoutedButton, RoutedSelect, make_custom_id
+
+TICKET_CLAIM = "ticket.claim"
+TICKET_CLOSE = "ticket.close"
+TICKET_EDIT = "ticket.edit"
+TICKET_CREATE = "ticket.create"
+
+# Custom IDs on messages sent before routing, still handled
+LEGACY_ALIASES = {
+    TICKET_CLAIM: ("ticket_claim",),
+    TICKET_CLOSE: ("ticket_close",),
+    TICKET_EDIT: ("ticket_edit",),
+}
+
+TICKET_ACTIONS_VIEW = "ticket_actions"
+TICKET_ACTIONS_CLAIMABLE_VIEW = "ticket_actions_claimable"
+
+
+def ticket_actions_view(claiming: bool) -> discord.ui.View:
+    """Build the buttons of a ticket's opening message."""
+    view = discord.ui.View(timeout=None)
+    if claiming:
+        view.add_item(RoutedButton(
+            style=discord.ButtonStyle.primary,
+            label="Claim",
+            emoji="🙋‍♂️",
+            custom_id=TICKET_CLAIM
+        ))
+    view.add_item(RoutedButton(
+        style=discord.ButtonStyle.danger,
+        label="Close",
+        emoji="🔒",
+        custom_id=TICKET_CLOSE
+    ))
+    return view
+
+
+def register_views(router: ComponentRouter) -> None:
+    """Register the views shared by every ticket."""
+    router.add_view(TICKET_ACTIONS_VIEW, lambda: ticket_actions_view(claiming=False))
+    router.add_view(TICKET_ACTIONS_CLAIMABLE_VIEW, lambda: ticket_actions_view(claiming=True))
+
+
+def new_ticket_view(categories: Sequence) -> discord.ui.View:
+    """Build the category picker shown by ``/new``."""
+    view = discord.ui.View(timeout=None)
+    
+    # Single category, just show a button
+    if len(categories) == 1:
+        view.add_item(RoutedButton(
+            style=discord.ButtonStyle.primary,
+            label=f"Create {categories[0].name} Ticket",
+            emoji="🎫",
+            custom_id=make_custom_id(TICKET_CREATE, categories[0].id)
+        ))
+        return view
+    
+    options = []
+    for category in categories[:25]:  # Discord limit
+        options.append(discord.SelectOption(
+            label=category.name,
+            description=category.description[:100],
+            value=str(category.id),
+            emoji=category.emoji if category.emoji else None
+        ))
+    view.add_item(RoutedSelect(
+        placeholder="Choose a ticket category...",
+        min_values=1,
+        max_values=1,
+        options=options,
+        custom_id=TICKET_CREATE
+    ))
+    return view
\ No newline at end of file
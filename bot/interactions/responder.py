@@ -0,0 +1,96 @@
+"""Acknowledging interactions within Discord's deadline."""
+
+import asyncio
+import time
+from typing import Any, Optional
+
+import discord
+
+from utils.metrics import (
+    INTERACTION_ACK_SECONDS, INTERACTION_AUTO_DEFERRED, INTERACTION_DEADLINES_MISSED, INTERACTION_SECONDS
+)
+
+# Discord fails an interaction that isn't acknowledged within this many seconds
+ACK_DEADLINE = 3.0
+
+
+class InteractionResponder:
+    """Reply to an interaction, deferring it when the handler runs out of time.
+    
+    Handlers reply through ``send``: the first reply is the interaction's
+    response and later ones are followups, so an error path can always
+    reply. If nothing has replied ``budget`` seconds after the handler
+    started, the interaction is deferred and the eventual reply goes out
+    as a followup. Time to acknowledge and time to complete are recorded
+    per handler, along with acknowledgements that missed the deadline.
+    """
+    
+    def __init__(self, interaction: discord.Interaction, kind: str, name: str, budget: float = 2.0):
+        """Initialize the responder."""
+        self.interaction = interaction
+        self.kind = kind
+        self.name = name
+        self.budget = budget
+        
+        self.started = time.perf_counter()
+        self.acknowledged_at: Optional[float] = None
+        self.auto_deferred = False
+        self._lock = asyncio.Lock()
+        self._watchdog: Optional[asyncio.Task] = None
+    
+    @property
+    def acknowledged(self) -> bool:
+        """Check whether the interaction has been responded to."""
+        return self.acknowledged_at is not None or self.interaction.response.is_done()
+    
+    @property
+    def ack_seconds(self) -> Optional[float]:
+        """Seconds from the handler starting to the interaction being acknowledged."""
+        return self.acknowledged_at - self.started if self.acknowledged_at is not None else None
+    
+    @property
+    def missed_deadline(self) -> bool:
+        """Check whether the interaction was acknowledged too late, or not at all."""
+        if self.acknowledged_at is None:
+            return not self.interaction.response.is_done()
+        return self.ack_seconds > ACK_DEADLINE
+    
+    async def __aenter__(self) -> "InteractionResponder":
+        self._watchdog = asyncio.create_task(self._defer_at_budget())
+        return self
+    
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._watchdog.cancel()
+        INTERACTION_SECONDS.labels(self.kind, self.name).observe(time.perf_counter() - self.started)
+        if self.missed_deadline:
+            INTERACTION_DEADLINES_MISSED.labels(self.kind, self.name).inc()
+    
+    async def _defer_at_budget(self) -> None:
+        """Defer the interaction if the handler hasn't replied within the budget."""
+        await asyncio.sleep(self.budget)
+        try:
+            if await self._acknowledge(self.interaction.response.defer):
+                self.auto_deferred = True
+                INTERACTION_AUTO_DEFERRED.labels(self.kind, self.name).inc()
+        except discord.HTTPException:
+            # Too late to defer; the handler's reply reports its own error
+            pass
+    
+    async def _acknowledge(self, respond, *args: Any, **kwargs: Any) -> bool:
+        """Respond to the interaction unless something already has."""
+        async with self._lock:
+            if self.acknowledged:
+                return False
+            await respond(*args, **kwargs)
+            self.acknowledged_at = time.perf_counter()
+            INTERACTION_ACK_SECONDS.labels(self.kind, self.name).observe(self.ack_seconds)
+            return True
+    
+    async def defer(self, ephemeral: bool = False, thinking: bool = False) -> None:
+        """Acknowledge the interaction now and reply with followups later."""
+        await self._acknowledge(self.interaction.response.defer, ephemeral=ephemeral, thinking=thinking)
+    
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> None:
+        """Reply as the response if nothing has acknowledged the interaction, otherwise as a followup."""
+        if not await self._acknowledge(self.interaction.response.send_message, content, **kwargs):
+            await self.interaction.followup.send(content, **kwargs)
\ No newline at end of file
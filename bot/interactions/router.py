@@ -0,0 +1,154 @@
+"""Component interaction routing by structured custom IDs.
+
+Buttons and selects carry a ``custom_id`` of the form ``action:arg:...``.
+One ``on_interaction`` listener parses it and looks the action up in a
+dict, so handling a click doesn't depend on how many handlers or open
+tickets there are. Messages are sent with views built once at startup,
+from items the library never stores per message: the router dispatches
+their interactions instead, so nothing accumulates as tickets are opened.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import discord
+
+from bot.interactions.responder import InteractionResponder
+from database.instrumentation import get_query_instrumentation
+
+SEPARATOR = ":"
+# Discord's limit on custom_id length
+MAX_CUSTOM_ID_LENGTH = 100
+
+# The component type of buttons in interaction data; the others are selects
+BUTTON_COMPONENT_TYPE = 2
+
+Handler = Callable[..., Awaitable[Any]]
+
+
+def make_custom_id(action: str, *args: Any) -> str:
+    """Build a custom ID for an action and its arguments."""
+    custom_id = SEPARATOR.join([action, *(str(arg) for arg in args)])
+    if len(custom_id) > MAX_CUSTOM_ID_LENGTH:
+        raise ValueError(f"custom_id is longer than {MAX_CUSTOM_ID_LENGTH} characters: {custom_id}")
+    return custom_id
+
+
+def parse_custom_id(custom_id: str) -> Tuple[str, List[str]]:
+    """Split a custom ID into its action and arguments."""
+    action, *args = custom_id.split(SEPARATOR)
+    return action, args
+
+
+class RoutedButton(discord.ui.Button):
+    """A button handled by the component router rather than its view."""
+    
+    def is_dispatchable(self) -> bool:
+        # Keeps the library from storing the view for every message it's sent with
+        return False
+
+
+class RoutedSelect(discord.ui.Select):
+    """A select menu handled by the component router rather than its view."""
+    
+    def is_dispatchable(self) -> bool:
+        return False
+
+
+class Route(NamedTuple):
+    """A registered component handler."""
+    
+    action: str
+    handler: Handler
+
+
+class ComponentRouter:
+    """Dispatch component interactions to handlers by custom ID action."""
+    
+    def __init__(self, ack_budget: float = 2.0):
+        """Initialize the router; handlers not replying within ``ack_budget`` seconds are deferred."""
+        self.ack_budget = ack_budget
+        self.dispatched = 0
+        self.auto_deferred = 0
+        self.missed_deadlines = 0
+        self._routes: Dict[str, Route] = {}
+        self._view_factories: Dict[str, Callable[[], discord.ui.View]] = {}
+        self._views: Dict[str, discord.ui.View] = {}
+    
+    def __len__(self) -> int:
+        return len(self._routes)
+    
+    def add(self, action: str, handler: Handler, aliases: Tuple[str, ...] = ()) -> None:
+        """Route an action, and any older custom IDs for it, to a handler.
+        
+        The handler is called with an ``InteractionResponder`` for the
+        interaction and the custom ID's arguments as strings. Adding an
+        action again replaces its handler, so a reloaded cog takes over its
+        routes.
+        """
+        route = Route(action, handler)
+        for name in (action, *aliases):
+            if SEPARATOR in name:
+                raise ValueError(f"Action names can't contain {SEPARATOR!r}: {name}")
+            self._routes[name] = route
+    
+    def remove(self, action: str) -> None:
+        """Stop routing an action and its aliases."""
+        route = self._routes.get(action)
+        if route is None:
+            return
+        for name in [name for name, other in self._routes.items() if other is route]:
+            del self._routes[name]
+    
+    def add_view(self, name: str, factory: Callable[[], discord.ui.View]) -> None:
+        """Register a persistent view, built once on first use and then shared."""
+        self._view_factories[name] = factory
+        self._views.pop(name, None)
+    
+    def get_view(self, name: str) -> discord.ui.View:
+        """Get a registered view."""
+        view = self._views.get(name)
+        if view is None:
+            view = self._views[name] = self._view_factories[name]()
+        return view
+    
+    def get_route(self, custom_id: str) -> Tuple[Optional[Route], List[str]]:
+        """Find the route for a custom ID, and the arguments to call it with."""
+        action, args = parse_custom_id(custom_id)
+        return self._routes.get(action), args
+    
+    async def dispatch(self, interaction: discord.Interaction) -> bool:
+        """Handle a component interaction; returns whether it was routed."""
+        if interaction.type != discord.InteractionType.component:
+            return False
+        
+        data = interaction.data or {}
+        custom_id = data.get("custom_id")
+        if not custom_id:
+            return False
+        
+        route, args = self.get_route(custom_id)
+        if route is None:
+            return False
+        
+        kind = "button" if data.get("component_type", BUTTON_COMPONENT_TYPE) == BUTTON_COMPONENT_TYPE else "select"
+        responder = InteractionResponder(interaction, kind, route.action, self.ack_budget)
+        try:
+            async with responder:
+                with get_query_instrumentation().operation(f"{kind}:{route.action}"):
+                    await route.handler(responder, *args)
+        finally:
+            self.dispatched += 1
+            self.auto_deferred += responder.auto_deferred
+            self.missed_deadlines += responder.missed_deadline
+        return True
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get router statistics."""
+        return {
+            "routes": len({route.action for route in self._routes.values()}),
+            "aliases": len(self._routes) - len({route.action for route in self._routes.values()}),
+            "views": len(self._views),
+            "dispatched": self.dispatched,
+            "auto_deferred": self.auto_deferred,
+            "missed_deadlines": self.missed_deadlines,
+        }
\ No newline at end of file
@@ -0,0 +1,176 @@
+"""Member cache policies and on-demand member roles."""
+
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import discord
+
+from utils.cache import SingleFlight, TTLCache
+from utils.metrics import track_cache
+
+FULL = "full"
+LEAN = "lean"
+POLICIES = (FULL, LEAN)
+
+MemberKey = Tuple[int, int]
+
+_NOT_A_MEMBER = ()
+
+
+def gateway_options(policy: str, public_bot: bool) -> Tuple[discord.Intents, Dict[str, Any]]:
+    """Build the intents and client options for a member cache policy.
+    
+    ``full`` chunks every guild at startup and, for private bots, tracks
+    presences, so the client holds every member. ``lean`` still receives
+    member events but caches no members and requests no chunks; the
+    members ticket logic needs are kept by ``MemberRoleCache``.
+    """
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.guilds = True
+    intents.members = True
+    intents.guild_messages = True
+    intents.dm_messages = True
+    intents.dm_reactions = True
+    intents.dm_typing = True
+    
+    if policy == LEAN:
+        return intents, {
+            "chunk_guilds_at_startup": False,
+            "member_cache_flags": discord.MemberCacheFlags.none(),
+        }
+    
+    # Add guild presences for non-public bots
+    if not public_bot:
+        intents.presences = True
+    return intents, {}
+
+
+def role_ids(member: Any) -> Tuple[int, ...]:
+    """Get a member's role IDs, including ``@everyone``."""
+    return tuple(role.id for role in member.roles)
+
+
+class MemberRoleCache:
+    """Role IDs of members, without requiring the client to cache members.
+    
+    Under the ``lean`` policy, staff and members with open tickets are kept
+    here, refreshed whenever they interact. Anyone else's roles are fetched
+    from Discord on demand, coalesced per member and kept for ``ttl``
+    seconds. Under ``full`` the client's own member cache answers first.
+    """
+    
+    def __init__(self, bot, policy: str = FULL, ttl: float = 60.0, maxsize: int = 10000):
+        """Initialize the cache."""
+        self.bot = bot
+        self.policy = policy
+        
+        self._kept: Dict[MemberKey, Tuple[int, ...]] = {}
+        self._staff: Set[MemberKey] = set()
+        self._open_tickets: Counter = Counter()
+        self._fetched: TTLCache[MemberKey, Tuple[int, ...]] = TTLCache(maxsize, ttl)
+        self._flight: SingleFlight[MemberKey, Tuple[int, ...]] = SingleFlight()
+        track_cache("member_roles", self._fetched)
+        
+        self.fetches = 0
+    
+    def __len__(self) -> int:
+        return len(self._kept)
+    
+    def _should_keep(self, key: MemberKey) -> bool:
+        return key in self._staff or self._open_tickets[key] > 0
+    
+    def observe(self, member: Any) -> None:
+        """Refresh a member's roles if they are kept; called for every interaction."""
+        guild = getattr(member, "guild", None)
+        if guild is None:
+            return
+        key = (guild.id, member.id)
+        if key in self._kept or self._should_keep(key):
+            self._kept[key] = role_ids(member)
+    
+    def keep_staff(self, member: Any) -> None:
+        """Keep a member who acted as staff."""
+        key = (member.guild.id, member.id)
+        self._staff.add(key)
+        self._kept[key] = role_ids(member)
+    
+    def opened_ticket(self, member: Any) -> None:
+        """Keep a member while they have an open ticket."""
+        key = (member.guild.id, member.id)
+        self._open_tickets[key] += 1
+        self._kept[key] = role_ids(member)
+    
+    def closed_ticket(self, guild_id: int, member_id: int) -> None:
+        """Release a member whose last open ticket closed, unless they are staff."""
+        key = (guild_id, member_id)
+        if self._open_tickets[key] > 1:
+            self._open_tickets[key] -= 1
+            return
+        self._open_tickets.pop(key, None)
+        if key not in self._staff:
+            self._kept.pop(key, None)
+    
+    def forget(self, guild_id: int, member_id: int) -> None:
+        """Drop everything about a member who left a guild."""
+        key = (guild_id, member_id)
+        self._kept.pop(key, None)
+        self._staff.discard(key)
+        self._open_tickets.pop(key, None)
+        self._fetched.pop(key)
+    
+    async def load_open_tickets(self, session_factory) -> None:
+        """Count open tickets per member, so their owners are kept once they interact."""
+        from sqlalchemy import func, select
+        
+        from database.models import Ticket
+        
+        async with session_factory() as session:
+            result = await session.execute(
+                select(Ticket.guild_id, Ticket.created_by_id, func.count())
+                .where(Ticket.open == True)
+                .group_by(Ticket.guild_id, Ticket.created_by_id)
+            )
+            for guild_id, member_id, count in result:
+                self._open_tickets[(int(guild_id), int(member_id))] = count
+    
+    async def get_roles(self, guild_id: int, member_id: int) -> Optional[List[str]]:
+        """Get a member's role IDs, or None if they are not in the guild."""
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            return None
+        
+        member = guild.get_member(member_id)
+        if member is not None:
+            roles = role_ids(member)
+        else:
+            key = (guild_id, member_id)
+            roles = self._kept.get(key)
+            if roles is None:
+                roles = self._fetched.get(key)
+            if roles is None:
+                roles = await self._flight.do(key, lambda: self._fetch(guild, member_id))
+        
+        # Every member has @everyone, so no roles means not a member
+        return [str(role_id) for role_id in roles] if roles else None
+    
+    async def _fetch(self, guild: discord.Guild, member_id: int) -> Tuple[int, ...]:
+        """Fetch a member's roles from Discord and cache them."""
+        self.fetches += 1
+        try:
+            roles = role_ids(await guild.fetch_member(member_id))
+        except discord.NotFound:
+            roles = _NOT_A_MEMBER
+        self._fetched.set((guild.id, member_id), roles)
+        return roles
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "policy": self.policy,
+            "kept": len(self._kept),
+            "staff": len(self._staff),
+            "open_ticket_owners": len(self._open_tickets),
+            "fetched": len(self._fetched),
+            "fetches": self.fetches,
+        }
\ No newline at end of file
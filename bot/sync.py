@@ -0,0 +1,132 @@
+"""Application command synchronisation."""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bot.client import TicketsBot
+
+# Keys that affect how Discord presents a command; server-assigned keys
+# (id, version, application_id...) are ignored when comparing
+_COMMAND_KEYS = (
+    "name", "name_localizations", "description", "description_localizations",
+    "type", "options", "default_member_permissions", "dm_permission", "nsfw",
+)
+_OPTION_KEYS = (
+    "name", "name_localizations", "description", "description_localizations",
+    "type", "required", "choices", "options", "channel_types",
+    "min_value", "max_value", "min_length", "max_length", "autocomplete",
+)
+
+
+def _normalise(payload: Dict[str, Any], keys: tuple = _COMMAND_KEYS) -> Dict[str, Any]:
+    """Reduce a command or option payload to a canonical form."""
+    normalised = {}
+    for key in keys:
+        value = payload.get(key)
+        # Discord omits defaults, so treat empty and false values as absent
+        if value in (None, False, [], {}):
+            continue
+        if key == "options":
+            value = [_normalise(option, _OPTION_KEYS) for option in value]
+        elif key == "default_member_permissions":
+            value = str(value)
+        normalised[key] = value
+    normalised.setdefault("type", 1)
+    return normalised
+
+
+class CommandSyncManager:
+    """Publish application commands only when their definitions change."""
+    
+    def __init__(self, bot: "TicketsBot", hash_file: Path):
+        """Initialize the sync manager."""
+        self.bot = bot
+        self.hash_file = hash_file
+        self.log = bot.log.commands
+    
+    def serialize(self) -> List[Dict[str, Any]]:
+        """Serialise the local command tree in a stable order."""
+        tree = self.bot.tree
+        payload = []
+        for command in tree.get_commands():
+            try:
+                data = command.to_dict(tree)
+            except TypeError:
+                # Older library versions take no arguments
+                data = command.to_dict()
+            payload.append(_normalise(data))
+        return sorted(payload, key=lambda command: (command["type"], command["name"]))
+    
+    def compute_hash(self, payload: List[Dict[str, Any]]) -> str:
+        """Hash a serialised command tree."""
+        canonical = json.dumps(
+            {"application_id": str(self.bot.application_id), "commands": payload},
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    
+    def read_hash(self) -> Optional[str]:
+        """Read the hash of the last published command tree."""
+        try:
+            return self.hash_file.read_text(encoding="utf-8").strip() or None
+        except OSError:
+            return None
+    
+    def write_hash(self, digest: str) -> None:
+        """Persist the hash of the published command tree."""
+        try:
+            tmp_file = self.hash_file.with_suffix(".tmp")
+            tmp_file.write_text(digest, encoding="utf-8")
+            os.replace(tmp_file, self.hash_file)
+        except OSError as e:
+            self.log.warning(f"Failed to write command hash to {self.hash_file}: {e}")
+    
+    async def fetch_remote_hash(self) -> Optional[str]:
+        """Hash the commands currently registered with Discord."""
+        try:
+            remote = await self.bot.tree.fetch_commands()
+        except Exception as e:
+            self.log.warning(f"Failed to fetch registered commands: {e}")
+            return None
+        
+        payload = sorted(
+            (_normalise(command.to_dict()) for command in remote),
+            key=lambda command: (command["type"], command["name"])
+        )
+        return self.compute_hash(payload)
+    
+    async def sync(self, force: bool = False) -> bool:
+        """Sync commands if they changed; return whether a sync was pushed."""
+        start = time.perf_counter()
+        local_hash = self.compute_hash(self.serialize())
+        
+        if not force:
+            known_hash = self.read_hash()
+            if known_hash is None:
+                # No local record (e.g. a fresh container), ask Discord once
+                known_hash = await self.fetch_remote_hash()
+                if known_hash == local_hash:
+                    self.write_hash(local_hash)
+            
+            if known_hash == local_hash:
+                elapsed = time.perf_counter() - start
+                self.bot.startup_timings["command_sync"] = elapsed
+                self.log.info(
+                    f"Commands unchanged ({local_hash[:12]}), skipped sync in {elapsed * 1000:.0f}ms"
+                )
+                return False
+        
+        await self.bot.tree.sync()
+        self.write_hash(local_hash)
+        
+        elapsed = time.perf_counter() - start
+        self.bot.startup_timings["command_sync"] = elapsed
+        self.log.info(f"Commands synced ({local_hash[:12]}) in {elapsed * 1000:.0f}ms")
+        return True
\ No newline at end of file
@@ -0,0 +1,415 @@
+"""Finishing ticket closes in the background."""
+
+import asyncio
+import io
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Deque, Dict, Optional, Set
+
+import discord
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.cluster import shard_for_guild
+from database.models import ArchivedChannel, ArchivedMessage, ArchivedUser, CloseJob, Ticket
+from utils.embed import FIELD_VALUE_LIMIT, ExtendedEmbedBuilder, truncate
+from utils.metrics import get_registry
+
+if TYPE_CHECKING:
+    from bot.client import TicketsBot
+
+# Steps run in this order; a job's ``step`` is the next one to run
+STEPS = ("archive", "transcript", "log", "delete")
+
+PENDING = "pending"
+FAILED = "failed"
+
+# Messages read from Discord and stored per archive transaction
+ARCHIVE_PAGE_SIZE = 100
+
+CLOSE_STEP_SECONDS = get_registry().histogram(
+    "tickets_close_step_seconds",
+    "Time spent running a step of a close job.",
+    ["step"],
+)
+CLOSE_STEP_FAILURES = get_registry().counter(
+    "tickets_close_step_failures",
+    "Close job steps that raised and will be retried, or gave up.",
+    ["step"],
+)
+CLOSE_JOBS_FINISHED = get_registry().counter(
+    "tickets_close_jobs_finished",
+    "Close jobs that completed every step, or failed for good.",
+    ["status"],
+)
+
+
+class CloseJobWorker:
+    """Run the close jobs in the outbox, a limited number at a time.
+    
+    ``TicketManager.close_ticket`` marks a ticket closed and records its
+    job in the same transaction, then wakes the worker. Each step commits
+    its progress, and archiving commits after every page of messages, so
+    a job interrupted by an error or a restart resumes where it stopped.
+    A step that raises is retried with exponential backoff, and the job
+    is marked failed after ``max_attempts`` tries.
+    
+    At most ``concurrency`` jobs run at once, and at most
+    ``guild_concurrency`` of them for the same guild, so a bulk close in
+    one guild neither takes every slot nor runs into the guild's rate
+    limits. Due jobs are read once per wake and started from memory as
+    slots free up.
+    """
+    
+    def __init__(
+        self,
+        bot: "TicketsBot",
+        concurrency: int = 4,
+        max_attempts: int = 5,
+        retry_delay: float = 30.0,
+        poll_interval: float = 60.0,
+        guild_concurrency: int = 2
+    ):
+        """Initialize the worker."""
+        self.bot = bot
+        self.log = bot.log.tickets
+        self.concurrency = concurrency
+        self.guild_concurrency = guild_concurrency
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+        
+        self.steps = {
+            "archive": self.archive,
+            "transcript": self.transcript,
+            "log": self.log_closure,
+            "delete": self.delete_channel,
+        }
+        self._wake = asyncio.Event()
+        self._running: Dict[int, asyncio.Task] = {}
+        self._guild_running: Counter = Counter()
+        self._task: Optional[asyncio.Task] = None
+        
+        # Due job IDs by guild and the next retry, as of the last scan
+        self._due: Dict[str, Deque[int]] = {}
+        self._next_due: Optional[datetime] = None
+        self._rescan = True
+        
+        self.completed = 0
+        self.failed = 0
+    
+    def start(self) -> None:
+        """Start running jobs, including any left unfinished before a restart."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+    
+    async def stop(self) -> None:
+        """Stop the worker; interrupted jobs resume from their last step on the next start."""
+        tasks = [task for task in (self._task, *self._running.values()) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._running.clear()
+        self._guild_running.clear()
+        self._due.clear()
+        self._rescan = True
+    
+    def wake(self) -> None:
+        """Look for new jobs now rather than at the next poll."""
+        self._rescan = True
+        self._wake.set()
+    
+    async def run(self) -> None:
+        """Start due jobs whenever woken, a job finishes, or a retry comes due."""
+        await self.bot.wait_until_ready()
+        while True:
+            self._wake.clear()
+            try:
+                timeout = await self.schedule()
+            except Exception as e:
+                self.log.error(f"Error scheduling close jobs: {e}")
+                self._rescan = True
+                timeout = self.poll_interval
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                self._rescan = True
+    
+    def _owns(self, guild_id: str) -> bool:
+        """Check whether this process's shards receive a guild, so it runs the guild's jobs."""
+        shard_ids = getattr(self.bot, "shard_ids", None)
+        return not shard_ids or shard_for_guild(int(guild_id), self.bot.shard_count) in shard_ids
+    
+    async def schedule(self) -> float:
+        """Start due jobs in free slots; returns seconds until the next retry is due."""
+        if self._rescan or not self._due:
+            await self._scan()
+        
+        for guild_id in list(self._due):
+            queue = self._due[guild_id]
+            while (
+                queue
+                and len(self._running) < self.concurrency
+                and self._guild_running[guild_id] < self.guild_concurrency
+            ):
+                job_id = queue.popleft()
+                self._guild_running[guild_id] += 1
+                self._running[job_id] = asyncio.create_task(self.run_job(job_id, guild_id))
+            if not queue:
+                del self._due[guild_id]
+            if len(self._running) >= self.concurrency:
+                break
+        
+        if self._next_due is None:
+            return self.poll_interval
+        return min(self.poll_interval, max((self._next_due - datetime.utcnow()).total_seconds(), 0.0))
+    
+    async def _scan(self) -> None:
+        """Read the pending jobs this process runs, grouping the due ones by guild."""
+        now = datetime.utcnow()
+        async with self.bot.db_session_factory() as session:
+            result = await session.execute(
+                select(CloseJob.id, CloseJob.guild_id, CloseJob.run_after)
+                .where(CloseJob.status == PENDING)
+                .order_by(CloseJob.run_after, CloseJob.id)
+            )
+            jobs = result.all()
+        
+        due: Dict[str, Deque[int]] = {}
+        next_due: Optional[datetime] = None
+        for job_id, guild_id, run_after in jobs:
+            if job_id in self._running or not self._owns(guild_id):
+                continue
+            if run_after > now:
+                next_due = run_after if next_due is None else min(next_due, run_after)
+                continue
+            due.setdefault(guild_id, deque()).append(job_id)
+        self._due, self._next_due, self._rescan = due, next_due, False
+    
+    async def run_job(self, job_id: int, guild_id: str) -> None:
+        """Run a job's remaining steps."""
+        try:
+            async with self.bot.db_session_factory() as session:
+                job = await session.get(CloseJob, job_id)
+                ticket = await session.get(Ticket, job.ticket_id) if job else None
+            if job is None or ticket is None:
+                return
+            
+            while True:
+                step = job.step
+                start = time.perf_counter()
+                try:
+                    await self.steps[step](job, ticket)
+                except Exception as e:
+                    CLOSE_STEP_FAILURES.labels(step).inc()
+                    await self._retry(job, step, e)
+                    return
+                finally:
+                    CLOSE_STEP_SECONDS.labels(step).observe(time.perf_counter() - start)
+                
+                index = STEPS.index(step) + 1
+                if index == len(STEPS):
+                    break
+                job.step, job.attempts = STEPS[index], 0
+                await self._update(job.id, step=job.step, attempts=0)
+            
+            # Finished jobs leave the outbox
+            async with self.bot.db_session_factory() as session:
+                await session.execute(delete(CloseJob).where(CloseJob.id == job.id))
+                await session.commit()
+            self.completed += 1
+            CLOSE_JOBS_FINISHED.labels("done").inc()
+            self.log.info(f"Finished closing ticket #{ticket.number}")
+        
+        except Exception as e:
+            self.log.error(f"Error running close job {job_id}: {e}")
+        finally:
+            self._running.pop(job_id, None)
+            self._guild_running[guild_id] -= 1
+            if self._guild_running[guild_id] <= 0:
+                del self._guild_running[guild_id]
+            # A slot is free; start the next due job
+            self._wake.set()
+    
+    async def _retry(self, job: CloseJob, step: str, error: Exception) -> None:
+        """Record a failed step and schedule the job to try it again, unless it's out of attempts."""
+        attempts = job.attempts + 1
+        values: Dict[str, Any] = {"attempts": attempts, "last_error": f"{step}: {error}"[:1000]}
+        if attempts >= self.max_attempts:
+            values["status"] = FAILED
+            values["finished_at"] = datetime.utcnow()
+            self.failed += 1
+            CLOSE_JOBS_FINISHED.labels(FAILED).inc()
+            self.log.error(f"Gave up closing ticket {job.ticket_id} at step {step} after {attempts} attempts: {error}")
+        else:
+            delay = self.retry_delay * 2 ** (attempts - 1)
+            values["run_after"] = datetime.utcnow() + timedelta(seconds=delay)
+            self.log.warning(f"Close step {step} failed for ticket {job.ticket_id}, retrying in {delay:.0f}s: {error}")
+        await self._update(job.id, **values)
+        # Pick up the new retry time
+        self._rescan = True
+    
+    async def _update(self, job_id: int, **values: Any) -> None:
+        """Save a job's progress."""
+        async with self.bot.db_session_factory() as session:
+            await session.execute(
+                CloseJob.__table__.update().where(CloseJob.id == job_id).values(**values)
+            )
+            await session.commit()
+    
+    def _channel(self, job: CloseJob) -> Optional[discord.TextChannel]:
+        """Get a job's ticket channel, if it still exists."""
+        guild = self.bot.get_guild(int(job.guild_id))
+        return guild.get_channel(int(job.channel_id)) if guild else None
+    
+    async def archive(self, job: CloseJob, ticket: Ticket) -> None:
+        """Store the channel's messages and their authors, a page at a time."""
+        guild_settings = await self.bot.ticket_manager.get_guild_settings(job.guild_id)
+        channel = self._channel(job)
+        if not guild_settings or not guild_settings.archive or channel is None:
+            return
+        
+        async with self.bot.db_session_factory() as session:
+            result = await session.execute(
+                select(ArchivedUser.user_id).where(ArchivedUser.ticket_id == ticket.id)
+            )
+            archived_users: Set[str] = set(result.scalars())
+        
+        after = discord.Object(id=int(job.cursor)) if job.cursor else None
+        while True:
+            messages = [
+                message async for message in
+                channel.history(limit=ARCHIVE_PAGE_SIZE, after=after, oldest_first=True)
+            ]
+            if not messages:
+                break
+            
+            users: Dict[str, Dict[str, Any]] = {}
+            for message in messages:
+                author_id = str(message.author.id)
+                if author_id not in archived_users and author_id not in users:
+                    top_role = getattr(message.author, "top_role", None)
+                    users[author_id] = {
+                        "ticket_id": ticket.id,
+                        "user_id": author_id,
+                        "avatar": message.author.display_avatar.key,
+                        "bot": message.author.bot,
+                        "display_name": message.author.display_name,
+                        "role_id": str(top_role.id) if top_role else None,
+                        "username": message.author.name,
+                    }
+            
+            # Messages and the cursor past them commit together, so a
+            # resumed job neither skips nor repeats any
+            async with self.bot.db_session_factory() as session:
+                await session.execute(insert(ArchivedMessage), [
+                    {
+                        "id": str(message.id),
+                        "ticket_id": ticket.id,
+                        "author_id": str(message.author.id),
+                        "content": message.content,
+                        "created_at": message.created_at.replace(tzinfo=None),
+                        "edited": message.edited_at is not None,
+                    }
+                    for message in messages
+                ])
+                if users:
+                    await session.execute(insert(ArchivedUser), list(users.values()))
+                job.cursor = str(messages[-1].id)
+                await session.execute(
+                    CloseJob.__table__.update().where(CloseJob.id == job.id).values(cursor=job.cursor)
+                )
+                await session.commit()
+            
+            archived_users.update(users)
+            after = messages[-1]
+            if len(messages) < ARCHIVE_PAGE_SIZE:
+                break
+        
+        async with self.bot.db_session_factory() as session:
+            archived = await session.get(ArchivedChannel, (ticket.id, str(channel.id)))
+            if archived is None:
+                session.add(ArchivedChannel(ticket_id=ticket.id, channel_id=str(channel.id), name=channel.name))
+                await session.commit()
+    
+    async def transcript(self, job: CloseJob, ticket: Ticket) -> None:
+        """Send the ticket's creator a transcript of the archived messages."""
+        guild_settings = await self.bot.ticket_manager.get_guild_settings(job.guild_id)
+        if not guild_settings or not guild_settings.archive:
+            return
+        
+        async with self.bot.db_session_factory() as session:
+            result = await session.execute(
+                select(ArchivedUser.user_id, ArchivedUser.display_name)
+                .where(ArchivedUser.ticket_id == ticket.id)
+            )
+            names = dict(result.all())
+            result = await session.execute(
+                select(ArchivedMessage.created_at, ArchivedMessage.author_id, ArchivedMessage.content)
+                .where(ArchivedMessage.ticket_id == ticket.id)
+                .order_by(ArchivedMessage.created_at, ArchivedMessage.id)
+            )
+            lines = [
+                f"[{created_at:%Y-%m-%d %H:%M:%S}] {names.get(author_id) or author_id}: {content}"
+                for created_at, author_id, content in result
+            ]
+        if not lines:
+            return
+        
+        try:
+            user = await self.bot.fetch_user(int(ticket.created_by_id))
+            await user.send(
+                f"Transcript of your ticket #{ticket.number}",
+                file=discord.File(io.BytesIO("\n".join(lines).encode()), filename=f"ticket-{ticket.number}.txt")
+            )
+        except (discord.Forbidden, discord.NotFound):
+            # The creator left Discord or doesn't accept DMs
+            self.log.info(f"Couldn't send the transcript of ticket #{ticket.number} to its creator")
+    
+    async def log_closure(self, job: CloseJob, ticket: Ticket) -> None:
+        """Post the closure to the guild's log channel."""
+        if self.bot.log_dispatcher is None:
+            return
+        
+        embed = ExtendedEmbedBuilder()
+        embed.set_warning_color()
+        embed.set_title(f"Ticket #{ticket.number} closed")
+        embed.add_field(name="Created by", value=f"<@{ticket.created_by_id}>", inline=True)
+        if job.closed_by_id:
+            embed.add_field(name="Closed by", value=f"<@{job.closed_by_id}>", inline=True)
+        if job.reason:
+            embed.add_field(name="Reason", value=truncate(job.reason, FIELD_VALUE_LIMIT), inline=False)
+        self.bot.log_dispatcher.post(job.guild_id, embed)
+    
+    async def delete_channel(self, job: CloseJob, ticket: Ticket) -> None:
+        """Delete the ticket's channel."""
+        channel = self._channel(job)
+        if channel is None:
+            return
+        try:
+            await channel.delete(reason=f"Ticket #{ticket.number} closed")
+        except discord.NotFound:
+            pass
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get worker statistics."""
+        return {
+            "running": len(self._running),
+            "due": sum(len(queue) for queue in self._due.values()),
+            "guilds": len(self._guild_running),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+async def batch_progress(session: AsyncSession, guild_id: str, batch: str) -> Dict[str, int]:
+    """Count a bulk close's jobs still to run and those that failed; finished jobs are gone."""
+    result = await session.execute(
+        select(CloseJob.status, func.count())
+        .where(CloseJob.guild_id == guild_id, CloseJob.batch == batch)
+        .group_by(CloseJob.status)
+    )
+    counts = dict(result.all())
+    return {"pending": counts.get(PENDING, 0), "failed": counts.get(FAILED, 0)}
\ No newline at end of file
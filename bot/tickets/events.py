@@ -0,0 +1,232 @@
+"""In-process ticket event bus for live dashboard updates."""
+
+import asyncio
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Callable, Collection, Container, Deque, Dict, List, Optional, Set, Tuple
+
+from utils.serialization import dumps_bytes
+
+# Event types
+TICKET_CREATED = "ticket.created"
+TICKET_CLAIMED = "ticket.claimed"
+TICKET_CLOSED = "ticket.closed"
+TICKET_MESSAGE = "ticket.message"
+
+# Events that record a change to a ticket, rather than a message in it
+TICKET_CHANGES = (TICKET_CREATED, TICKET_CLAIMED, TICKET_CLOSED)
+
+# What to do when a subscriber's queue is full
+DROP_OLDEST = "drop"
+DISCONNECT = "disconnect"
+
+
+@dataclass(frozen=True)
+class TicketEvent:
+    """Something that happened to a ticket."""
+    type: str
+    guild_id: str
+    ticket_id: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the event to a JSON-serialisable dict."""
+        return {
+            "type": self.type,
+            "guild_id": self.guild_id,
+            "ticket_id": self.ticket_id,
+            "data": self.data,
+            "timestamp": self.timestamp,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TicketEvent":
+        """Rebuild an event from ``to_dict`` output."""
+        return cls(**data)
+    
+    @cached_property
+    def sse(self) -> bytes:
+        """The event as a Server-Sent Events frame, encoded once for every subscriber."""
+        return b"event: " + self.type.encode("ascii") + b"\ndata: " + dumps_bytes(self.to_dict()) + b"\n\n"
+
+
+Listener = Callable[[TicketEvent], None]
+
+
+class Subscription:
+    """A subscriber's bounded queue of events for one guild.
+    
+    Idle subscribers hold a deque and, while waiting, one future, so
+    thousands of them stay cheap. When the queue is full the oldest event
+    is dropped, or the subscription is closed, depending on ``policy``.
+    """
+    
+    __slots__ = ("bus", "guild_id", "policy", "dropped", "closed", "_queue", "_waiter")
+    
+    def __init__(self, bus: "TicketEventBus", guild_id: str, maxsize: int, policy: str):
+        self.bus = bus
+        self.guild_id = guild_id
+        self.policy = policy
+        self.dropped = 0
+        self.closed = False
+        self._queue: Deque[TicketEvent] = deque(maxlen=maxsize)
+        self._waiter: Optional[asyncio.Future] = None
+    
+    def __len__(self) -> int:
+        return len(self._queue)
+    
+    def offer(self, event: TicketEvent) -> None:
+        """Queue an event without blocking the publisher."""
+        if self.closed:
+            return
+        if len(self._queue) == self._queue.maxlen:
+            if self.policy == DISCONNECT:
+                self.bus.disconnected += 1
+                self.close()
+                return
+            # The deque discards the oldest event on append
+            self.dropped += 1
+            self.bus.dropped += 1
+        self._queue.append(event)
+        self._wake()
+    
+    async def get(self, timeout: Optional[float] = None) -> Optional[TicketEvent]:
+        """Wait for the next event; None on timeout or once closed."""
+        if not self._queue and not self.closed:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await asyncio.wait_for(self._waiter, timeout)
+            except asyncio.TimeoutError:
+                return None
+            finally:
+                self._waiter = None
+        return self._queue.popleft() if self._queue else None
+    
+    def close(self) -> None:
+        """Stop receiving events."""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.clear()
+        self.bus.unsubscribe(self)
+        self._wake()
+    
+    def _wake(self) -> None:
+        """Wake the waiting consumer, if any."""
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+
+class TicketEventBus:
+    """Fan ticket events out to per-guild subscribers and global listeners."""
+    
+    def __init__(self):
+        """Initialize the event bus."""
+        self._subscriptions: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._listeners: List[Tuple[Listener, Optional[Collection[str]], Optional[Container[str]]]] = []
+        self._watchers: List[Callable[[str, bool], None]] = []
+        
+        self.published = 0
+        self.dropped = 0
+        self.disconnected = 0
+    
+    def subscribe(self, guild_id: str, maxsize: int = 100, policy: str = DROP_OLDEST) -> Subscription:
+        """Subscribe to a guild's events."""
+        subscription = Subscription(self, guild_id, maxsize, policy)
+        subscriptions = self._subscriptions[guild_id]
+        subscriptions.add(subscription)
+        if len(subscriptions) == 1:
+            self._notify_watchers(guild_id, True)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscription."""
+        subscriptions = self._subscriptions.get(subscription.guild_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.guild_id]
+                self._notify_watchers(subscription.guild_id, False)
+    
+    def add_listener(
+        self,
+        listener: Listener,
+        types: Optional[Collection[str]] = None,
+        guilds: Optional[Container[str]] = None
+    ) -> None:
+        """Call ``listener(event)`` synchronously for events of ``types`` in ``guilds``.
+        
+        Either left as None means every type or every guild. ``guilds`` may
+        be a container its owner keeps up to date.
+        """
+        self._listeners.append((listener, types, guilds))
+    
+    def remove_listener(self, listener: Listener) -> None:
+        """Stop calling a listener added with ``add_listener``."""
+        self._listeners = [entry for entry in self._listeners if entry[0] != listener]
+    
+    def add_watcher(self, watcher: Callable[[str, bool], None]) -> None:
+        """Call ``watcher(guild_id, watched)`` when a guild gets its first subscription or loses its last."""
+        self._watchers.append(watcher)
+    
+    def remove_watcher(self, watcher: Callable[[str, bool], None]) -> None:
+        """Stop calling a watcher added with ``add_watcher``."""
+        if watcher in self._watchers:
+            self._watchers.remove(watcher)
+    
+    def _notify_watchers(self, guild_id: str, watched: bool) -> None:
+        """Tell watchers that a guild's subscriptions started or ended."""
+        for watcher in self._watchers:
+            watcher(guild_id, watched)
+    
+    @property
+    def watched_guilds(self) -> List[str]:
+        """Get the guilds with at least one subscription."""
+        return list(self._subscriptions)
+    
+    def publish(self, event: TicketEvent) -> None:
+        """Deliver an event; never blocks, slow subscribers lose events instead."""
+        self.published += 1
+        for listener, types, guilds in self._listeners:
+            if (types is None or event.type in types) and (guilds is None or event.guild_id in guilds):
+                listener(event)
+        for subscription in list(self._subscriptions.get(event.guild_id, ())):
+            subscription.offer(event)
+    
+    def has_subscribers(self, guild_id: str, event_type: str) -> bool:
+        """Check whether anything would receive a guild's events of a type, before building one."""
+        if guild_id in self._subscriptions:
+            return True
+        return any(
+            (types is None or event_type in types) and (guilds is None or guild_id in guilds)
+            for _, types, guilds in self._listeners
+        )
+    
+    @property
+    def subscriber_count(self) -> int:
+        """Get the number of active subscriptions."""
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get event bus statistics."""
+        return {
+            "subscribers": self.subscriber_count,
+            "published": self.published,
+            "dropped": self.dropped,
+            "disconnected": self.disconnected,
+        }
+
+
+# Global event bus instance
+_event_bus_instance: Optional[TicketEventBus] = None
+
+
+def get_event_bus() -> TicketEventBus:
+    """Get the global ticket event bus instance."""
+    global _event_bus_instance
+    if _event_bus_instance is None:
+        _event_bus_instance = TicketEventBus()
+    return _event_bus_instance
\ No newline at end of file
@@ -0,0 +1,210 @@
+"""Batched delivery of ticket activity to guild log channels."""
+
+import asyncio
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterator, List, Optional, Union
+
+import discord
+
+from bot.tickets.events import TICKET_CLAIMED, TICKET_CREATED, TicketEvent, get_event_bus
+from utils.embed import ExtendedEmbedBuilder
+from utils.metrics import get_registry
+
+if TYPE_CHECKING:
+    from bot.client import TicketsBot
+
+# Discord's limits on embeds per message, and on their total characters
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARACTERS = 6000
+
+# Closures are logged by the close job, once the ticket is archived
+LOGGED_EVENTS = (TICKET_CREATED, TICKET_CLAIMED)
+
+LOG_MESSAGES_SENT = get_registry().counter(
+    "tickets_log_messages_sent",
+    "Messages posted to guild log channels.",
+)
+LOG_ENTRIES_SENT = get_registry().counter(
+    "tickets_log_entries_sent",
+    "Log entries posted to guild log channels, up to ten per message.",
+)
+LOG_ENTRIES_DROPPED = get_registry().counter(
+    "tickets_log_entries_dropped",
+    "Log entries dropped because a guild's buffer was full or Discord rejected them.",
+)
+
+Entry = Union[TicketEvent, discord.Embed]
+
+
+def split_embeds(embeds: List[discord.Embed]) -> Iterator[List[discord.Embed]]:
+    """Group embeds into as few messages as Discord's limits on count and size allow."""
+    batch: List[discord.Embed] = []
+    size = 0
+    for embed in embeds:
+        length = len(embed)
+        if batch and (len(batch) == MAX_EMBEDS_PER_MESSAGE or size + length > MAX_EMBED_CHARACTERS):
+            yield batch
+            batch, size = [], 0
+        batch.append(embed)
+        size += length
+    if batch:
+        yield batch
+
+
+class LogDispatcher:
+    """Post ticket activity to each guild's log channel in batches.
+    
+    Entries are buffered per guild and flushed every ``interval`` seconds,
+    up to ten embeds per message. Each guild has at most one flush in
+    flight, so a guild posting slowly, or waiting out its channel's rate
+    limit, fills its own buffer; once ``maxsize`` entries are waiting the
+    oldest are dropped and counted rather than slowing down ticket
+    operations. Entries a failed flush didn't post are retried with the
+    next one, unless Discord rejected them, when they're dropped too.
+    """
+    
+    def __init__(self, bot: "TicketsBot", interval: float = 5.0, maxsize: int = 100):
+        """Initialize the dispatcher."""
+        self.bot = bot
+        self.log = bot.log.tickets
+        self.interval = interval
+        self.maxsize = maxsize
+        
+        self._buffers: Dict[str, Deque[Entry]] = {}
+        self._flushing: Dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+        
+        self.posted = 0
+        self.sent = 0
+        self.dropped = 0
+    
+    def __len__(self) -> int:
+        return sum(len(buffer) for buffer in self._buffers.values())
+    
+    def start(self) -> None:
+        """Start logging ticket events and flushing buffers."""
+        if self._task is None:
+            get_event_bus().add_listener(self._on_event, LOGGED_EVENTS)
+            self._task = asyncio.create_task(self.run())
+    
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Stop flushing, giving what's buffered ``timeout`` seconds to be posted."""
+        if self._task is None:
+            return
+        get_event_bus().remove_listener(self._on_event)
+        self._task.cancel()
+        self._task = None
+        self.flush()
+        if self._flushing:
+            await asyncio.wait(list(self._flushing.values()), timeout=timeout)
+        for task in self._flushing.values():
+            task.cancel()
+    
+    def _on_event(self, event: TicketEvent) -> None:
+        """Buffer an event that belongs in the log."""
+        self.post(event.guild_id, event)
+    
+    def post(self, guild_id: str, entry: Entry) -> None:
+        """Buffer an embed or event for a guild's log channel, without waiting."""
+        buffer = self._buffers.get(guild_id)
+        if buffer is None:
+            buffer = self._buffers[guild_id] = deque(maxlen=self.maxsize)
+        if len(buffer) == self.maxsize:
+            # The deque discards the oldest entry on append
+            self.dropped += 1
+            LOG_ENTRIES_DROPPED.inc()
+        buffer.append(entry)
+        self.posted += 1
+    
+    async def run(self) -> None:
+        """Flush every guild's buffer each ``interval`` seconds."""
+        while True:
+            await asyncio.sleep(self.interval)
+            self.flush()
+    
+    def flush(self) -> None:
+        """Start flushing each guild with entries and no flush in flight."""
+        for guild_id in list(self._buffers):
+            if guild_id not in self._flushing:
+                self._flushing[guild_id] = asyncio.create_task(self._flush_guild(guild_id))
+    
+    async def _flush_guild(self, guild_id: str) -> None:
+        """Post a guild's buffered entries, up to ten to a message."""
+        entries: List[Entry] = []
+        sent = 0
+        try:
+            buffer = self._buffers.pop(guild_id, None)
+            if not buffer:
+                return
+            entries = list(buffer)
+            
+            channel = await self._channel(guild_id)
+            if channel is None:
+                return
+            
+            for batch in split_embeds([self._render(entry) for entry in entries]):
+                await channel.send(embeds=batch)
+                sent += len(batch)
+                self.sent += len(batch)
+                LOG_MESSAGES_SENT.inc()
+                LOG_ENTRIES_SENT.inc(len(batch))
+        
+        except discord.HTTPException as e:
+            if e.status >= 500:
+                self.log.warning(f"Discord failed to post to the log channel of guild {guild_id}, retrying: {e}")
+                self._requeue(guild_id, entries[sent:])
+            else:
+                # Missing permissions, a deleted channel or a rejected message won't post on a retry
+                self.log.error(f"Dropped {len(entries) - sent} entries for the log channel of guild {guild_id}: {e}")
+                self.dropped += len(entries) - sent
+                LOG_ENTRIES_DROPPED.inc(len(entries) - sent)
+        except Exception as e:
+            self.log.error(f"Error posting to the log channel of guild {guild_id}: {e}")
+            self._requeue(guild_id, entries[sent:])
+        finally:
+            self._flushing.pop(guild_id, None)
+    
+    def _requeue(self, guild_id: str, entries: List[Entry]) -> None:
+        """Put entries that weren't posted back ahead of those buffered since."""
+        merged = entries + list(self._buffers.pop(guild_id, ()))
+        overflow = max(len(merged) - self.maxsize, 0)
+        if overflow:
+            self.dropped += overflow
+            LOG_ENTRIES_DROPPED.inc(overflow)
+        if merged:
+            # The deque keeps the newest entries
+            self._buffers[guild_id] = deque(merged, maxlen=self.maxsize)
+    
+    async def _channel(self, guild_id: str) -> Optional[Any]:
+        """Get a guild's log channel, if it has one the bot can see."""
+        guild_settings = await self.bot.ticket_manager.get_guild_settings(guild_id)
+        guild = self.bot.get_guild(int(guild_id))
+        if not guild_settings or not guild_settings.log_channel or guild is None:
+            return None
+        return guild.get_channel(int(guild_settings.log_channel))
+    
+    def _render(self, entry: Entry) -> discord.Embed:
+        """Build the embed for a log entry."""
+        if isinstance(entry, discord.Embed):
+            return entry
+        
+        embed = ExtendedEmbedBuilder()
+        number = entry.data.get("number")
+        if entry.type == TICKET_CREATED:
+            embed.set_success_color()
+            embed.set_title(f"Ticket #{number} created")
+            embed.set_description(f"<#{entry.ticket_id}> by <@{entry.data.get('created_by')}>")
+        elif entry.type == TICKET_CLAIMED:
+            embed.set_title(f"Ticket #{number} claimed")
+            embed.set_description(f"<#{entry.ticket_id}> by <@{entry.data.get('claimed_by')}>")
+        return embed
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get dispatcher statistics."""
+        return {
+            "buffered": len(self),
+            "guilds": len(self._buffers),
+            "posted": self.posted,
+            "sent": self.sent,
+            "dropped": self.dropped,
+        }
\ No newline at end of file
@@ -1,19 +1,34 @@
 """Ticket management system."""
 
 import json
-from datetime import datetime
-from typing import Dict, List, Optional, TYPE_CHECKING
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
 import discord
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.orm import selectinload
 
-from database.models import Ticket, Category, Guild, User, QuestionAnswer
+from bot.interactions.components import TICKET_ACTIONS_CLAIMABLE_VIEW, TICKET_ACTIONS_VIEW
+from bot.tickets.close_jobs import STEPS as CLOSE_STEPS
+from bot.tickets.events import (
+    TICKET_CLAIMED, TICKET_CLOSED, TICKET_CREATED, TICKET_MESSAGE, TicketEvent, get_event_bus
+)
+from database.instrumentation import traced
+from database.models import CloseJob, Ticket, Category, Guild, User, QuestionAnswer
+from utils.cache import TTLCache
 from utils.embed import ExtendedEmbedBuilder
+from utils.metrics import TICKET_OPERATION_SECONDS, timed, track_cache
 
 if TYPE_CHECKING:
     from bot.client import TicketsBot
 
+# Most tickets one bulk close takes on, stalest first
+MAX_BULK_CLOSE = 1000
+
+# A ticket's last_message_at is written at most this often, in seconds
+ACTIVITY_WRITE_INTERVAL = 60.0
+
 
 class TicketManager:
     """Core ticket management functionality."""
@@ -22,7 +37,17 @@ class TicketManager:
         """Initialize the ticket manager."""
         self.bot = bot
         self.log = bot.log.tickets
+        self.events = get_event_bus()
+        
+        # channel ID -> guild ID for ticket channels, "" for other channels
+        self._ticket_channels: TTLCache[str, str] = TTLCache(maxsize=50000, ttl=600)
+        track_cache("ticket_channels", self._ticket_channels)
+        
+        # Tickets whose activity was written within ACTIVITY_WRITE_INTERVAL
+        self._activity_written: TTLCache[str, bool] = TTLCache(maxsize=50000, ttl=ACTIVITY_WRITE_INTERVAL)
     
+    @timed(TICKET_OPERATION_SECONDS, "get_ticket")
+    @traced("get_ticket")
     async def get_ticket(self, channel_id: str) -> Optional[Ticket]:
         """Get a ticket by channel ID."""
         try:
@@ -43,6 +68,22 @@ class TicketManager:
             self.log.error(f"Error getting ticket {channel_id}: {e}")
             return None
     
+    @timed(TICKET_OPERATION_SECONDS, "get_guild_settings")
+    @traced("get_guild_settings")
+    async def get_guild_settings(self, guild_id: str) -> Optional[Guild]:
+        """Get a guild's settings."""
+        try:
+            async with self.bot.db_session_factory() as session:
+                result = await session.execute(
+                    select(Guild).where(Guild.id == guild_id)
+                )
+                return result.scalar_one_or_none()
+        except Exception as e:
+            self.log.error(f"Error getting settings for guild {guild_id}: {e}")
+            return None
+    
+    @timed(TICKET_OPERATION_SECONDS, "create_ticket")
+    @traced("create_ticket")
     async def create_ticket(
         self,
         guild: discord.Guild,
@@ -121,6 +162,20 @@ class TicketManager:
                 session.add(ticket)
                 await session.commit()
                 
+                self._ticket_channels.set(ticket.id, ticket.guild_id)
+                self.bot.members.opened_ticket(user)
+                self.events.publish(TicketEvent(
+                    TICKET_CREATED,
+                    ticket.guild_id,
+                    ticket.id,
+                    {
+                        "number": ticket_number,
+                        "category_id": category.id,
+                        "created_by": ticket.created_by_id,
+                        "topic": topic,
+                    }
+                ))
+                
                 # Send opening message
                 await self.send_opening_message(channel, ticket, category, user)
                 
@@ -141,11 +196,7 @@ class TicketManager:
         """Send the opening message for a ticket."""
         try:
             # Get guild settings
-            async with self.bot.db_session_factory() as session:
-                result = await session.execute(
-                    select(Guild).where(Guild.id == str(channel.guild.id))
-                )
-                guild_settings = result.scalar_one_or_none()
+            guild_settings = await self.get_guild_settings(str(channel.guild.id))
             
             if not guild_settings:
                 return
@@ -166,25 +217,10 @@ class TicketManager:
             if ticket.topic:
                 embed.add_field(name="Topic", value=ticket.topic, inline=False)
             
-            # Create action buttons
-            view = discord.ui.View(timeout=None)
-            
-            if category.claiming:
-                claim_button = discord.ui.Button(
-                    style=discord.ButtonStyle.primary,
-                    label="Claim",
-                    emoji="🙋‍♂️",
-                    custom_id="ticket_claim"
-                )
-                view.add_item(claim_button)
-            
-            close_button = discord.ui.Button(
-                style=discord.ButtonStyle.danger,
-                label="Close",
-                emoji="🔒",
-                custom_id="ticket_close"
+            # Every ticket shares the same prebuilt buttons
+            view = self.bot.components.get_view(
+                TICKET_ACTIONS_CLAIMABLE_VIEW if category.claiming else TICKET_ACTIONS_VIEW
             )
-            view.add_item(close_button)
             
             # Send message
             message = await channel.send(
@@ -205,19 +241,22 @@ class TicketManager:
         except Exception as e:
             self.log.error(f"Error sending opening message: {e}")
     
+    @timed(TICKET_OPERATION_SECONDS, "close_ticket")
+    @traced("close_ticket")
     async def close_ticket(
         self,
         channel: discord.TextChannel,
         user: discord.Member,
         reason: Optional[str] = None
     ) -> bool:
-        """Close a ticket."""
+        """Close a ticket; archiving and deleting its channel continue in the background."""
         try:
             ticket = await self.get_ticket(str(channel.id))
             if not ticket or not ticket.open:
                 return False
             
-            # Update ticket in database
+            # Close the ticket and record what's left to do in one transaction,
+            # so a restart can't leave it closed with its channel still there
             async with self.bot.db_session_factory() as session:
                 await session.execute(
                     Ticket.__table__.update()
@@ -229,14 +268,29 @@ class TicketManager:
                         closed_reason=reason
                     )
                 )
+                session.add(CloseJob(
+                    ticket_id=ticket.id,
+                    guild_id=ticket.guild_id,
+                    channel_id=str(channel.id),
+                    closed_by_id=str(user.id),
+                    reason=reason,
+                    step=CLOSE_STEPS[0],
+                    run_after=datetime.utcnow()
+                ))
                 await session.commit()
             
-            # Archive if enabled
-            if ticket.guild.archive:
-                await self.archive_ticket(ticket)
+            self._ticket_channels.pop(ticket.id)
+            self.bot.members.closed_ticket(int(ticket.guild_id), int(ticket.created_by_id))
+            self.events.publish(TicketEvent(
+                TICKET_CLOSED,
+                ticket.guild_id,
+                ticket.id,
+                {"number": ticket.number, "closed_by": str(user.id), "reason": reason}
+            ))
             
-            # Delete channel
-            await channel.delete(reason=f"Ticket closed by {user}")
+            # Archive, send the transcript, log and delete the channel
+            if self.bot.close_jobs is not None:
+                self.bot.close_jobs.wake()
             
             self.log.info(f"Closed ticket #{ticket.number}")
             return True
@@ -245,6 +299,93 @@ class TicketManager:
             self.log.error(f"Error closing ticket: {e}")
             return False
     
+    @timed(TICKET_OPERATION_SECONDS, "bulk_close")
+    @traced("bulk_close")
+    async def bulk_close(
+        self,
+        guild_id: str,
+        closed_by_id: str,
+        reason: Optional[str] = None,
+        stale_after: Optional[timedelta] = None,
+        category_id: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Close a guild's open tickets that have gone quiet, or are in a category, all at once.
+        
+        The tickets are selected in one query and closed in one statement,
+        with their close jobs inserted in the same transaction; the close
+        job worker then archives them and deletes their channels a few per
+        guild at a time. Returns the batch to follow with ``batch_progress``
+        and how many tickets it closed, or None on error.
+        """
+        if stale_after is None and category_id is None:
+            raise ValueError("A bulk close needs stale_after or category_id")
+        if stale_after is not None and stale_after <= timedelta(0):
+            raise ValueError("A bulk close's stale_after must be positive")
+        
+        try:
+            now = datetime.utcnow()
+            batch = uuid.uuid4().hex
+            query = (
+                select(Ticket.id, Ticket.number, Ticket.created_by_id)
+                .where(Ticket.guild_id == guild_id, Ticket.open == True)
+                .order_by(Ticket.last_message_at)
+                .limit(MAX_BULK_CLOSE)
+            )
+            if stale_after is not None:
+                query = query.where(Ticket.last_message_at < now - stale_after)
+            if category_id is not None:
+                query = query.where(Ticket.category_id == category_id)
+            
+            async with self.bot.db_session_factory() as session:
+                tickets = (await session.execute(query.with_for_update())).all()
+                if tickets:
+                    await session.execute(
+                        Ticket.__table__.update()
+                        .where(Ticket.id.in_([ticket.id for ticket in tickets]))
+                        .values(
+                            open=False,
+                            closed_at=now,
+                            closed_by_id=closed_by_id,
+                            closed_reason=reason
+                        )
+                    )
+                    await session.execute(insert(CloseJob), [
+                        {
+                            "ticket_id": ticket.id,
+                            "guild_id": guild_id,
+                            "channel_id": ticket.id,
+                            "closed_by_id": closed_by_id,
+                            "reason": reason,
+                            "batch": batch,
+                            "step": CLOSE_STEPS[0],
+                            "run_after": now,
+                        }
+                        for ticket in tickets
+                    ])
+                    await session.commit()
+            
+            for ticket in tickets:
+                self._ticket_channels.pop(ticket.id)
+                self.bot.members.closed_ticket(int(guild_id), int(ticket.created_by_id))
+                self.events.publish(TicketEvent(
+                    TICKET_CLOSED,
+                    guild_id,
+                    ticket.id,
+                    {"number": ticket.number, "closed_by": closed_by_id, "reason": reason}
+                ))
+            
+            if tickets and self.bot.close_jobs is not None:
+                self.bot.close_jobs.wake()
+            
+            self.log.info(f"Bulk closed {len(tickets)} tickets in guild {guild_id}")
+            return {"batch": batch, "tickets": len(tickets)}
+            
+        except Exception as e:
+            self.log.error(f"Error bulk closing tickets in guild {guild_id}: {e}")
+            return None
+    
+    @timed(TICKET_OPERATION_SECONDS, "claim_ticket")
+    @traced("claim_ticket")
     async def claim_ticket(
         self,
         channel: discord.TextChannel,
@@ -265,6 +406,14 @@ class TicketManager:
                 )
                 await session.commit()
             
+            self.bot.members.keep_staff(user)
+            self.events.publish(TicketEvent(
+                TICKET_CLAIMED,
+                ticket.guild_id,
+                ticket.id,
+                {"number": ticket.number, "claimed_by": str(user.id)}
+            ))
+            
             # Update channel permissions
             await channel.set_permissions(
                 user,
@@ -288,8 +437,62 @@ class TicketManager:
             self.log.error(f"Error claiming ticket: {e}")
             return False
     
-    async def archive_ticket(self, ticket: Ticket) -> None:
-        """Archive a ticket (placeholder for now)."""
-        # TODO: Implement ticket archiving
-        self.log.info(f"Archiving ticket #{ticket.number} (not implemented yet)")
-        pass
\ No newline at end of file
+    async def is_ticket_channel(self, channel_id: str) -> bool:
+        """Check whether a channel belongs to an open ticket, caching the answer."""
+        guild_id = self._ticket_channels.get(channel_id)
+        if guild_id is None:
+            try:
+                async with self.bot.db_session_factory() as session:
+                    result = await session.execute(
+                        select(Ticket.guild_id).where(Ticket.id == channel_id, Ticket.open == True)
+                    )
+                    guild_id = result.scalar_one_or_none() or ""
+            except Exception as e:
+                self.log.error(f"Error looking up ticket channel {channel_id}: {e}")
+                return False
+            self._ticket_channels.set(channel_id, guild_id)
+        return guild_id != ""
+    
+    async def record_activity(self, channel_id: str) -> None:
+        """Update a ticket's last_message_at, at most once per ACTIVITY_WRITE_INTERVAL."""
+        if channel_id in self._activity_written:
+            return
+        self._activity_written.set(channel_id, True)
+        try:
+            async with self.bot.db_session_factory() as session:
+                await session.execute(
+                    Ticket.__table__.update()
+                    .where(Ticket.id == channel_id)
+                    .values(last_message_at=datetime.utcnow())
+                )
+                await session.commit()
+        except Exception as e:
+            self.log.error(f"Error recording activity in ticket {channel_id}: {e}")
+    
+    @timed(TICKET_OPERATION_SECONDS, "handle_message")
+    @traced("handle_message")
+    async def handle_message(self, message: discord.Message) -> None:
+        """Record activity in a ticket channel and publish the message."""
+        if message.guild is None:
+            return
+        if not await self.is_ticket_channel(str(message.channel.id)):
+            return
+        
+        # The bot's own messages don't keep a ticket from going stale
+        if not message.author.bot:
+            await self.record_activity(str(message.channel.id))
+        if not self.events.has_subscribers(str(message.guild.id), TICKET_MESSAGE):
+            return
+        
+        self.events.publish(TicketEvent(
+            TICKET_MESSAGE,
+            str(message.guild.id),
+            str(message.channel.id),
+            {
+                "id": str(message.id),
+                "author_id": str(message.author.id),
+                "author": message.author.display_name,
+                "bot": message.author.bot,
+                "content": message.content,
+            }
+        ))
\ No newline at end of file
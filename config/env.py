@@ -1,5 +1,6 @@
 """Environment variable validation and loading."""
 
+import json
 import os
 import sys
 from pathlib import Path
@@ -16,6 +17,9 @@ class Settings(BaseSettings):
     # Database settings
     db_provider: str = "sqlite"
     db_connection_url: Optional[str] = None
+    # Read replica for the API's and the bot's read-only queries
+    db_replica_url: Optional[str] = None
+    db_replica_fallback: float = 5.0  # Seconds a guild's reads stay on the primary after a write
     
     # Discord settings
     discord_token: str
@@ -30,14 +34,79 @@ class Settings(BaseSettings):
     http_external: str
     http_internal: Optional[str] = None
     http_trust_proxy: bool = False
+    http_compress_min_size: int = 1024
+    dashboard_dir: Optional[str] = None
+    
+    # API process settings (0 workers serves the API from the bot's event loop)
+    api_workers: int = 0
+    ipc_socket_path: str = ".tickets-ipc.sock"
+    
+    # Shard clusters: 0 runs one gateway process; N runs a supervisor that
+    # spawns N processes, each an auto-sharded client over a range of shards
+    clusters: int = 0
+    shard_count: Optional[int] = None
+    cluster_socket_dir: str = ".tickets-clusters"
+    cluster_health_interval: float = 10.0
+    # Set by the supervisor for each cluster process
+    cluster_id: Optional[int] = None
+    cluster_shards: Optional[str] = None
+    
+    # Member cache: "full" keeps every member (and presences for private
+    # bots); "lean" keeps only staff and members with open tickets and
+    # fetches other members' roles on demand, caching them for a while
+    member_cache: str = "full"
+    member_roles_ttl: float = 60.0
+    member_roles_cache_size: int = 10000
+    
+    # Component handlers that haven't replied this many seconds in are
+    # deferred, leaving time before Discord's 3 second deadline
+    interaction_ack_budget: float = 2.0
+    
+    # Close jobs: steps left after a ticket is closed (archive, transcript,
+    # log, delete) run in the background, this many tickets at a time and
+    # at most CLOSE_WORKERS_PER_GUILD of them for the same guild
+    close_workers: int = 4
+    close_workers_per_guild: int = 2
+    close_job_max_attempts: int = 5
+    close_job_retry_delay: float = 30.0
+    
+    # Log channel posts are buffered per guild and flushed this often, ten
+    # to a message; a guild's oldest entries are dropped past the buffer size
+    log_channel_flush_interval: float = 5.0
+    log_channel_buffer_size: int = 100
+    
+    # Archive retention: archived messages, users, roles and channels of
+    # tickets closed more than ARCHIVE_RETENTION_DAYS ago are pruned (0
+    # keeps them); ARCHIVE_RETENTION_GUILDS overrides the days per guild,
+    # e.g. {"123456789012345678": 30}. Rows are deleted a batch at a time
+    # with a pause between batches, every ARCHIVE_RETENTION_INTERVAL hours
+    archive_retention_days: int = 0
+    archive_retention_guilds: str = "{}"
+    archive_retention_interval: float = 24.0
+    archive_retention_batch_size: int = 500
+    archive_retention_pause: float = 0.5
+    archive_retention_vacuum: bool = False
+    
+    # Query tracing: slow-query log and N+1 detection per operation
+    db_instrumentation: bool = False
+    db_slow_query_ms: float = 100.0
+    db_n_plus_one_threshold: int = 5
     
     # Optional settings
     public_bot: bool = False
     publish_commands: bool = True
+    command_hash_file: str = ".commands.hash"
     invalidate_tokens: Optional[str] = None
     override_archive: bool = False
     super_users: str = "[]"
     
+    # Logging settings
+    log_level: str = "INFO"
+    log_json: bool = False
+    log_file: Optional[str] = None
+    log_sample_burst: int = 20
+    log_sample_window: float = 10.0
+    
     @validator("db_connection_url")
     def validate_db_url(cls, v, values):
         """Validate database connection URL."""
@@ -49,6 +118,13 @@ class Settings(BaseSettings):
             v = "sqlite+aiosqlite:///tickets.db"
         return v
     
+    @validator("db_replica_fallback")
+    def validate_db_replica_fallback(cls, v):
+        """Validate the read replica fallback window."""
+        if v < 0:
+            raise ValueError("DB_REPLICA_FALLBACK must not be negative")
+        return v
+    
     @validator("db_provider")
     def validate_db_provider(cls, v):
         """Validate database provider."""
@@ -57,6 +133,84 @@ class Settings(BaseSettings):
             raise ValueError(f"DB_PROVIDER must be one of: {', '.join(allowed)}")
         return v
     
+    @validator("clusters")
+    def validate_clusters(cls, v):
+        """Validate cluster count."""
+        if v < 0:
+            raise ValueError("CLUSTERS must be 0 or more")
+        return v
+    
+    @validator("shard_count")
+    def validate_shard_count(cls, v, values):
+        """Validate shard count."""
+        if v is not None and v < max(values.get("clusters", 0), 1):
+            raise ValueError("SHARD_COUNT must be at least 1 and at least CLUSTERS")
+        return v
+    
+    @validator("interaction_ack_budget")
+    def validate_interaction_ack_budget(cls, v):
+        """Validate interaction acknowledgement budget."""
+        if not 0 < v < 3:
+            raise ValueError("INTERACTION_ACK_BUDGET must be between 0 and 3 seconds")
+        return v
+    
+    @validator("close_workers", "close_workers_per_guild", "close_job_max_attempts")
+    def validate_close_jobs(cls, v):
+        """Validate close job limits."""
+        if v < 1:
+            raise ValueError("CLOSE_WORKERS, CLOSE_WORKERS_PER_GUILD and CLOSE_JOB_MAX_ATTEMPTS must be at least 1")
+        return v
+    
+    @validator("log_channel_flush_interval", "log_channel_buffer_size")
+    def validate_log_channel(cls, v):
+        """Validate log channel batching."""
+        if v <= 0:
+            raise ValueError("LOG_CHANNEL_FLUSH_INTERVAL and LOG_CHANNEL_BUFFER_SIZE must be greater than 0")
+        return v
+    
+    @validator("archive_retention_guilds")
+    def validate_archive_retention_guilds(cls, v):
+        """Validate per-guild archive retention."""
+        try:
+            policies = json.loads(v)
+        except ValueError:
+            policies = None
+        if not isinstance(policies, dict) or not all(
+            isinstance(days, int) and days >= 0 for days in policies.values()
+        ):
+            raise ValueError("ARCHIVE_RETENTION_GUILDS must map guild IDs to a number of days, 0 or more")
+        return v
+    
+    @validator("archive_retention_days")
+    def validate_archive_retention_days(cls, v):
+        """Validate archive retention."""
+        if v < 0:
+            raise ValueError("ARCHIVE_RETENTION_DAYS must be 0 or more")
+        return v
+    
+    @validator("archive_retention_interval", "archive_retention_batch_size")
+    def validate_archive_retention_schedule(cls, v):
+        """Validate archive retention batching."""
+        if v <= 0:
+            raise ValueError("ARCHIVE_RETENTION_INTERVAL and ARCHIVE_RETENTION_BATCH_SIZE must be greater than 0")
+        return v
+    
+    @validator("member_cache")
+    def validate_member_cache(cls, v):
+        """Validate member cache policy."""
+        allowed = ["full", "lean"]
+        if v.lower() not in allowed:
+            raise ValueError(f"MEMBER_CACHE must be one of: {', '.join(allowed)}")
+        return v.lower()
+    
+    @validator("log_level")
+    def validate_log_level(cls, v):
+        """Validate logging level."""
+        allowed = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+        if v.upper() not in allowed:
+            raise ValueError(f"LOG_LEVEL must be one of: {', '.join(allowed)}")
+        return v.upper()
+    
     @validator("encryption_key")
     def validate_encryption_key(cls, v):
         """Validate encryption key length."""
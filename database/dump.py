@@ -0,0 +1,169 @@
+"""Streaming dumps of the whole database, and restoring them into any provider."""
+
+import gzip
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import DateTime, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from database.models import Base
+from utils.serialization import dumps_bytes, loads
+
+FORMAT = "tickets-dump"
+VERSION = 1
+
+# Rows per line of the dump, and per insert when restoring
+DEFAULT_CHUNK_SIZE = 1000
+
+# Called with a table name and the rows done so far
+Progress = Callable[[str, int], None]
+
+
+class DumpError(Exception):
+    """Raised when a dump file can't be restored."""
+
+
+async def dump_database(
+    engine: AsyncEngine,
+    path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[Progress] = None
+) -> Dict[str, int]:
+    """Write every table to a gzipped JSON lines file, parents before children.
+    
+    Rows are read with a streaming cursor in primary key order and written
+    ``chunk_size`` to a line, so memory use doesn't grow with the database.
+    Each table is a header line with its columns, lines of rows as arrays,
+    and a footer with the row count. Returns the rows written per table.
+    """
+    counts: Dict[str, int] = {}
+    async with engine.connect() as connection:
+        existing = set(await connection.run_sync(lambda sync: inspect(sync).get_table_names()))
+        with gzip.open(path, "wb", compresslevel=6) as file:
+            file.write(dumps_bytes({
+                "format": FORMAT,
+                "version": VERSION,
+                "dialect": engine.dialect.name,
+                "created_at": datetime.utcnow(),
+            }) + b"\n")
+            
+            for table in Base.metadata.sorted_tables:
+                # Tables added since the database was last started don't exist yet
+                if table.name not in existing:
+                    continue
+                
+                columns = [column.name for column in table.columns]
+                file.write(dumps_bytes({"table": table.name, "columns": columns}) + b"\n")
+                count = 0
+                result = await connection.stream(
+                    select(table).order_by(*table.primary_key.columns).execution_options(yield_per=chunk_size)
+                )
+                async for rows in result.partitions(chunk_size):
+                    file.write(dumps_bytes({"rows": [list(row) for row in rows]}) + b"\n")
+                    count += len(rows)
+                    if progress is not None:
+                        progress(table.name, count)
+                file.write(dumps_bytes({"end": table.name, "count": count}) + b"\n")
+                counts[table.name] = count
+    return counts
+
+
+def read_dump(path: Path) -> Iterator[Dict[str, Any]]:
+    """Read a dump's lines one at a time, checking its header."""
+    with gzip.open(path, "rb") as file:
+        try:
+            try:
+                header = loads(file.readline() or b"null")
+            except ValueError:
+                header = None
+            if not isinstance(header, dict) or header.get("format") != FORMAT:
+                raise DumpError(f"{path} is not a tickets dump")
+            if header.get("version") != VERSION:
+                raise DumpError(
+                    f"{path} is a version {header.get('version')} dump; this version reads version {VERSION}"
+                )
+            for number, line in enumerate(file, 2):
+                try:
+                    yield loads(line)
+                except ValueError:
+                    raise DumpError(f"Line {number} of {path} is corrupt") from None
+        # The gzip stream ends early, or its data is damaged
+        except (EOFError, zlib.error):
+            raise DumpError(f"{path} is truncated") from None
+
+
+async def restore_database(
+    engine: AsyncEngine,
+    path: Path,
+    progress: Optional[Progress] = None
+) -> Dict[str, int]:
+    """Replace every table's rows with a dump's, in one transaction.
+    
+    The schema must already exist. Rows are inserted a line of the dump at
+    a time with one multi-row insert, so a dump taken from one provider
+    restores into any other. Columns the dump has but the schema doesn't
+    are dropped; columns it lacks get their defaults. Returns the rows
+    restored per table.
+    """
+    counts: Dict[str, int] = {}
+    tables = Base.metadata.tables
+    async with engine.begin() as connection:
+        # Children before parents
+        for table in reversed(Base.metadata.sorted_tables):
+            await connection.execute(table.delete())
+        
+        table = None
+        columns: List[str] = []
+        keep: List[int] = []
+        datetimes: List[int] = []
+        count = 0
+        for line in read_dump(path):
+            if "table" in line:
+                table = tables.get(line["table"])
+                if table is None:
+                    raise DumpError(f"The dump has a table {line['table']!r} that the schema doesn't")
+                keep = [i for i, name in enumerate(line["columns"]) if name in table.columns]
+                columns = [line["columns"][i] for i in keep]
+                datetimes = [
+                    position for position, name in enumerate(columns)
+                    if isinstance(table.columns[name].type, DateTime)
+                ]
+                count = 0
+            
+            elif "rows" in line:
+                if table is None:
+                    raise DumpError("The dump has rows before any table")
+                rows = []
+                for values in line["rows"]:
+                    values = [values[i] for i in keep]
+                    for position in datetimes:
+                        if values[position] is not None:
+                            values[position] = datetime.fromisoformat(values[position])
+                    rows.append(dict(zip(columns, values)))
+                await connection.execute(table.insert(), rows)
+                count += len(rows)
+                if progress is not None:
+                    progress(table.name, count)
+            
+            elif "end" in line:
+                if table is None or line["end"] != table.name or line["count"] != count:
+                    raise DumpError(f"The dump of {line['end']} is incomplete: expected {line['count']} rows")
+                counts[table.name] = count
+                table = None
+        
+        if table is not None:
+            raise DumpError(f"The dump ends in the middle of {table.name}")
+        
+        # Explicit IDs don't advance PostgreSQL's sequences
+        if engine.dialect.name == "postgresql":
+            for table in Base.metadata.sorted_tables:
+                column = table.autoincrement_column
+                if column is not None:
+                    await connection.execute(text(
+                        f"SELECT setval(pg_get_serial_sequence('{table.name}', '{column.name}'), "
+                        f"COALESCE(MAX({column.name}), 1), MAX({column.name}) IS NOT NULL) FROM {table.name}"
+                    ))
+    return counts
\ No newline at end of file
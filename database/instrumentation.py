@@ -0,0 +1,194 @@
+"""Statement timing, slow-query logging and N+1 detection for SQLAlchemy engines."""
+
+import functools
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, TypeVar
+
+from utils.logger import get_bot_logger
+from utils.metrics import DB_QUERY_SECONDS, get_registry
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+DB_QUERIES_PER_OPERATION = get_registry().histogram(
+    "tickets_db_queries_per_operation",
+    "Statements executed by one traced operation.",
+    ["operation"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+DB_N_PLUS_ONE = get_registry().counter(
+    "tickets_db_suspected_n_plus_one",
+    "Operations that repeated an identical statement too many times.",
+    ["operation"],
+)
+
+_STATEMENT_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE|TABLE|ON)\s+"?(\w+)', re.IGNORECASE)
+_statement_labels: Dict[str, str] = {}
+MAX_STATEMENT_LABELS = 1000
+
+
+def statement_label(statement: str) -> str:
+    """Label a SQL statement by its verb and first table, e.g. ``SELECT tickets``."""
+    label = _statement_labels.get(statement)
+    if label is None:
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "EMPTY"
+        match = _STATEMENT_TABLE.search(statement)
+        label = f"{verb} {match.group(1)}" if match else verb
+        # Statements are compiled once and reused, so this stays small
+        if len(_statement_labels) < MAX_STATEMENT_LABELS:
+            _statement_labels[statement] = label
+    return label
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Describe bound parameters by type only, so values never reach the logs."""
+    if executemany:
+        count = len(parameters) if parameters else 0
+        return f"{count} x {parameter_shape(parameters[0]) if count else '()'}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+
+class OperationTrace:
+    """Statements executed while an interaction or ticket operation runs."""
+    
+    __slots__ = ("name", "parent", "queries", "duration", "statements", "flagged")
+    
+    def __init__(self, name: str, parent: Optional["OperationTrace"] = None):
+        self.name = name
+        self.parent = parent
+        self.queries = 0
+        self.duration = 0.0
+        self.statements: Counter = Counter()
+        self.flagged = False
+    
+    @property
+    def path(self) -> str:
+        """The operation and the operations it runs inside, outermost first."""
+        return f"{self.parent.path} > {self.name}" if self.parent is not None else self.name
+
+
+_current_operation: ContextVar[Optional[OperationTrace]] = ContextVar("current_operation", default=None)
+
+
+class QueryInstrumentation:
+    """Time every statement an engine runs and, when enabled, trace them.
+    
+    Statement timing feeds the ``tickets_db_query_seconds`` histogram and is
+    always on. Tracing attributes statements to the current operation, logs
+    slow statements with their parameter shape and flags an operation that
+    repeats one statement ``n_plus_one_threshold`` times. While disabled,
+    ``operation`` returns immediately and statements skip the tracing path.
+    """
+    
+    def __init__(self, enabled: bool = False, slow_query_ms: float = 100.0, n_plus_one_threshold: int = 5):
+        """Initialize the instrumentation."""
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.log = get_bot_logger().database
+        
+        self.slow_queries = 0
+        self.suspected_n_plus_one = 0
+    
+    def configure(self, settings: Any) -> None:
+        """Apply the database instrumentation settings."""
+        self.enabled = settings.db_instrumentation
+        self.slow_query_ms = settings.db_slow_query_ms
+        self.n_plus_one_threshold = settings.db_n_plus_one_threshold
+    
+    def install(self, engine: Any) -> None:
+        """Listen to an engine's statement events."""
+        from sqlalchemy import event
+        
+        sync_engine = getattr(engine, "sync_engine", engine)
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+    
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+    
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        label = context.execution_options.get("metrics_label") if context is not None else None
+        DB_QUERY_SECONDS.labels(label or statement_label(statement)).observe(elapsed)
+        
+        if self.enabled:
+            self.trace(statement, parameters, executemany, elapsed)
+    
+    def trace(self, statement: str, parameters: Any, executemany: bool, elapsed: float) -> None:
+        """Attribute a statement to the current operation and check it."""
+        operation = _current_operation.get()
+        path = operation.path if operation is not None else "-"
+        
+        if elapsed * 1000 >= self.slow_query_ms:
+            self.slow_queries += 1
+            self.log.warning(
+                f"Slow query ({elapsed * 1000:.1f}ms) in {path}: "
+                f"{' '.join(statement.split())} {parameter_shape(parameters, executemany)}"
+            )
+        
+        # Flag repetition once, in the innermost operation that shows it
+        check = True
+        while operation is not None:
+            operation.queries += 1
+            operation.duration += elapsed
+            operation.statements[statement] += 1
+            if check and operation.statements[statement] == self.n_plus_one_threshold and not operation.flagged:
+                check = False
+                operation.flagged = True
+                self.suspected_n_plus_one += 1
+                DB_N_PLUS_ONE.labels(operation.name).inc()
+                self.log.warning(
+                    f"Suspected N+1 in {operation.path}: statement repeated "
+                    f"{self.n_plus_one_threshold} times: {' '.join(statement.split())}"
+                )
+            operation = operation.parent
+    
+    @contextmanager
+    def operation(self, name: str) -> Iterator[Optional[OperationTrace]]:
+        """Attribute the statements run inside the block to an operation."""
+        if not self.enabled:
+            yield None
+            return
+        
+        trace = OperationTrace(name, _current_operation.get())
+        token = _current_operation.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_operation.reset(token)
+            DB_QUERIES_PER_OPERATION.labels(name).observe(trace.queries)
+
+
+# Global query instrumentation instance
+_query_instrumentation_instance: Optional[QueryInstrumentation] = None
+
+
+def get_query_instrumentation() -> QueryInstrumentation:
+    """Get the global query instrumentation instance."""
+    global _query_instrumentation_instance
+    if _query_instrumentation_instance is None:
+        _query_instrumentation_instance = QueryInstrumentation()
+    return _query_instrumentation_instance
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorate a coroutine function to trace its statements as an operation."""
+    def decorator(function: F) -> F:
+        @functools.wraps(function)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            instrumentation = get_query_instrumentation()
+            if not instrumentation.enabled:
+                return await function(*args, **kwargs)
+            with instrumentation.operation(name):
+                return await function(*args, **kwargs)
+        
+        return wrapper
+    return decorator
\ No newline at end of file
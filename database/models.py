@@ -1,16 +1,20 @@
 """Database models converted from Prisma schema."""
 
 from datetime import datetime
+from itertools import chain
 from typing import List, Optional
 
 from sqlalchemy import (
-    Boolean, Column, DateTime, ForeignKey, Integer, String, Text,
-    UniqueConstraint, func
+    Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text,
+    UniqueConstraint, event, func
 )
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, sessionmaker
+from sqlalchemy.orm import Session, relationship, sessionmaker
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
+from utils.cache import CATEGORIES, GUILD_SETTINGS, TAGS, get_invalidator
+from database.instrumentation import get_query_instrumentation
+
 Base = declarative_base()
 
 
@@ -108,6 +112,11 @@ class Ticket(Base):
     archived_users = relationship("ArchivedUser", back_populates="ticket", cascade="all, delete")
     archived_roles = relationship("ArchivedRole", back_populates="ticket", cascade="all, delete")
     feedback = relationship("Feedback", back_populates="ticket", cascade="all, delete")
+    
+    __table_args__ = (
+        # Keyset pagination of a guild's tickets by (created_at, id)
+        Index("tickets_guild_id_created_at_id_idx", "guild_id", "created_at", "id"),
+    )
 
 
 class User(Base):
@@ -265,16 +274,117 @@ class ArchivedRole(Base):
     )
 
 
+# Background jobs
+class CloseJob(Base):
+    """Outbox entry for the steps left to finish closing a ticket."""
+    __tablename__ = "close_jobs"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    ticket_id = Column(String, ForeignKey("tickets.id", ondelete="CASCADE"), nullable=False, unique=True)
+    guild_id = Column(String, nullable=False)
+    channel_id = Column(String, nullable=False)
+    closed_by_id = Column(String, nullable=True)
+    reason = Column(String, nullable=True)
+    batch = Column(String, nullable=True)  # Bulk close the job belongs to
+    step = Column(String, nullable=False)  # Next step to run
+    cursor = Column(String, nullable=True)  # Last message archived
+    status = Column(String, default="pending")  # pending, done or failed
+    attempts = Column(Integer, default=0)
+    last_error = Column(Text, nullable=True)
+    run_after = Column(DateTime, default=func.now())
+    created_at = Column(DateTime, default=func.now())
+    finished_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        # The worker polls for due pending jobs
+        Index("close_jobs_status_run_after_idx", "status", "run_after"),
+        # Progress of a bulk close
+        Index("close_jobs_batch_idx", "batch"),
+    )
+
+
+# Dashboard sessions
+class SessionRevocation(Base):
+    """When a user last logged out; their dashboard sessions issued before it are rejected."""
+    __tablename__ = "session_revocations"
+    
+    user_id = Column(String, primary_key=True)
+    revoked_at = Column(DateTime, nullable=False)
+
+
+# Cache invalidation
+_CACHED_TABLES = {
+    "guilds": GUILD_SETTINGS,
+    "categories": CATEGORIES,
+    "questions": CATEGORIES,
+    "tags": TAGS,
+}
+
+
+def _collect_invalidations(session: Session, flush_context) -> None:
+    """Remember which cached guild resources a flush touched."""
+    pending = session.info.setdefault("invalidations", set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        resource = _CACHED_TABLES.get(getattr(obj, "__tablename__", None))
+        if resource:
+            guild_id = obj.id if isinstance(obj, Guild) else getattr(obj, "guild_id", None)
+            pending.add((resource, guild_id))
+
+
+def _collect_bulk_invalidations(orm_execute_state) -> None:
+    """Remember bulk UPDATE/DELETE statements against cached tables."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    resource = _CACHED_TABLES.get(getattr(table, "name", None))
+    if resource:
+        # The affected guilds are not known, so invalidate all of them
+        orm_execute_state.session.info.setdefault("invalidations", set()).add((resource, None))
+
+
+def _apply_invalidations(session: Session) -> None:
+    """Invalidate cached resources once their changes are committed."""
+    pending = session.info.pop("invalidations", None)
+    if pending:
+        invalidator = get_invalidator()
+        for resource, guild_id in pending:
+            invalidator.invalidate(resource, guild_id)
+
+
+def _discard_invalidations(session: Session) -> None:
+    """Forget pending invalidations of rolled back changes."""
+    session.info.pop("invalidations", None)
+
+
+event.listen(Session, "after_flush", _collect_invalidations)
+event.listen(Session, "do_orm_execute", _collect_bulk_invalidations)
+event.listen(Session, "after_commit", _apply_invalidations)
+event.listen(Session, "after_rollback", _discard_invalidations)
+
+
 # Database initialization
-async def init_db(database_url: str):
-    """Initialize database connection and create tables."""
+def connect_db(database_url: str, settings=None):
+    """Create an engine and session factory without touching the schema."""
     engine = create_async_engine(database_url, echo=False)
     
-    # Create tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Time statements, and trace them if DB_INSTRUMENTATION is enabled
+    instrumentation = get_query_instrumentation()
+    if settings is not None:
+        instrumentation.configure(settings)
+    instrumentation.install(engine)
     
     # Create session factory
     async_session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
     
+    return engine, async_session_factory
+
+
+async def init_db(database_url: str, settings=None):
+    """Initialize database connection and create tables."""
+    engine, async_session_factory = connect_db(database_url, settings)
+    
+    # Create tables
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
     return engine, async_session_factory
\ No newline at end of file
@@ -0,0 +1,248 @@
+"""Pruning the archives of tickets closed long ago, a batch at a time."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import DateTime, case, delete, func, literal, null, select, text, union
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from database.models import ArchivedChannel, ArchivedMessage, ArchivedRole, ArchivedUser, Ticket
+from utils.logger import get_bot_logger
+from utils.metrics import get_registry
+
+# Archive tables pruned, messages first as they hold nearly all the rows
+ARCHIVE_TABLES = ("archived_messages", "archived_users", "archived_roles", "archived_channels")
+
+# The first run waits this long after startup, out of the way of startup itself
+FIRST_RUN_DELAY = 600.0
+
+ARCHIVE_ROWS_PRUNED = get_registry().counter(
+    "tickets_archive_rows_pruned",
+    "Archive rows deleted by retention.",
+    ["table"],
+)
+ARCHIVE_PRUNE_SECONDS = get_registry().histogram(
+    "tickets_archive_prune_seconds",
+    "Time spent on a retention run, including pauses and maintenance.",
+    buckets=(1, 5, 15, 60, 300, 900, 3600, 14400),
+)
+
+
+class ArchivePruner:
+    """Delete the archived messages, users, roles and channels of old closed tickets.
+    
+    A ticket's archive expires ``retention_days`` after it was closed, or
+    after its guild's own number of days in ``guild_retention`` (0 keeps
+    that guild's archives). Rows are deleted ``batch_size`` at a time in
+    primary key order, each batch in its own short transaction with
+    ``pause`` seconds between batches, so the bot's own writes are never
+    held up for long. Tickets themselves are kept. Afterwards the archive
+    tables are vacuumed or analysed as the database supports it.
+    """
+    
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        session_factory,
+        retention_days: int = 0,
+        guild_retention: Optional[Dict[str, int]] = None,
+        batch_size: int = 500,
+        pause: float = 0.5,
+        vacuum: bool = False,
+        interval: float = 86400.0
+    ):
+        """Initialize the pruner."""
+        self.engine = engine
+        self.session_factory = session_factory
+        self.retention_days = retention_days
+        self.guild_retention = guild_retention or {}
+        self.batch_size = batch_size
+        self.pause = pause
+        self.vacuum = vacuum
+        self.interval = interval
+        self.log = get_bot_logger().database
+        
+        self._task: Optional[asyncio.Task] = None
+        self.last_report: Optional[Dict[str, Any]] = None
+    
+    @property
+    def enabled(self) -> bool:
+        """Check whether any guild's archives expire."""
+        return bool(self.retention_days) or any(self.guild_retention.values())
+    
+    def start(self) -> None:
+        """Prune every ``interval`` seconds, starting a while after startup."""
+        if self._task is None and self.enabled:
+            self._task = asyncio.create_task(self.run())
+    
+    async def stop(self) -> None:
+        """Stop pruning; a run in progress stops between batches."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+    
+    async def run(self) -> None:
+        """Prune on a schedule."""
+        await asyncio.sleep(min(FIRST_RUN_DELAY, self.interval))
+        while True:
+            try:
+                await self.prune()
+            except Exception as e:
+                self.log.error(f"Error pruning archives: {e}")
+            await asyncio.sleep(self.interval)
+    
+    def expired(self, now: datetime) -> List[Any]:
+        """Conditions matching tickets whose archives have expired."""
+        def cutoff(days: int) -> Any:
+            return literal(now - timedelta(days=days), DateTime()) if days else null()
+        
+        expires: Any = cutoff(self.retention_days)
+        if self.guild_retention:
+            expires = case(
+                {guild_id: cutoff(days) for guild_id, days in self.guild_retention.items()},
+                value=Ticket.guild_id,
+                else_=expires
+            )
+        return [Ticket.open == False, Ticket.closed_at.is_not(None), Ticket.closed_at < expires]
+    
+    async def prune(self) -> Dict[str, Any]:
+        """Delete expired archives, then reclaim their space; returns what was done."""
+        start = time.perf_counter()
+        expired = self.expired(datetime.utcnow())
+        size_before = await self.archive_size()
+        rows: Dict[str, int] = dict.fromkeys(ARCHIVE_TABLES, 0)
+        
+        # Messages, keyset-paged by ID among those of expired tickets
+        content_bytes = 0
+        last_id = ""
+        while True:
+            async with self.session_factory() as session:
+                batch = (await session.execute(
+                    select(ArchivedMessage.id, func.length(ArchivedMessage.content))
+                    .join(Ticket, Ticket.id == ArchivedMessage.ticket_id)
+                    .where(ArchivedMessage.id > last_id, *expired)
+                    .order_by(ArchivedMessage.id)
+                    .limit(self.batch_size)
+                )).all()
+                if not batch:
+                    break
+                result = await session.execute(
+                    delete(ArchivedMessage).where(ArchivedMessage.id.in_([row[0] for row in batch]))
+                )
+                await session.commit()
+            
+            last_id = batch[-1][0]
+            rows["archived_messages"] += result.rowcount
+            content_bytes += sum(length or 0 for _, length in batch)
+            ARCHIVE_ROWS_PRUNED.labels("archived_messages").inc(result.rowcount)
+            if len(batch) < self.batch_size:
+                break
+            await asyncio.sleep(self.pause)
+        
+        # Users, roles and channels, a batch of expired tickets at a time. Only
+        # tickets that still have some are paged through, as those pruned on
+        # earlier runs soon far outnumber them; each table's key leads with
+        # the ticket ID, so this reads their indexes.
+        last_ticket = ""
+        while True:
+            archived = union(*(
+                select(model.ticket_id.label("ticket_id")).where(model.ticket_id > last_ticket)
+                for model in (ArchivedUser, ArchivedRole, ArchivedChannel)
+            )).subquery()
+            async with self.session_factory() as session:
+                ticket_ids = list((await session.execute(
+                    select(Ticket.id)
+                    .join(archived, archived.c.ticket_id == Ticket.id)
+                    .where(*expired)
+                    .order_by(Ticket.id)
+                    .limit(self.batch_size)
+                )).scalars())
+                if not ticket_ids:
+                    break
+                deleted = {}
+                for model in (ArchivedUser, ArchivedRole, ArchivedChannel):
+                    result = await session.execute(delete(model).where(model.ticket_id.in_(ticket_ids)))
+                    deleted[model.__tablename__] = result.rowcount
+                await session.commit()
+            
+            last_ticket = ticket_ids[-1]
+            for table, count in deleted.items():
+                rows[table] += count
+                ARCHIVE_ROWS_PRUNED.labels(table).inc(count)
+            if len(ticket_ids) < self.batch_size:
+                break
+            await asyncio.sleep(self.pause)
+        
+        if any(rows.values()):
+            await self.maintain()
+        size_after = await self.archive_size()
+        
+        seconds = time.perf_counter() - start
+        ARCHIVE_PRUNE_SECONDS.observe(seconds)
+        report = {
+            "rows": rows,
+            "content_bytes": content_bytes,
+            "size_before": size_before,
+            "size_after": size_after,
+            "reclaimed_bytes": size_before - size_after if size_before is not None and size_after is not None else None,
+            "seconds": seconds,
+        }
+        self.last_report = report
+        self.log.info(
+            f"Pruned {sum(rows.values())} archive rows ({rows['archived_messages']} messages, "
+            f"{content_bytes} bytes of content) in {seconds:.1f}s"
+            + (f", reclaimed {report['reclaimed_bytes']} bytes" if report["reclaimed_bytes"] is not None else "")
+        )
+        return report
+    
+    async def maintain(self) -> None:
+        """Reclaim deleted rows' space and refresh planner statistics, as the database allows."""
+        dialect = self.engine.dialect.name
+        # VACUUM can't run inside a transaction
+        async with self.engine.connect() as connection:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            if dialect == "sqlite":
+                # Freed pages are reused either way; VACUUM rewrites the whole file to shrink it
+                if self.vacuum:
+                    await connection.execute(text("VACUUM"))
+                for table in ARCHIVE_TABLES:
+                    await connection.execute(text(f"ANALYZE {table}"))
+            elif dialect == "postgresql":
+                # Plain VACUUM makes the space reusable without locking out writers
+                for table in ARCHIVE_TABLES:
+                    await connection.execute(text(f"VACUUM (ANALYZE) {table}"))
+            elif dialect in ("mysql", "mariadb"):
+                # OPTIMIZE rebuilds the table to return its space
+                statement = "OPTIMIZE TABLE" if self.vacuum else "ANALYZE TABLE"
+                for table in ARCHIVE_TABLES:
+                    await connection.execute(text(f"{statement} {table}"))
+    
+    async def archive_size(self) -> Optional[int]:
+        """Bytes used by the archive tables, or by the whole database for SQLite."""
+        dialect = self.engine.dialect.name
+        try:
+            async with self.engine.connect() as connection:
+                if dialect == "sqlite":
+                    page_size = (await connection.execute(text("PRAGMA page_size"))).scalar()
+                    pages = (await connection.execute(text("PRAGMA page_count"))).scalar()
+                    free = (await connection.execute(text("PRAGMA freelist_count"))).scalar()
+                    return (pages - free) * page_size
+                if dialect == "postgresql":
+                    sizes = [
+                        (await connection.execute(text(f"SELECT pg_total_relation_size('{table}')"))).scalar()
+                        for table in ARCHIVE_TABLES
+                    ]
+                    return sum(sizes)
+                if dialect in ("mysql", "mariadb"):
+                    result = await connection.execute(text(
+                        "SELECT SUM(data_length + index_length) FROM information_schema.tables "
+                        "WHERE table_schema = DATABASE() AND table_name IN "
+                        "('archived_messages', 'archived_users', 'archived_roles', 'archived_channels')"
+                    ))
+                    return int(result.scalar() or 0)
+        except Exception as e:
+            self.log.warning(f"Couldn't measure the archive size: {e}")
+        return None
\ No newline at end of file
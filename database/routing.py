@@ -0,0 +1,152 @@
+"""Routing read-only sessions to a read replica."""
+
+import time
+from itertools import chain
+from typing import Any, Dict, Optional
+from weakref import WeakSet
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from bot.tickets.events import TICKET_CHANGES, TicketEvent, get_event_bus
+from database.models import Guild, connect_db
+from utils.cache import CATEGORIES, GUILD_SETTINGS, TAGS, get_invalidator
+from utils.logger import get_bot_logger
+from utils.metrics import get_registry
+
+# Cached resources whose invalidation means a guild was written to
+WRITTEN_RESOURCES = (GUILD_SETTINGS, CATEGORIES, TAGS)
+
+# Past this many guilds, forget writes older than the fallback window
+MAX_TRACKED_GUILDS = 10000
+
+DB_READS = get_registry().counter(
+    "tickets_db_reads",
+    "Read-only sessions opened with a replica configured, by the engine they were routed to.",
+    ["engine"],
+)
+
+# Routers told about writes committed in this process
+_routers: "WeakSet[SessionRouter]" = WeakSet()
+
+
+class SessionRouter:
+    """Open read-only sessions on a read replica, when one is configured.
+    
+    A replica lags the primary, so for ``fallback`` seconds after a guild
+    is written to its reads go to the primary instead, and the reader sees
+    its own writes. Writes are noticed from sessions committed in this
+    process, ticket events, and cache invalidations, the last two of which
+    reach API workers from the bot over IPC. Writes whose guild isn't known
+    from the rows, like bulk activity updates, don't move reads back to the
+    primary. Without a replica every session is opened on the primary.
+    """
+    
+    def __init__(self, primary_factory, replica_factory=None, fallback: float = 5.0):
+        """Initialize the router."""
+        self.primary_factory = primary_factory
+        self.replica_factory = replica_factory
+        self.fallback = fallback
+        self._written: Dict[str, float] = {}
+        self._written_all = float("-inf")
+    
+    def start(self) -> None:
+        """Start noticing writes."""
+        _routers.add(self)
+        get_event_bus().add_listener(self._on_event, TICKET_CHANGES)
+        invalidator = get_invalidator()
+        for resource in WRITTEN_RESOURCES:
+            invalidator.subscribe(resource, self.wrote)
+    
+    def stop(self) -> None:
+        """Stop noticing writes."""
+        _routers.discard(self)
+        get_event_bus().remove_listener(self._on_event)
+        invalidator = get_invalidator()
+        for resource in WRITTEN_RESOURCES:
+            invalidator.unsubscribe(resource, self.wrote)
+    
+    def _on_event(self, event: TicketEvent) -> None:
+        """Note the guild of a ticket event as written to."""
+        self.wrote(event.guild_id)
+    
+    def wrote(self, guild_id: Optional[str] = None) -> None:
+        """Note that a guild, or every guild if ``guild_id`` is None, was written to."""
+        now = time.monotonic()
+        if guild_id is None:
+            self._written_all = now
+            self._written.clear()
+            return
+        
+        self._written[guild_id] = now
+        if len(self._written) > MAX_TRACKED_GUILDS:
+            cutoff = now - self.fallback
+            self._written = {guild: at for guild, at in self._written.items() if at >= cutoff}
+    
+    def recently_written(self, guild_id: Optional[str] = None) -> bool:
+        """Check whether a guild was written to within the fallback window."""
+        written = self._written_all
+        if guild_id is not None:
+            written = max(written, self._written.get(guild_id, written))
+        return time.monotonic() - written < self.fallback
+    
+    def read(self, guild_id: Optional[str] = None):
+        """Open a session for reads only, on the replica unless the guild was just written to."""
+        if self.replica_factory is None:
+            return self.primary_factory()
+        if self.recently_written(guild_id):
+            DB_READS.labels("primary").inc()
+            return self.primary_factory()
+        DB_READS.labels("replica").inc()
+        return self.replica_factory()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get routing statistics."""
+        cutoff = time.monotonic() - self.fallback
+        return {
+            "replica": self.replica_factory is not None,
+            "recently_written": sum(1 for at in self._written.values() if at >= cutoff),
+        }
+
+
+async def connect_replica(database_url: str, primary_engine, settings=None):
+    """Create a read replica's engine and session factory.
+    
+    A SQLite replica is a read-only connection to the primary's own file
+    (``sqlite+aiosqlite:///file:tickets.db?mode=ro&uri=true``); the primary
+    is switched to WAL mode so it can write while the replica reads.
+    """
+    if primary_engine.dialect.name == "sqlite":
+        async with primary_engine.connect() as connection:
+            mode = (await connection.exec_driver_sql("PRAGMA journal_mode=WAL")).scalar()
+        if str(mode).lower() != "wal":
+            get_bot_logger().database.warning(f"SQLite is in {mode} mode; replica reads will block writes")
+    return connect_db(database_url, settings)
+
+
+def _collect_written_guilds(session: Session, flush_context) -> None:
+    """Remember which guilds a flush wrote rows of."""
+    written = session.info.setdefault("written_guilds", set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        guild_id = obj.id if isinstance(obj, Guild) else getattr(obj, "guild_id", None)
+        if guild_id is not None:
+            written.add(guild_id)
+
+
+def _apply_written_guilds(session: Session) -> None:
+    """Tell every router about the guilds a commit wrote to."""
+    written = session.info.pop("written_guilds", None)
+    if written:
+        for router in list(_routers):
+            for guild_id in written:
+                router.wrote(guild_id)
+
+
+def _discard_written_guilds(session: Session) -> None:
+    """Forget the guilds of rolled back writes."""
+    session.info.pop("written_guilds", None)
+
+
+event.listen(Session, "after_flush", _collect_written_guilds)
+event.listen(Session, "after_commit", _apply_written_guilds)
+event.listen(Session, "after_rollback", _discard_written_guilds)
\ No newline at end of file
@@ -17,16 +17,20 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import argparse
 import asyncio
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
+from typing import List, Optional
 
 # Add project root to Python path
 sys.path.insert(0, str(Path(__file__).parent.absolute()))
 
-from config.env import load_environment
-from utils.logger import setup_logger
-from bot.client import TicketsBot
+# Heavy modules (pydantic, structlog, discord, SQLAlchemy...) are imported
+# inside main() so that their cost shows up in --profile-startup
+from utils.startup import ImportTimer, StartupProfiler
 
 
 def print_banner() -> None:
@@ -52,31 +56,163 @@ def check_python_version() -> None:
     print(f"✅ Python {sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}")
 
 
-async def main() -> None:
+async def report_startup(bot, profiler: StartupProfiler) -> None:
+    """Print the startup profile once the bot is ready, then shut down."""
+    await bot.wait_until_ready()
+    profiler.mark("ready")
+    
+    # Concurrent setup phases measured by the bot itself
+    for phase, duration in bot.startup_timings.items():
+        profiler.record(f"setup_hook.{phase}", duration)
+    
+    print(profiler.report())
+    await bot.close()
+
+
+async def main(profiler: Optional[StartupProfiler] = None) -> None:
     """Main entry point for the Discord Tickets Bot."""
+    profiler = profiler or StartupProfiler()
     print_banner()
     check_python_version()
     
     # Load environment variables
-    load_environment()
+    with profiler.phase("settings"):
+        from config.env import load_environment
+        settings = load_environment()
     
     # Setup logging
-    logger = setup_logger()
+    with profiler.phase("logging"):
+        from utils.logger import setup_logger, shutdown_logger
+        logger = setup_logger(
+            level=settings.log_level,
+            log_file=Path(settings.log_file) if settings.log_file else None,
+            json_logs=settings.log_json,
+            sample_burst=settings.log_sample_burst,
+            sample_window=settings.log_sample_window,
+        )
     logger.info("Starting Discord Tickets Bot...")
     
+    # Supervise shard cluster processes instead of running the bot here
+    if settings.clusters > 0 and settings.cluster_id is None:
+        from bot.cluster import ClusterSupervisor
+        try:
+            await ClusterSupervisor(settings).run()
+        finally:
+            shutdown_logger()
+        return
+    
     try:
         # Initialize and start the bot
-        bot = TicketsBot()
+        with profiler.phase("import bot.client"):
+            from bot.client import create_bot
+        with profiler.phase("bot init"):
+            bot = create_bot()
+        
+        if profiler.import_timer is not None:
+            asyncio.create_task(report_startup(bot, profiler))
+        
         await bot.start()
     except KeyboardInterrupt:
         logger.info("Bot shutdown requested by user")
     except Exception as e:
         logger.error(f"Fatal error occurred: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        shutdown_logger()
 
 
-if __name__ == "__main__":
+async def database_tool(args: argparse.Namespace) -> None:
+    """Dump the database to a file, or restore it from one."""
+    from config.env import load_environment
+    from utils.logger import setup_logger, shutdown_logger
+    settings = load_environment()
+    setup_logger(level="WARNING")
+    
+    from database.dump import DumpError, dump_database, restore_database
+    from database.models import connect_db, init_db
+    database_url = settings.db_connection_url or "sqlite+aiosqlite:///tickets.db"
+    
+    tables: List[str] = []
+    
+    def progress(table: str, rows: int) -> None:
+        # One line per table, rewritten as its rows are done
+        if table not in tables:
+            if tables:
+                print()
+            tables.append(table)
+        print(f"\r   {table}: {rows:,} rows", end="", flush=True)
+    
+    start = time.perf_counter()
     try:
-        asyncio.run(main())
+        if args.command == "dump":
+            path = Path(args.file or f"user/dumps/{datetime.now():%Y-%m-%d-%H-%M-%S}-db.jsonl.gz")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            engine, _ = connect_db(database_url)
+            print(f"📦 Dumping the {settings.db_provider} database to {path}")
+            counts = await dump_database(engine, path, args.chunk_size, progress)
+        else:
+            path = Path(args.file)
+            # The schema is created first, so a dump can be restored into an empty database
+            engine, _ = await init_db(database_url)
+            print(f"📦 Restoring {path} into the {settings.db_provider} database")
+            counts = await restore_database(engine, path, progress)
+        await engine.dispose()
+    except (DumpError, OSError) as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+    finally:
+        shutdown_logger()
+    
+    rows = sum(counts.values())
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ {rows:,} rows from {len(counts)} tables in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(prog="tickets-bot", description="Discord Tickets Bot")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print phase and import timings once the bot is ready, then exit"
+    )
+    commands = parser.add_subparsers(dest="command")
+    
+    dump = commands.add_parser("dump", help="dump the database to a compressed file")
+    dump.add_argument("-f", "--file", help="where to write the dump (default: user/dumps/<date>-db.jsonl.gz)")
+    dump.add_argument("--chunk-size", type=int, default=1000, help="rows read and written at a time")
+    
+    restore = commands.add_parser("restore", help="replace the database's contents with a dump")
+    restore.add_argument("-f", "--file", required=True, help="the dump to restore")
+    restore.add_argument(
+        "-y",
+        "--yes",
+        action="store_true",
+        required=True,
+        help="confirm that every row in the database will be deleted"
+    )
+    return parser.parse_args(argv)
+
+
+def cli(argv: Optional[List[str]] = None) -> None:
+    """Console script entry point."""
+    args = parse_args(argv)
+    
+    if args.command in ("dump", "restore"):
+        asyncio.run(database_tool(args))
+        return
+    
+    profiler = None
+    if args.profile_startup:
+        import_timer = ImportTimer()
+        import_timer.install()
+        profiler = StartupProfiler(import_timer)
+    
+    try:
+        asyncio.run(main(profiler))
     except KeyboardInterrupt:
-        print("\n👋 Goodbye!")
\ No newline at end of file
+        print("\n👋 Goodbye!")
+
+
+if __name__ == "__main__":
+    cli()
\ No newline at end of file
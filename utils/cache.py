@@ -0,0 +1,172 @@
+"""Caches, invalidation and versioning shared by the bot and the API."""
+
+import asyncio
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+# Resources whose cached representations depend on guild configuration
+GUILD_SETTINGS = "guild"
+CATEGORIES = "categories"
+TAGS = "tags"
+
+# Dashboard sessions, keyed by user ID instead of guild ID
+SESSIONS = "sessions"
+
+InvalidationCallback = Callable[[Optional[str]], None]
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Least-recently-used cache whose entries also expire after a time limit."""
+    
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+        """Initialize the cache."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        # key -> (expiry time, value), least recently used first
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def __contains__(self, key: K) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+    
+    def get(self, key: K, default: Any = None) -> Any:
+        """Get a live entry, marking it as recently used."""
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+        
+        expires_at, value = item
+        if expires_at <= self.timer():
+            del self._data[key]
+            self.misses += 1
+            return default
+        
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """Store an entry, evicting the least recently used one if full."""
+        self._data[key] = (self.timer() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def pop(self, key: K, default: Any = None) -> Any:
+        """Remove an entry and return its value."""
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+    
+    def remove_if(self, predicate: Callable[[K, V], bool]) -> int:
+        """Remove every entry matching ``predicate``; return how many were removed."""
+        keys = [key for key, (_, value) in self._data.items() if predicate(key, value)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+    
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._data.clear()
+
+
+_MISSING = object()
+
+
+class SingleFlight(Generic[K, V]):
+    """Share one in-flight call between concurrent callers with the same key."""
+    
+    def __init__(self):
+        """Initialize the coalescer."""
+        self._calls: Dict[K, "asyncio.Task[V]"] = {}
+        self.calls = 0
+        self.shared = 0
+    
+    async def do(self, key: K, function: Callable[[], Awaitable[V]]) -> V:
+        """Await ``function()``, or the call already running for ``key``."""
+        task = self._calls.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(function())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.shared += 1
+        
+        # A cancelled caller must not cancel the call for everyone else
+        return await asyncio.shield(task)
+    
+    def _finish(self, key: K, task: "asyncio.Task[V]") -> None:
+        """Forget a finished call."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every caller went away
+            task.exception()
+
+
+class CacheInvalidator:
+    """Track per-guild resource versions and notify subscribers of changes."""
+    
+    def __init__(self):
+        """Initialize the invalidator."""
+        self._clock = 0
+        self._versions: Dict[Tuple[str, str], int] = {}
+        self._global_versions: Dict[str, int] = {}
+        self._subscribers: Dict[str, List[InvalidationCallback]] = defaultdict(list)
+    
+    def subscribe(self, resource: str, callback: InvalidationCallback) -> None:
+        """Call ``callback(guild_id)`` whenever ``resource`` changes.
+        
+        ``guild_id`` is ``None`` when every guild is affected.
+        """
+        self._subscribers[resource].append(callback)
+    
+    def unsubscribe(self, resource: str, callback: InvalidationCallback) -> None:
+        """Stop calling a callback added with ``subscribe``."""
+        callbacks = self._subscribers.get(resource)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+    
+    def version(self, resource: str, guild_id: str) -> int:
+        """Get the current version of a guild's resource."""
+        return max(
+            self._versions.get((resource, guild_id), 0),
+            self._global_versions.get(resource, 0)
+        )
+    
+    def invalidate(self, resource: str, guild_id: Optional[str] = None) -> None:
+        """Bump the version of a resource for one guild, or for all guilds."""
+        self._clock += 1
+        if guild_id is None:
+            self._global_versions[resource] = self._clock
+            # Per-guild versions are superseded by the global one
+            for key in [key for key in self._versions if key[0] == resource]:
+                del self._versions[key]
+        else:
+            self._versions[(resource, guild_id)] = self._clock
+        
+        for callback in self._subscribers.get(resource, ()):
+            callback(guild_id)
+
+
+# Global invalidator instance
+_invalidator_instance: Optional[CacheInvalidator] = None
+
+
+def get_invalidator() -> CacheInvalidator:
+    """Get the global cache invalidator instance."""
+    global _invalidator_instance
+    if _invalidator_instance is None:
+        _invalidator_instance = CacheInvalidator()
+    return _invalidator_instance
\ No newline at end of file
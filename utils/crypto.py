@@ -0,0 +1,42 @@
+"""Symmetric encryption of stored secrets with ENCRYPTION_KEY.
+
+This is Fernet, not the JS version's Cryptr (AES-256-GCM), so neither
+can decrypt what the other encrypted.
+"""
+
+import base64
+import hashlib
+import os
+from functools import lru_cache
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from config.env import get_settings
+
+__all__ = ["InvalidToken", "decrypt", "encrypt"]
+
+
+@lru_cache(maxsize=1)
+def _get_fernet() -> Fernet:
+    """Derive the cipher from ENCRYPTION_KEY once."""
+    digest = hashlib.sha256(get_settings().encryption_key.encode("utf-8")).digest()
+    return Fernet(base64.urlsafe_b64encode(digest))
+
+
+def _disabled() -> bool:
+    """Check whether encryption has been turned off, like the JS version allows."""
+    return os.getenv("DISABLE_ENCRYPTION", "").lower() == "true"
+
+
+def encrypt(data: str) -> str:
+    """Encrypt a string."""
+    if _disabled():
+        return data
+    return _get_fernet().encrypt(data.encode("utf-8")).decode("ascii")
+
+
+def decrypt(data: str) -> str:
+    """Decrypt a string produced by ``encrypt``."""
+    if _disabled():
+        return data
+    return _get_fernet().decrypt(data.encode("ascii")).decode("utf-8")
\ No newline at end of file
@@ -1,6 +1,11 @@
 """Extended Discord embed utilities."""
 
-from typing import Optional, TYPE_CHECKING
+import re
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TYPE_CHECKING
+
+from utils.cache import GUILD_SETTINGS, get_invalidator
+from utils.i18n import I18n, get_i18n
 
 if TYPE_CHECKING:
     import discord
@@ -60,6 +65,40 @@ except ImportError:
     })()
 
 
+DEFAULT_COLOUR = discord.Color.blue().value
+
+# Discord's limit on the length of an embed field's value
+FIELD_VALUE_LIMIT = 1024
+
+
+def truncate(text: str, limit: int) -> str:
+    """Shorten text to at most ``limit`` characters, ending in an ellipsis if cut."""
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+@lru_cache(maxsize=256)
+def parse_colour(value: Optional[str]) -> int:
+    """Parse a hex string or Discord colour name (e.g. "DarkGreen") into an integer."""
+    if not value:
+        return DEFAULT_COLOUR
+    
+    hex_value = value[1:] if value.startswith("#") else value
+    try:
+        return int(hex_value, 16)
+    except ValueError:
+        pass
+    
+    # Colour names map to discord.Color factories, "DarkGreen" -> dark_green()
+    factory = getattr(discord.Color, re.sub(r"(?<!^)(?=[A-Z])", "_", value).lower(), None)
+    if callable(factory):
+        try:
+            return factory().value
+        except TypeError:
+            pass
+    
+    return DEFAULT_COLOUR
+
+
 class ExtendedEmbedBuilder(discord.Embed):
     """Extended embed builder with additional utilities."""
     
@@ -80,17 +119,23 @@ class ExtendedEmbedBuilder(discord.Embed):
         """Set color from hex string."""
         if not DISCORD_AVAILABLE:
             return self
-            
-        if hex_color.startswith("#"):
-            hex_color = hex_color[1:]
-        
-        try:
-            color_int = int(hex_color, 16)
-            self.color = discord.Color(color_int)
-        except ValueError:
-            # Fallback to default color
-            self.color = discord.Color.blue()
         
+        # Parsing is cached, so repeated guild colours cost a dict lookup
+        self.color = discord.Color(parse_colour(hex_color))
+        return self
+    
+    def set_color(self, value: str) -> "ExtendedEmbedBuilder":
+        """Set color from a hex string or colour name."""
+        return self.set_color_from_hex(value)
+    
+    def set_title(self, title: str) -> "ExtendedEmbedBuilder":
+        """Set the embed title."""
+        self.title = title
+        return self
+    
+    def set_description(self, description: str) -> "ExtendedEmbedBuilder":
+        """Set the embed description."""
+        self.description = description
         return self
     
     def set_success_color(self) -> "ExtendedEmbedBuilder":
@@ -111,4 +156,138 @@ class ExtendedEmbedBuilder(discord.Embed):
     def add_blank_field(self, inline: bool = False) -> "ExtendedEmbedBuilder":
         """Add a blank field for spacing."""
         self.add_field(name="\u200b", value="\u200b", inline=inline)
-        return self
\ No newline at end of file
+        return self
+
+
+# Static embed templates: name -> (colour setting, title key, description key)
+EMBED_TEMPLATES: Dict[str, Tuple[str, str, str]] = {
+    "not_ticket": ("error_colour", "misc.not_ticket.title", "misc.not_ticket.description"),
+    "permission_denied": ("error_colour", "misc.permission_denied.title", "misc.permission_denied.description"),
+    "already_closed": ("error_colour", "misc.already_closed.title", "misc.already_closed.description"),
+    "error": ("error_colour", "misc.error.title", "misc.error.description"),
+    "no_categories": ("error_colour", "categories.none.title", "categories.none.description"),
+    "ticket_created": ("success_colour", "ticket.created.title", "ticket.created.description"),
+    "ticket_claimed": ("success_colour", "ticket.claimed.title", "ticket.claimed.description"),
+    "ticket_closed": ("success_colour", "ticket.closed.title", "ticket.closed.description"),
+}
+
+# Fallbacks for guilds without a settings row (mirrors the Guild column defaults)
+_GUILD_DEFAULTS = {
+    "error_colour": "Red",
+    "footer": "Discord Tickets by eartharoid",
+    "locale": "en-GB",
+    "primary_colour": "#009999",
+    "success_colour": "Green",
+}
+
+GuildSettingsLoader = Callable[[str], Awaitable[Optional[Any]]]
+
+
+class EmbedTemplateCache:
+    """Prepared static embeds keyed by guild, locale and template name.
+    
+    Decoded colours, footers and translated text are computed once per key;
+    ``get`` hands out a fresh embed with only the dynamic parts filled in.
+    Entries are dropped when the guild's settings are invalidated.
+    """
+    
+    def __init__(self, loader: Optional[GuildSettingsLoader] = None, i18n: Optional[I18n] = None):
+        """Initialize the template cache."""
+        self.loader = loader
+        self._i18n = i18n
+        self.hits = 0
+        self.misses = 0
+        self._templates: Dict[str, Dict[Tuple[Optional[str], str], Dict[str, Any]]] = {}
+        
+        get_invalidator().subscribe(GUILD_SETTINGS, self.invalidate)
+    
+    def close(self) -> None:
+        """Stop following settings changes and drop every template."""
+        get_invalidator().unsubscribe(GUILD_SETTINGS, self.invalidate)
+        self._templates.clear()
+    
+    @property
+    def i18n(self) -> I18n:
+        """Get the i18n manager, loading locales on first use."""
+        if self._i18n is None:
+            self._i18n = get_i18n()
+        return self._i18n
+    
+    async def get(
+        self,
+        guild_id: str,
+        name: str,
+        locale: Optional[str] = None,
+        *,
+        icon_url: Optional[str] = None,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        **fields
+    ) -> ExtendedEmbedBuilder:
+        """Get a copy of a template, formatting its text with ``fields``."""
+        guild_templates = self._templates.get(guild_id)
+        prepared = guild_templates.get((locale, name)) if guild_templates else None
+        
+        if prepared is None:
+            self.misses += 1
+            invalidator = get_invalidator()
+            version = invalidator.version(GUILD_SETTINGS, guild_id)
+            guild_settings = await self.loader(guild_id) if self.loader else None
+            prepared = self.prepare(guild_settings, name, locale)
+            
+            # Don't store settings that changed while they were being loaded
+            if invalidator.version(GUILD_SETTINGS, guild_id) == version:
+                self._templates.setdefault(guild_id, {})[(locale, name)] = prepared
+        else:
+            self.hits += 1
+        
+        return self.render(prepared, icon_url=icon_url, title=title, description=description, **fields)
+    
+    def prepare(self, guild_settings: Optional[Any], name: str, locale: Optional[str] = None) -> Dict[str, Any]:
+        """Resolve the static parts of a template for a guild."""
+        def setting(attr: str) -> Any:
+            return getattr(guild_settings, attr, None) or _GUILD_DEFAULTS[attr]
+        
+        colour_setting, title_key, description_key = EMBED_TEMPLATES[name]
+        translate = self.i18n.get_locale(locale or setting("locale"))
+        
+        return {
+            "colour": discord.Color(parse_colour(setting(colour_setting))),
+            "description": translate(description_key),
+            "footer": setting("footer"),
+            "title": translate(title_key),
+        }
+    
+    @staticmethod
+    def render(
+        prepared: Dict[str, Any],
+        icon_url: Optional[str] = None,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        **fields
+    ) -> ExtendedEmbedBuilder:
+        """Build an embed from a prepared template."""
+        title = prepared["title"] if title is None else title
+        description = prepared["description"] if description is None else description
+        
+        if fields:
+            try:
+                title = title.format(**fields)
+                description = description.format(**fields)
+            except (KeyError, ValueError):
+                pass
+        
+        return ExtendedEmbedBuilder(
+            title=title,
+            description=description,
+            color=prepared["colour"],
+            text=prepared["footer"],
+            icon_url=icon_url,
+        )
+    
+    def invalidate(self, guild_id: Optional[str] = None) -> None:
+        """Drop prepared templates for a guild, or for every guild."""
+        if guild_id is None:
+            self._templates.clear()
+        else:
+            self._templates.pop(guild_id, None)
\ No newline at end of file
@@ -1,19 +1,170 @@
-"""Advanced logging setup with structured logging and rich console output."""
+"""Advanced logging setup with structured logging and rich console output.
 
+All formatting and I/O happen on a background ``QueueListener`` thread; the
+event loop only builds the event dict and puts the record on a queue.
+"""
+
+import atexit
 import logging
+import queue
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import structlog
-from rich.console import Console
-from rich.logging import RichHandler
+
+from utils.serialization import dumps
+
+
+class RateLimitFilter(logging.Filter):
+    """Sample repetitive log messages.
+    
+    Each (logger, level, event) key may emit ``burst`` records per ``window``
+    seconds; the rest are counted and reported on the next record that gets
+    through for that key. A record is only counted once, however many
+    handlers share the filter.
+    """
+    
+    def __init__(
+        self,
+        burst: int = 20,
+        window: float = 10.0,
+        max_keys: int = 4096,
+        exempt_level: int = logging.CRITICAL
+    ):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.max_keys = max_keys
+        self.exempt_level = exempt_level
+        self.suppressed = 0
+        # key -> [window start, count, suppressed in window]
+        self._buckets: Dict[Tuple[str, int, str], List[Any]] = {}
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return whether the record should be emitted."""
+        allowed = getattr(record, "rate_limit_passed", None)
+        if allowed is None:
+            allowed = record.rate_limit_passed = self._allow(record)
+        return allowed
+    
+    def _allow(self, record: logging.LogRecord) -> bool:
+        """Count a record against its key's budget."""
+        if record.levelno >= self.exempt_level:
+            return True
+        
+        msg = record.msg
+        event = msg.get("event") if isinstance(msg, dict) else msg
+        key = (record.name, record.levelno, event if isinstance(event, str) else str(event))
+        
+        now = record.created
+        bucket = self._buckets.get(key)
+        if bucket is None or now - bucket[0] >= self.window:
+            if bucket is None and len(self._buckets) >= self.max_keys:
+                self._buckets.clear()
+            if bucket is not None and bucket[2]:
+                record.sampled_out = bucket[2]
+            self._buckets[key] = [now, 1, 0]
+            return True
+        
+        bucket[1] += 1
+        if bucket[1] <= self.burst:
+            return True
+        
+        bucket[2] += 1
+        self.suppressed += 1
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Queue handler that never formats or blocks on the calling thread."""
+    
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Pass the record through untouched; the listener formats it."""
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Enqueue a record, dropping it if the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _capture_exc_info(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve ``exc_info=True`` while still on the thread that raised."""
+    if event_dict.get("exc_info") is True:
+        event_dict["exc_info"] = sys.exc_info()
+    return event_dict
+
+
+def _add_record_metadata(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Add logger name, level and timestamp from the originating record."""
+    record: logging.LogRecord = event_dict["_record"]
+    event_dict["logger"] = record.name
+    event_dict["level"] = record.levelname.lower()
+    event_dict["timestamp"] = datetime.fromtimestamp(record.created, timezone.utc).isoformat()
+    sampled_out = getattr(record, "sampled_out", 0)
+    if sampled_out:
+        event_dict["sampled_out"] = sampled_out
+    return event_dict
+
+
+def _noop(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Leave the event dict unchanged."""
+    return event_dict
+
+
+def _render_json(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> str:
+    """Render an event dict as a single JSON line."""
+    return dumps(event_dict)
+
+
+def _build_formatter(json_logs: bool, show_locals: bool = True) -> logging.Formatter:
+    """Build the formatter used by the listener-side handlers.
+    
+    Console output renders exceptions as Rich tracebacks in the formatter,
+    as the record reaching the handler no longer carries them.
+    """
+    renderer = _render_json if json_logs else structlog.dev.ConsoleRenderer(
+        colors=False,
+        exception_formatter=structlog.dev.RichTracebackFormatter(color_system=None, show_locals=show_locals),
+    )
+    return structlog.stdlib.ProcessorFormatter(
+        processors=[
+            _add_record_metadata,
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.format_exc_info if json_logs else _noop,
+            structlog.processors.UnicodeDecoder(),
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            renderer,
+        ],
+    )
+
+
+# Active listener and handler, so repeated setup replaces rather than stacks them
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_rate_limiter: Optional[RateLimitFilter] = None
 
 
 def setup_logger(
     level: str = "INFO",
     log_file: Optional[Path] = None,
-    json_logs: bool = False
+    json_logs: bool = False,
+    *,
+    console: bool = True,
+    use_queue: bool = True,
+    queue_size: int = 10000,
+    sample_burst: int = 20,
+    sample_window: float = 10.0,
+    show_locals: bool = True
 ) -> structlog.stdlib.BoundLogger:
     """
     Setup structured logging with rich console output.
@@ -21,50 +172,71 @@ def setup_logger(
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Optional file path for log output
-        json_logs: Whether to use JSON formatting for file logs
-        
+        json_logs: Whether to render JSON lines instead of console output
+        console: Whether to log to stderr
+        use_queue: Whether to format and write on a background thread
+        queue_size: Maximum number of records waiting to be written
+        sample_burst: Identical messages allowed per sampling window (0 disables sampling)
+        sample_window: Length of the sampling window in seconds
+        show_locals: Whether console tracebacks include local variables
+    
     Returns:
         Configured logger instance
     """
-    # Configure standard library logging
-    logging.basicConfig(
-        format="%(message)s",
-        datefmt="[%X]",
-        handlers=[
-            RichHandler(
+    global _listener, _queue_handler, _rate_limiter
+    shutdown_logger()
+    
+    formatter = _build_formatter(json_logs, show_locals)
+    handlers: List[logging.Handler] = []
+    
+    if console:
+        if json_logs:
+            console_handler: logging.Handler = logging.StreamHandler(sys.stderr)
+        else:
+            # Rich is only needed for human-readable console output
+            from rich.console import Console
+            from rich.logging import RichHandler
+            
+            console_handler = RichHandler(
                 console=Console(stderr=True),
-                rich_tracebacks=True,
-                tracebacks_show_locals=True,
+                show_time=False,
+                show_level=False,
+                show_path=False,
             )
-        ],
-        level=getattr(logging, level.upper()),
-    )
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
     
     # Add file handler if specified
     if log_file:
         log_file.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_file)
-        if json_logs:
-            file_handler.setFormatter(
-                logging.Formatter('{"time": "%(asctime)s", "level": "%(levelname)s", "message": "%(message)s"}')
-            )
-        else:
-            file_handler.setFormatter(
-                logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            )
-        logging.getLogger().addHandler(file_handler)
+        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.setLevel(getattr(logging, level.upper()))
+    
+    _rate_limiter = RateLimitFilter(burst=sample_burst, window=sample_window) if sample_burst > 0 else None
     
-    # Configure structlog
+    if use_queue:
+        _queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+        _listener = QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        handlers = [_queue_handler]
+    
+    for handler in handlers:
+        if _rate_limiter:
+            handler.addFilter(_rate_limiter)
+        root.addHandler(handler)
+    
+    # Configure structlog; only cheap processors run on the calling thread
     structlog.configure(
         processors=[
             structlog.stdlib.filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.TimeStamper(fmt="iso"),
+            _capture_exc_info,
             structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
             structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
         context_class=dict,
@@ -79,6 +251,29 @@ def setup_logger(
     return logger
 
 
+def shutdown_logger() -> None:
+    """Flush queued records and stop the background listener."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+
+
+atexit.register(shutdown_logger)
+
+
+def get_logging_stats() -> Dict[str, int]:
+    """Get counters for records dropped by the queue or suppressed by sampling."""
+    return {
+        "dropped": _queue_handler.dropped if _queue_handler else 0,
+        "queued": _queue_handler.queue.qsize() if _queue_handler else 0,
+        "suppressed": _rate_limiter.suppressed if _rate_limiter else 0,
+    }
+
+
 class BotLogger:
     """Specialized logger for different bot components."""
     
@@ -87,7 +282,7 @@ class BotLogger:
         
         # Component loggers
         self.commands = base_logger.bind(component="commands")
-        self.buttons = base_logger.bind(component="buttons") 
+        self.buttons = base_logger.bind(component="buttons")
         self.menus = base_logger.bind(component="menus")
         self.modals = base_logger.bind(component="modals")
         self.tickets = base_logger.bind(component="tickets")
@@ -100,11 +295,17 @@ class BotLogger:
         return getattr(self, component, self.base)
     
     def error(self, component: str) -> structlog.stdlib.BoundLogger:
-        """Get error logger for a component.""" 
+        """Get error logger for a component."""
         return getattr(self, component, self.base)
 
 
+# Shared bot logger instance
+_bot_logger: Optional[BotLogger] = None
+
+
 def get_bot_logger() -> BotLogger:
     """Get the bot logger instance."""
-    base_logger = structlog.get_logger("discord-tickets")
-    return BotLogger(base_logger)
\ No newline at end of file
+    global _bot_logger
+    if _bot_logger is None:
+        _bot_logger = BotLogger(structlog.get_logger("discord-tickets"))
+    return _bot_logger
\ No newline at end of file
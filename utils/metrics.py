@@ -0,0 +1,437 @@
+"""Prometheus-style metrics for the bot and the dashboard API.
+
+Metric updates are plain integer and float increments on per-label-set
+objects, with no locks: everything that records metrics runs on the event
+loop, and a rare lost increment from another thread is acceptable for
+monitoring. The work of building cumulative buckets and text output is
+done when ``/metrics`` is scraped, not when a value is recorded.
+"""
+
+import asyncio
+import functools
+import re
+import time
+from bisect import bisect_left
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+import aiohttp
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+# (name suffix, labels, value)
+Sample = Tuple[str, Dict[str, str], float]
+
+# Latency buckets in seconds, from a cache hit to a slow Discord call
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Child:
+    """A counter or gauge value for one set of label values."""
+    
+    __slots__ = ("value", "function")
+    
+    def __init__(self):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+    
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the value."""
+        self.value += amount
+    
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the value."""
+        self.value -= amount
+    
+    def set(self, value: float) -> None:
+        """Set the value."""
+        self.value = value
+    
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the value from ``function`` at scrape time instead."""
+        self.function = function
+    
+    def get(self) -> float:
+        """Get the current value."""
+        return self.function() if self.function is not None else self.value
+
+
+class _HistogramChild:
+    """Bucketed observations for one set of label values."""
+    
+    __slots__ = ("buckets", "counts", "sum")
+    
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # One count per bucket plus +Inf, not cumulative until collected
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+    
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+    
+    def time(self) -> "_Timer":
+        """Time a block of code and observe its duration."""
+        return _Timer(self)
+
+
+class _Timer:
+    """Context manager observing elapsed time into a histogram child."""
+    
+    __slots__ = ("child", "start")
+    
+    def __init__(self, child: _HistogramChild):
+        self.child = child
+        self.start = 0.0
+    
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.child.observe(time.perf_counter() - self.start)
+
+
+class Metric:
+    """A named metric family with optional labels."""
+    
+    type = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Initialize the metric."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+    
+    def labels(self, *values: Any) -> Any:
+        """Get the child for a set of label values, creating it on first use."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+    
+    def _new_child(self) -> Any:
+        return _Child()
+    
+    def _label_dict(self, values: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, map(str, values)))
+    
+    def samples(self) -> List[Sample]:
+        """Get the metric's current samples."""
+        return [("", self._label_dict(values), child.get()) for values, child in list(self._children.items())]
+
+
+class Counter(Metric):
+    """A value that only goes up."""
+    
+    type = "counter"
+    
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase an unlabelled counter."""
+        self.labels().inc(amount)
+    
+    def samples(self) -> List[Sample]:
+        """Get the metric's current samples."""
+        return [("_total", labels, value) for _, labels, value in super().samples()]
+
+
+class Gauge(Metric):
+    """A value that can go up and down."""
+    
+    type = "gauge"
+    
+    def set(self, value: float) -> None:
+        """Set an unlabelled gauge."""
+        self.labels().set(value)
+
+
+class Histogram(Metric):
+    """Observations counted into cumulative buckets."""
+    
+    type = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        """Initialize the histogram."""
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+    
+    def observe(self, value: float) -> None:
+        """Record an observation in an unlabelled histogram."""
+        self.labels().observe(value)
+    
+    def time(self, *values: Any) -> _Timer:
+        """Time a block of code under the given label values."""
+        return self.labels(*values).time()
+    
+    def samples(self) -> List[Sample]:
+        """Get the metric's current samples."""
+        samples: List[Sample] = []
+        for values, child in list(self._children.items()):
+            labels = self._label_dict(values)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), list(child.counts)):
+                cumulative += count
+                samples.append(("_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append(("_count", labels, cumulative))
+            samples.append(("_sum", labels, child.sum))
+        return samples
+
+
+class MetricsRegistry:
+    """Collection of metrics exposed together."""
+    
+    def __init__(self):
+        """Initialize the registry."""
+        self._metrics: Dict[str, Metric] = {}
+    
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric, or return the one already registered under its name."""
+        return self._metrics.setdefault(metric.name, metric)
+    
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Register a counter."""
+        return self.register(Counter(name, documentation, labelnames))
+    
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Register a gauge."""
+        return self.register(Gauge(name, documentation, labelnames))
+    
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Register a histogram."""
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+    
+    def collect(self) -> List[Dict[str, Any]]:
+        """Get every metric family as JSON-serialisable data."""
+        return [
+            {
+                "name": metric.name,
+                "type": metric.type,
+                "help": metric.documentation,
+                "samples": metric.samples(),
+            }
+            for metric in self._metrics.values()
+        ]
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value or bucket bound."""
+    if value == float("inf"):
+        return "+Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def merge_families(sources: Iterable[Tuple[List[Dict[str, Any]], Dict[str, str]]]) -> List[Dict[str, Any]]:
+    """Merge collected families from several processes into one list.
+    
+    ``sources`` pairs ``collect()`` output with labels added to each of its
+    samples, so the merged samples stay distinguishable.
+    """
+    families: Dict[str, Dict[str, Any]] = {}
+    for collected, extra_labels in sources:
+        for family in collected:
+            merged = families.get(family["name"])
+            if merged is None:
+                merged = families[family["name"]] = {**family, "samples": []}
+            merged["samples"].extend(
+                (suffix, {**extra_labels, **labels}, value) for suffix, labels, value in family["samples"]
+            )
+    return list(families.values())
+
+
+def render(sources: Iterable[Tuple[List[Dict[str, Any]], Dict[str, str]]]) -> str:
+    """Render collected families in the Prometheus text format.
+    
+    Families from every source are merged under one ``# TYPE`` line, see
+    ``merge_families``.
+    """
+    output: List[str] = []
+    for family in merge_families(sources):
+        name = family["name"]
+        output.append(f"# HELP {name} {family['help']}")
+        output.append(f"# TYPE {name} {family['type']}")
+        for suffix, labels, value in family["samples"]:
+            label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+            label_text = "{" + label_text + "}" if label_text else ""
+            output.append(f"{name}{suffix}{label_text} {_format_value(value)}")
+    return "\n".join(output) + "\n"
+
+
+# Global registry instance
+_registry_instance: Optional[MetricsRegistry] = None
+
+
+def get_registry() -> MetricsRegistry:
+    """Get the global metrics registry instance."""
+    global _registry_instance
+    if _registry_instance is None:
+        _registry_instance = MetricsRegistry()
+    return _registry_instance
+
+
+INTERACTION_SECONDS = get_registry().histogram(
+    "tickets_interaction_seconds",
+    "Time spent handling an interaction.",
+    ["kind", "name"],
+)
+INTERACTION_ACK_SECONDS = get_registry().histogram(
+    "tickets_interaction_ack_seconds",
+    "Time from a handler starting to its interaction being acknowledged.",
+    ["kind", "name"],
+)
+INTERACTION_AUTO_DEFERRED = get_registry().counter(
+    "tickets_interaction_auto_deferred",
+    "Interactions deferred because the handler hadn't replied within the budget.",
+    ["kind", "name"],
+)
+INTERACTION_DEADLINES_MISSED = get_registry().counter(
+    "tickets_interaction_deadlines_missed",
+    "Interactions acknowledged after Discord's deadline, or never.",
+    ["kind", "name"],
+)
+TICKET_OPERATION_SECONDS = get_registry().histogram(
+    "tickets_operation_seconds",
+    "Time spent in a ticket manager operation.",
+    ["operation"],
+)
+DB_QUERY_SECONDS = get_registry().histogram(
+    "tickets_db_query_seconds",
+    "Database statement execution time.",
+    ["statement"],
+)
+DISCORD_REQUEST_SECONDS = get_registry().histogram(
+    "tickets_discord_request_seconds",
+    "Discord REST request latency.",
+    ["method", "route", "status"],
+)
+DISCORD_RATE_LIMITS = get_registry().counter(
+    "tickets_discord_rate_limits",
+    "Discord REST responses with status 429.",
+    ["method", "route"],
+)
+EVENT_LOOP_LAG_SECONDS = get_registry().histogram(
+    "tickets_event_loop_lag_seconds",
+    "How late the event loop ran a timer.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+CACHE_HITS = get_registry().counter("tickets_cache_hits", "Cache lookups that found an entry.", ["cache"])
+CACHE_MISSES = get_registry().counter("tickets_cache_misses", "Cache lookups that missed.", ["cache"])
+CACHE_HIT_RATIO = get_registry().gauge("tickets_cache_hit_ratio", "Share of cache lookups that hit.", ["cache"])
+
+
+def timed(histogram: Histogram, *labels: Any) -> Callable[[F], F]:
+    """Decorate a coroutine function to observe its duration."""
+    def decorator(function: F) -> F:
+        child = histogram.labels(*labels)
+        
+        @functools.wraps(function)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await function(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - start)
+        
+        return wrapper
+    return decorator
+
+
+def track_cache(name: str, cache: Any) -> None:
+    """Export the ``hits`` and ``misses`` counters of a cache."""
+    def ratio() -> float:
+        total = cache.hits + cache.misses
+        return cache.hits / total if total else 0.0
+    
+    CACHE_HITS.labels(name).set_function(lambda: cache.hits)
+    CACHE_MISSES.labels(name).set_function(lambda: cache.misses)
+    CACHE_HIT_RATIO.labels(name).set_function(ratio)
+
+
+# Snowflakes and tokens in Discord REST paths, replaced to keep route labels bounded
+_ROUTE_IDS = re.compile(r"/(?:\d{15,21}|[\w-]{60,})(?=/|$)")
+_ROUTE_REACTIONS = re.compile(r"/reactions/[^/]+")
+
+
+def discord_route(path: str) -> str:
+    """Reduce a Discord API path to its route, e.g. ``/channels/{id}/messages``."""
+    path = path.split("/api/v", 1)[-1]
+    path = path.split("/", 1)[1] if "/" in path else path
+    path = _ROUTE_REACTIONS.sub("/reactions/{emoji}", "/" + path)
+    return _ROUTE_IDS.sub("/{id}", path)
+
+
+def discord_trace_config() -> aiohttp.TraceConfig:
+    """Create an aiohttp trace config recording Discord REST latency and 429s."""
+    async def on_request_start(session, context, params) -> None:
+        context.start = time.perf_counter()
+    
+    async def on_request_end(session, context, params) -> None:
+        route = discord_route(params.url.path)
+        status = params.response.status
+        DISCORD_REQUEST_SECONDS.labels(params.method, route, status).observe(time.perf_counter() - context.start)
+        if status == 429:
+            DISCORD_RATE_LIMITS.labels(params.method, route).inc()
+    
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    return trace_config
+
+
+class LoopLagMonitor:
+    """Measure event loop lag by how late a periodic timer fires."""
+    
+    def __init__(self, interval: float = 0.5):
+        """Initialize the monitor."""
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        """Start measuring in the running loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop measuring."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self) -> None:
+        """Observe the lag of each timer tick."""
+        child = EVENT_LOOP_LAG_SECONDS.labels()
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            child.observe(max(time.perf_counter() - start - self.interval, 0.0))
\ No newline at end of file
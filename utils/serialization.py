@@ -0,0 +1,36 @@
+"""Fast JSON serialization helpers."""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _default(value: Any) -> Any:
+    """Fallback encoder for values JSON does not know about."""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps_bytes(value: Any) -> bytes:
+    """Serialize a value to compact JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def dumps(value: Any) -> str:
+    """Serialize a value to a compact JSON string."""
+    return dumps_bytes(value).decode("utf-8")
+
+
+def loads(value: Any) -> Any:
+    """Deserialize JSON from a string or bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(value)
+    return json.loads(value)
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""Startup profiling: phase timings and an import time breakdown."""
+
+import importlib.abc
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class _TimedLoader:
+    """Loader proxy that times ``exec_module``."""
+    
+    def __init__(self, loader: Any, timer: "ImportTimer", name: str):
+        self._loader = loader
+        self._timer = timer
+        self._name = name
+    
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._loader, attr)
+    
+    def create_module(self, spec: Any) -> Any:
+        return self._loader.create_module(spec)
+    
+    def exec_module(self, module: Any) -> None:
+        # Hand the real loader back to the module so nothing else sees the proxy
+        module.__loader__ = self._loader
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self._loader
+        
+        self._timer.enter(self._name)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.exit(self._name)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """Record self and cumulative import times, like ``python -X importtime``."""
+    
+    def __init__(self):
+        """Initialize the import timer."""
+        # module -> (self seconds, cumulative seconds), in import order
+        self.timings: Dict[str, Tuple[float, float]] = {}
+        # Imports may run in worker threads, so each thread keeps its own stack
+        self._local = threading.local()
+    
+    def install(self) -> None:
+        """Start timing imports."""
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+    
+    def uninstall(self) -> None:
+        """Stop timing imports."""
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+    
+    def find_spec(self, fullname: str, path: Any, target: Any = None) -> Any:
+        """Find a spec with the remaining finders and wrap its loader."""
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self, fullname)
+                return spec
+        return None
+    
+    @property
+    def _stack(self) -> List[List[Any]]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    
+    def enter(self, name: str) -> None:
+        """Mark the start of a module's execution."""
+        # [name, start, time spent in nested imports]
+        self._stack.append([name, time.perf_counter(), 0.0])
+    
+    def exit(self, name: str) -> None:
+        """Mark the end of a module's execution."""
+        stack = self._stack
+        _, start, nested = stack.pop()
+        cumulative = time.perf_counter() - start
+        self.timings[name] = (cumulative - nested, cumulative)
+        if stack:
+            stack[-1][2] += cumulative
+    
+    def report(self, limit: int = 30) -> str:
+        """Format the slowest imports in ``-X importtime`` style."""
+        lines = ["import time:       self [us] |  cumulative | imported package"]
+        slowest = sorted(self.timings.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        for name, (self_time, cumulative) in slowest:
+            depth = name.count(".")
+            lines.append(
+                f"import time: {self_time * 1e6:>15,.0f} | {cumulative * 1e6:>11,.0f} | {'  ' * depth}{name}"
+            )
+        return "\n".join(lines)
+
+
+class StartupProfiler:
+    """Collect phase-by-phase startup timings."""
+    
+    def __init__(self, import_timer: Optional[ImportTimer] = None):
+        """Initialize the profiler."""
+        self.origin = time.perf_counter()
+        self.import_timer = import_timer
+        # (phase, start offset, duration) in seconds
+        self.phases: List[Tuple[str, float, float]] = []
+        # Durations of sub-phases that may have run concurrently
+        self.details: Dict[str, float] = {}
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a synchronous or ``await``-ing block as a named phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start - self.origin, time.perf_counter() - start))
+    
+    def record(self, name: str, duration: float) -> None:
+        """Record the duration of a sub-phase timed elsewhere."""
+        self.details[name] = duration
+    
+    def mark(self, name: str) -> None:
+        """Record a milestone reached at the current time."""
+        self.phases.append((name, time.perf_counter() - self.origin, 0.0))
+    
+    def report(self) -> str:
+        """Format the collected timings."""
+        lines = [
+            "Startup profile",
+            "=" * 60,
+            f"{'phase':<32} {'start':>10} {'duration':>12}",
+        ]
+        for name, start, duration in sorted(self.phases, key=lambda phase: phase[1]):
+            lines.append(f"{name:<32} {start * 1000:>8.0f}ms {duration * 1000:>10.0f}ms")
+        lines.append(f"{'total':<32} {'':>10} {(time.perf_counter() - self.origin) * 1000:>10.0f}ms")
+        
+        if self.details:
+            lines.append("")
+            for name, duration in self.details.items():
+                lines.append(f"{name:<32} {'':>10} {duration * 1000:>10.0f}ms")
+        
+        if self.import_timer is not None:
+            lines.append("")
+            lines.append(self.import_timer.report())
+        
+        return "\n".join(lines)
\ No newline at end of file